@@ -4,6 +4,9 @@ import base64
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from connector_pool import connector_pool
+from async_binance_api import invalidate_connectors
+from valuation import valuation_engines
 
 
 class AccountManager:
@@ -127,11 +130,19 @@ class AccountManager:
         }
         self.save_accounts()
 
+        # Aynı isimle eski bilgilerle açılmış bağlantı varsa geçersiz kıl
+        connector_pool.invalidate(name)
+        invalidate_connectors(name)
+
     def remove_account(self, name):
         """Hesap siler"""
         if name in self.accounts:
             del self.accounts[name]
             self.save_accounts()
+            connector_pool.invalidate(name)
+            invalidate_connectors(name)
+            for engine in valuation_engines.values():
+                engine.remove_account(name)
             return True
         return False
 
@@ -4,16 +4,30 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
                              QLineEdit, QMessageBox, QCheckBox, QRadioButton,
                              QButtonGroup, QSpinBox, QDoubleSpinBox, QHeaderView,
                              QSplitter, QDialog, QDialogButtonBox, QProgressBar,
-                             QTextEdit, QApplication, QFrame)
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QThread, pyqtSlot, QPropertyAnimation, QRect
+                             QTextEdit, QApplication, QFrame, QTableView)
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QThread, QObject, pyqtSlot, QPropertyAnimation, QRect
 from PyQt5.QtGui import QColor, QPainter, QMovie
 import sys
 import os
+import asyncio
 from binance.exceptions import BinanceAPIException
-from transaction import AccountWidget
+from binance_api import CANCEL_REPLACE_CANCEL_FAILED, CANCEL_REPLACE_NEW_FAILED
+from connector_pool import connector_pool
+import async_binance_api
+from fanout import FanOutExecutor, DEFAULT_MAX_WORKERS
+from valuation import get_valuation_engine, valuation_engines
+from exposure import ExposureBook
+from orders_model import OpenOrdersTableModel, OpenOrdersFilterProxyModel
+from user_data_stream import OPEN_ORDER_STATUSES
+from order_validator import (validate_with_connector, free_balance, TEST_ORDER_PARALLEL,
+                             TEST_ORDER_SKIP, DEFAULT_TEST_ORDER_MODE)
 from datetime import datetime
+import time
 import uuid
 
+# Hazırlanan toplu emirlerin gönderilebileceği en fazla bekleme süresi (saniye)
+ARMED_ORDER_MAX_AGE = 60.0
+
 
 class LoadingWidget(QWidget):
     """Loading spinner widget"""
@@ -112,13 +126,15 @@ class LoadingOverlay(QWidget):
 class InitializationThread(QThread):
     """Thread for initializing admin panel data"""
     progress_update = pyqtSignal(str)  # message
-    accounts_loaded = pyqtSignal(dict)  # accounts data
-    summary_loaded = pyqtSignal(list)  # summary data
+    accounts_listed = pyqtSignal(list)  # account names
+    accounts_loaded = pyqtSignal(dict)  # accounts data (one account per emit)
+    summary_loaded = pyqtSignal(list)  # summary data (one row per emit)
     initialization_complete = pyqtSignal()
 
-    def __init__(self, account_manager, parent=None):
+    def __init__(self, account_manager, max_workers=DEFAULT_MAX_WORKERS, parent=None):
         super().__init__(parent)
         self.account_manager = account_manager
+        self.max_workers = max_workers
 
     def run(self):
         """Initialize all data in background"""
@@ -126,302 +142,394 @@ class InitializationThread(QThread):
             # Step 1: Load accounts
             self.progress_update.emit("Loading accounts...")
             accounts = self.account_manager.get_all_accounts()
+            self.accounts_listed.emit(list(accounts.keys()))
+
+            # Step 2: Connect, balance and open orders in one concurrent pass
+            self.progress_update.emit("Connecting accounts...")
+            executor = FanOutExecutor(self.max_workers)
 
-            # Step 2: Test connections
-            self.progress_update.emit("Testing connections...")
-            accounts_status = {}
-
-            for i, (name, data) in enumerate(accounts.items()):
-                self.progress_update.emit(f"Testing connection {i + 1}/{len(accounts)}: {name}")
-
-                try:
-                    temp_widget = AccountWidget(name, data)
-                    if temp_widget.connector and temp_widget.connector.connected:
-                        accounts_status[name] = {
-                            "data": data,
-                            "status": "Connected",
-                            "color": "green"
-                        }
-                    else:
-                        accounts_status[name] = {
-                            "data": data,
-                            "status": "Connection Failed",
-                            "color": "red"
-                        }
-                    temp_widget.deleteLater()
-                except Exception as e:
-                    accounts_status[name] = {
-                        "data": data,
-                        "status": f"Error: {str(e)[:20]}",
+            for i, outcome in enumerate(executor.run(self.load_account, accounts)):
+                name = outcome.key
+                if outcome.error is None:
+                    account_status, summary_row = outcome.value
+                else:
+                    account_status = {
+                        "data": accounts[name],
+                        "status": f"Error: {str(outcome.error)[:20]}",
                         "color": "red"
                     }
+                    summary_row = self.make_summary_row(name, account_status)
 
-            self.accounts_loaded.emit(accounts_status)
-
-            # Step 3: Load summary data
-            self.progress_update.emit("Loading account summaries...")
-            summary_data = []
-
-            for i, (name, account_info) in enumerate(accounts_status.items()):
-                self.progress_update.emit(f"Loading summary {i + 1}/{len(accounts_status)}: {name}")
-
-                summary_row = {
-                    "name": name,
-                    "status": account_info["status"],
-                    "status_color": account_info["color"],
-                    "total_value": "-",
-                    "open_orders": "-"
-                }
-
-                if account_info["status"] == "Connected":
-                    try:
-                        temp_widget = AccountWidget(name, account_info["data"])
-                        if temp_widget.connector and temp_widget.connector.connected:
-                            # Get balance
-                            balances = temp_widget.connector.get_account_balance()
-                            total_value = 0
+                self.progress_update.emit(f"Loaded {i + 1}/{len(accounts)}: {name}")
+                self.accounts_loaded.emit({name: account_status})
+                self.summary_loaded.emit([summary_row])
 
-                            if balances:
-                                for balance in balances:
-                                    if balance["asset"] == "USDT":
-                                        total_value += float(balance["free"])
+            # Step 3: Complete
+            self.progress_update.emit("Initialization complete!")
+            self.initialization_complete.emit()
 
-                            # Get open orders
-                            open_orders = temp_widget.connector.get_open_orders()
-                            open_count = len(open_orders) if open_orders else 0
+        except Exception as e:
+            self.progress_update.emit(f"Error during initialization: {str(e)}")
 
-                            summary_row["total_value"] = f"{total_value:.2f}"
-                            summary_row["open_orders"] = str(open_count)
+    def load_account(self, name, data):
+        """Connect a single account and collect its summary row"""
+        connector = connector_pool.get(name, data)
+        if connector.connected:
+            account_status = {"data": data, "status": "Connected", "color": "green"}
+        else:
+            account_status = {"data": data, "status": "Connection Failed", "color": "red"}
 
-                        temp_widget.deleteLater()
-                    except Exception as e:
-                        summary_row["status"] = "Error"
-                        summary_row["status_color"] = "red"
+        summary_row = self.make_summary_row(name, account_status)
+        if not connector.connected:
+            return account_status, summary_row
 
-                summary_data.append(summary_row)
+        try:
+            # Get balance and value every asset in USD via the shared valuation engine
+            balances = connector.get_account_balance()
+            total_value = 0
 
-            self.summary_loaded.emit(summary_data)
+            if balances:
+                engine = get_valuation_engine(connector.testnet)
+                engine.refresh(connector)
+                total_value = engine.set_holdings(name, balances)
 
-            # Step 4: Complete
-            self.progress_update.emit("Initialization complete!")
-            self.initialization_complete.emit()
+            # Get open orders
+            open_orders = connector.get_open_orders()
+            open_count = len(open_orders) if open_orders else 0
 
+            summary_row["total_value"] = f"{total_value:.2f}"
+            summary_row["open_orders"] = str(open_count)
         except Exception as e:
-            self.progress_update.emit(f"Error during initialization: {str(e)}")
+            summary_row["status"] = "Error"
+            summary_row["status_color"] = "red"
+
+        return account_status, summary_row
+
+    @staticmethod
+    def make_summary_row(name, account_status):
+        """Build an empty summary row for an account"""
+        return {
+            "name": name,
+            "status": account_status["status"],
+            "status_color": account_status["color"],
+            "total_value": "-",
+            "open_orders": "-"
+        }
 
 
-class BulkOrderThread(QThread):
-    """Toplu emir işlemlerini arka planda çalıştıran thread"""
+class BulkOrderArmThread(QThread):
+    """Toplu emrin hazırlık ("arm") aşaması: tüm hesaplarda bakiye, fiyat, yuvarlama ve
+    doğrulamayı eşzamanlı yapar, gönderilmeye hazır emirleri döndürür"""
     progress_update = pyqtSignal(str, str)  # account_name, message
-    finished = pyqtSignal(dict)  # results
+    armed = pyqtSignal(dict)  # {"orders", "errors", "accounts_data", "armed_at", "arm_ms"}
 
-    def __init__(self, accounts_data, order_params, parent=None):
+    def __init__(self, accounts_data, order_params, max_workers=DEFAULT_MAX_WORKERS,
+                 test_order_mode=DEFAULT_TEST_ORDER_MODE, parent=None):
         super().__init__(parent)
         self.accounts_data = accounts_data
         self.order_params = order_params
-        self.results = {}
+        self.max_workers = max_workers
+        self.test_order_mode = test_order_mode
+        self.sized = {}  # account_name -> (quantity, balances)
 
     def run(self):
         """Thread'in ana çalışma metodu"""
         total_accounts = len(self.accounts_data)
-        success_count = 0
-        error_count = 0
+        for i, account_name in enumerate(self.accounts_data):
+            self.progress_update.emit(account_name, f"Hazırlanıyor... ({i + 1}/{total_accounts})")
+
+        arm_start = time.perf_counter()
+        executor = FanOutExecutor(self.max_workers)
+        orders = {}
+        errors = {}
+
+        # Yüzde bazlı emirlerde önce tüm hesapların bakiyeleri tek seferde alınıp boyutlandırılır
+        accounts = self.accounts_data
+        if self.order_params.get("quantity_type") == "percentage":
+            self.sized, sizing_errors = self.size_accounts(self.snapshot_balances(executor))
+            for account_name, message in sizing_errors.items():
+                errors[account_name] = {"status": "Error", "message": message}
+                self.progress_update.emit(account_name, message)
+            accounts = {name: data for name, data in self.accounts_data.items() if name in self.sized}
+
+        for outcome in executor.run(self.prepare_account, accounts):
+            if outcome.error is None and outcome.value[1] is None:
+                orders[outcome.key] = outcome.value[0]
+                self.progress_update.emit(outcome.key, "Hazır")
+                continue
+
+            result, message = self.error_result(outcome)
+            result["latency_ms"] = outcome.latency_ms
+            errors[outcome.key] = result
+            if message:
+                self.progress_update.emit(outcome.key, message)
+
+        self.armed.emit({
+            "orders": orders,
+            "errors": errors,
+            "accounts_data": self.accounts_data,
+            "armed_at": time.time(),
+            "arm_ms": (time.perf_counter() - arm_start) * 1000.0
+        })
+
+    def snapshot_balances(self, executor):
+        """Seçili tüm hesapların bakiyelerini eşzamanlı alır; alınamayanlar None olur"""
+        def fetch(account_name, account_data):
+            connector = connector_pool.get(account_name, account_data)
+            return connector.get_account_balance() if connector.connected else None
+
+        return {outcome.key: outcome.value if outcome.error is None else None
+                for outcome in executor.run(fetch, self.accounts_data)}
+
+    def size_accounts(self, balances_by_account):
+        """Bakiye görüntüsünden tüm hesapların miktarlarını tek geçişte hesaplar.
+
+        ({hesap: (miktar, bakiyeler)}, {hesap: hata mesajı}) döndürür.
+        """
+        symbol = self.order_params["symbol"]
+        side = self.order_params["side"]
+        percentage = self.order_params["quantity"] / 100.0
+
+        # Sembol bilgisi ve fiyat tüm hesaplar için bir kez çözülür
+        connector = next((connector_pool.get(name, data) for name, data in self.accounts_data.items()
+                          if balances_by_account.get(name) is not None), None)
+        filters = connector.get_symbol_filters(symbol) if connector else None
+        if filters is None:
+            message = f"{symbol} sembol bilgisi alınamadı"
+            return {}, {name: message for name in balances_by_account}
+
+        price = self.order_params.get("price") or connector.get_price(symbol)
+        if side == "BUY" and not price:
+            message = f"{symbol} fiyatı alınamadı"
+            return {}, {name: message for name in balances_by_account}
+
+        # Alışta kote, satışta baz varlık harcanır
+        spend_asset = filters.quote_asset if side == "BUY" else filters.base_asset
+        names = list(balances_by_account)
+        snapshots = [balances_by_account[name] for name in names]
+        free = [float(free_balance(balances, spend_asset)) if balances is not None else None
+                for balances in snapshots]
+        amounts = [value * percentage if value is not None else None for value in free]
+        quantities = [amount / price if side == "BUY" and amount is not None else amount
+                      for amount in amounts]
+
+        sized = {}
+        errors = {}
+        for name, balances, value, quantity in zip(names, snapshots, free, quantities):
+            if balances is None:
+                errors[name] = "Bakiye alınamadı"
+            elif value <= 0:
+                errors[name] = f"Yetersiz {spend_asset} bakiyesi"
+            else:
+                sized[name] = (quantity, balances)
+        return sized, errors
+
+    @staticmethod
+    def error_result(outcome):
+        """Hazırlık aşamasında başarısız olan hesabın (sonuç, ilerleme mesajı) çifti"""
+        if outcome.error is None:
+            result, state, message = outcome.value[1]
+            return result, message
+        if isinstance(outcome.error, BinanceAPIException):
+            message = f"API Hatası: {outcome.error.message}"
+        else:
+            message = f"Hata: {str(outcome.error)}"
+        return {"status": "Error", "message": message}, message
 
-        for i, (account_name, account_data) in enumerate(self.accounts_data.items()):
-            self.progress_update.emit(account_name, f"İşleniyor... ({i + 1}/{total_accounts})")
+    def prepare_account(self, account_name, account_data):
+        """Hesabın emrini hazırlar ve gönderimden önce doğrular.
 
-            try:
-                # Mevcut AccountWidget'ı kullan
-                temp_widget = AccountWidget(account_name, account_data)
+        (hazır emir, None) veya hata durumunda (None, (sonuç, "error", ilerleme mesajı)) döndürür.
+        """
+        # Havuzdaki bağlı connector'ı kullan
+        connector = connector_pool.get(account_name, account_data)
 
-                if not temp_widget.connector or not temp_widget.connector.connected:
-                    self.results[account_name] = {
-                        "status": "Error",
-                        "message": "Bağlantı kurulamadı"
-                    }
-                    self.progress_update.emit(account_name, "Bağlantı hatası")
-                    error_count += 1
-                    continue
-
-                # Emir parametrelerini hazırla
-                symbol = self.order_params["symbol"]
-                side = self.order_params["side"]
-                order_type = self.order_params["type"]
-                quantity = self.order_params["quantity"]
-
-                # Miktarı hesapla (yüzde bazlı ise)
-                if self.order_params.get("quantity_type") == "percentage":
-                    percentage = quantity / 100.0
-
-                    if side == "BUY":
-                        # USDT bakiyesi al
-                        balances = temp_widget.connector.get_account_balance()
-                        usdt_balance = 0
-                        for balance in balances:
-                            if balance["asset"] == "USDT":
-                                usdt_balance = float(balance["free"])
-                                break
-
-                        if usdt_balance <= 0:
-                            self.results[account_name] = {
-                                "status": "Error",
-                                "message": "Yetersiz USDT bakiyesi"
-                            }
-                            error_count += 1
-                            continue
-
-                        # Güncel fiyatı al
-                        ticker = temp_widget.connector.client.get_symbol_ticker(symbol=symbol)
-                        price = float(ticker["price"])
-                        quantity = (usdt_balance * percentage) / price
-                    else:
-                        # Kripto asset bakiyesi al
-                        asset = symbol.replace("USDT", "")
-                        balances = temp_widget.connector.get_account_balance()
-                        asset_balance = 0
-                        for balance in balances:
-                            if balance["asset"] == asset:
-                                asset_balance = float(balance["free"])
-                                break
-
-                        if asset_balance <= 0:
-                            self.results[account_name] = {
-                                "status": "Error",
-                                "message": f"Yetersiz {asset} bakiyesi"
-                            }
-                            error_count += 1
-                            continue
-
-                        quantity = asset_balance * percentage
-
-                # Emir parametrelerini oluştur
-                params = {
-                    "symbol": symbol,
-                    "side": side,
-                    "type": order_type,
-                    "quantity": self.round_quantity(quantity, symbol)
-                }
+        if not connector.connected:
+            return None, ({"status": "Error", "message": "Bağlantı kurulamadı"}, "error", "Bağlantı hatası")
 
-                # Fiyat parametrelerini ekle
-                if order_type in ["LIMIT", "STOP_LOSS_LIMIT"]:
-                    params["price"] = self.order_params["price"]
-                    params["timeInForce"] = self.order_params.get("timeInForce", "GTC")
+        # Emir parametrelerini hazırla
+        symbol = self.order_params["symbol"]
+        side = self.order_params["side"]
+        order_type = self.order_params["type"]
+        quantity = self.order_params["quantity"]
+        balances = None
+
+        # Yüzde bazlı miktar ve bakiyeler boyutlandırma aşamasında hesaplandı
+        if account_name in self.sized:
+            quantity, balances = self.sized[account_name]
+
+        # Emir parametrelerini oluştur
+        params = {
+            "symbol": symbol,
+            "side": side,
+            "type": order_type,
+            "quantity": self.round_quantity(connector, quantity, symbol)
+        }
 
-                if "STOP_LOSS" in order_type:
-                    params["stopPrice"] = self.order_params["stop_price"]
+        # Fiyat parametrelerini ekle
+        if order_type in ["LIMIT", "STOP_LOSS_LIMIT"]:
+            params["price"] = self.round_price(connector, self.order_params["price"], symbol)
+            params["timeInForce"] = self.order_params.get("timeInForce", "GTC")
 
-                # Test emri
-                temp_widget.connector.client.create_test_order(**params)
+        if "STOP_LOSS" in order_type:
+            params["stopPrice"] = self.round_price(connector, self.order_params["stop_price"], symbol)
 
-                # Gerçek emir
-                response = temp_widget.connector.client.create_order(**params)
+        # Önbellekteki filtre, fiyat ve bakiyelerle yerel doğrulama
+        errors = validate_with_connector(connector, params, balances)
+        if errors:
+            message = "Doğrulama hatası: " + "; ".join(errors)
+            return None, ({"status": "Error", "message": message}, "error", message)
 
-                # Birincil emir başarılı, TP/SL emirlerini kontrol et
-                primary_order_result = {
-                    "status": "Success" if response["status"] == "FILLED" else "Pending",
-                    "message": f"Emir oluşturuldu: {response['orderId']}",
-                    "order_id": response["orderId"],
-                    "binance_status": response["status"]
-                }
+        # Sunucu tarafı test emri (isteğe bağlı); her iki durumda da bağlantı ateşlemeden önce ısınır
+        if self.test_order_mode == TEST_ORDER_PARALLEL:
+            connector.client.create_test_order(**params)
+        else:
+            connector.client.ping()
+
+        # TP/SL fiyatları da şimdiden yuvarlanır
+        take_profit_price = None
+        if self.order_params.get("enable_take_profit", False) and self.order_params.get("take_profit_price"):
+            take_profit_price = self.round_price(connector, self.order_params["take_profit_price"], symbol)
+
+        stop_loss_price = None
+        if self.order_params.get("enable_stop_loss", False) and self.order_params.get("stop_loss_price"):
+            stop_loss_price = self.round_price(connector, self.order_params["stop_loss_price"], symbol)
+
+        return {
+            "params": params,
+            "take_profit_price": take_profit_price,
+            "stop_loss_price": stop_loss_price
+        }, None
+
+    def round_quantity(self, connector, quantity, symbol):
+        """Miktarı sembolün LOT_SIZE adımına yuvarla"""
+        filters = connector.get_symbol_filters(symbol)
+        if filters:
+            return filters.round_quantity(quantity)
+
+        # Borsa bilgisi yoksa eski tahmini kullan
+        if "BTC" in symbol:
+            return round(quantity, 6)
+        elif "ETH" in symbol:
+            return round(quantity, 5)
+        else:
+            return round(quantity, 2)
 
-                # TP/SL işlemleri
-                tp_sl_messages = []
-
-                # Take Profit emirini kontrol et
-                if self.order_params.get("enable_take_profit", False) and self.order_params.get("take_profit_price"):
-                    try:
-                        tp_side = "SELL" if side == "BUY" else "BUY"
-                        tp_params = {
-                            "symbol": symbol,
-                            "side": tp_side,
-                            "type": "LIMIT",
-                            "quantity": params["quantity"],
-                            "price": self.order_params["take_profit_price"],
-                            "timeInForce": "GTC"
-                        }
-
-                        tp_response = temp_widget.connector.client.create_order(**tp_params)
-                        tp_sl_messages.append(f"TP: {tp_response['orderId']}")
-                    except Exception as e:
-                        tp_sl_messages.append(f"TP Error: {str(e)[:30]}")
-
-                # Stop Loss emirini kontrol et
-                if self.order_params.get("enable_stop_loss", False) and self.order_params.get("stop_loss_price"):
-                    try:
-                        sl_side = "SELL" if side == "BUY" else "BUY"
-                        sl_params = {
-                            "symbol": symbol,
-                            "side": sl_side,
-                            "type": "STOP_LOSS_LIMIT",
-                            "quantity": params["quantity"],
-                            "price": self.order_params["stop_loss_price"],
-                            "stopPrice": self.order_params["stop_loss_price"],
-                            "timeInForce": "GTC"
-                        }
-
-                        sl_response = temp_widget.connector.client.create_order(**sl_params)
-                        tp_sl_messages.append(f"SL: {sl_response['orderId']}")
-                    except Exception as e:
-                        tp_sl_messages.append(f"SL Error: {str(e)[:30]}")
-
-                # Sonuç mesajını güncelle
-                if tp_sl_messages:
-                    primary_order_result["message"] += f" | {', '.join(tp_sl_messages)}"
-
-                self.results[account_name] = primary_order_result
-
-                if response["status"] == "FILLED":
-                    success_count += 1
-                    self.progress_update.emit(account_name, "Emir gerçekleşti")
-                else:
-                    self.progress_update.emit(account_name, "Emir oluşturuldu (bekliyor)")
+    def round_price(self, connector, price, symbol):
+        """Fiyatı sembolün PRICE_FILTER adımına yuvarla"""
+        filters = connector.get_symbol_filters(symbol)
+        if filters:
+            return filters.round_price(price)
+        return price
 
-                temp_widget.deleteLater()
 
-            except BinanceAPIException as e:
-                self.results[account_name] = {
-                    "status": "Error",
-                    "message": f"API Hatası: {e.message}"
-                }
-                self.progress_update.emit(account_name, f"API Hatası: {e.message}")
-                error_count += 1
-            except Exception as e:
-                self.results[account_name] = {
-                    "status": "Error",
-                    "message": f"Hata: {str(e)}"
-                }
-                self.progress_update.emit(account_name, f"Hata: {str(e)}")
+class BulkOrderThread(QThread):
+    """Toplu emrin gönderim ("fire") aşaması: hazırlanmış emirleri tek dalgada gönderir"""
+    progress_update = pyqtSignal(str, str)  # account_name, message
+    finished = pyqtSignal(dict)  # results
+
+    def __init__(self, armed, max_workers=DEFAULT_MAX_WORKERS, parent=None):
+        super().__init__(parent)
+        self.armed = armed
+        self.accounts_data = armed["accounts_data"]
+        self.max_workers = max_workers
+        self.results = dict(armed["errors"])
+
+    def run(self):
+        """Thread'in ana çalışma metodu"""
+        total_accounts = len(self.accounts_data)
+        success_count = 0
+        error_count = len(self.results)
+
+        # Tüm hesapların hazır emirleri aynı anda gönderilir
+        wave_start = time.perf_counter()
+        for outcome in FanOutExecutor(self.max_workers).run(self.submit_account, self.armed["orders"]):
+            account_name = outcome.key
+
+            if outcome.error is None:
+                result, state, message = outcome.value
+            elif isinstance(outcome.error, BinanceAPIException):
+                message = f"API Hatası: {outcome.error.message}"
+                result, state = {"status": "Error", "message": message}, "error"
+            else:
+                message = f"Hata: {str(outcome.error)}"
+                result, state = {"status": "Error", "message": message}, "error"
+
+            result["latency_ms"] = outcome.latency_ms
+            result["completed_ms"] = (outcome.finished - wave_start) * 1000.0
+            self.results[account_name] = result
+
+            if state == "success":
+                success_count += 1
+            elif state == "error":
                 error_count += 1
 
+            if message:
+                self.progress_update.emit(account_name, message)
+
         # Sonuçları gönder
+        completed = [result["completed_ms"] for result in self.results.values() if "completed_ms" in result]
         summary = {
             "total": total_accounts,
             "success": success_count,
             "error": error_count,
-            "results": self.results
+            "results": self.results,
+            "arm_ms": self.armed["arm_ms"],
+            "fire_spread_ms": max(completed) - min(completed) if completed else 0.0
         }
         self.finished.emit(summary)
 
-    def round_quantity(self, quantity, symbol):
-        """Miktarı sembol için uygun ondalık basamaklara yuvarla"""
-        if "BTC" in symbol:
-            return round(quantity, 6)
-        elif "ETH" in symbol:
-            return round(quantity, 5)
-        else:
-            return round(quantity, 2)
+    def submit_account(self, account_name, order):
+        """Hazırlanan emri gönderir.
+
+        (sonuç, durum, ilerleme mesajı) döndürür; durum "success", "pending" veya "error" olur.
+        """
+        connector = connector_pool.get(account_name, self.accounts_data[account_name])
+        params = order["params"]
+
+        # Gerçek emir
+        response = connector.client.create_order(**params)
+
+        # Birincil emir başarılı, TP/SL emirlerini kontrol et
+        primary_order_result = {
+            "status": "Success" if response["status"] == "FILLED" else "Pending",
+            "message": f"Emir oluşturuldu: {response['orderId']}",
+            "order_id": response["orderId"],
+            "binance_status": response["status"]
+        }
+
+        # TP/SL bacakları tek OCO order list isteğiyle eklenir
+        tp_sl_messages = []
+        if order["take_profit_price"] or order["stop_loss_price"]:
+            order_list_id, tp_sl_messages = connector.place_exit_orders(
+                params["symbol"], params["side"], params["quantity"],
+                order["take_profit_price"], order["stop_loss_price"])
+            if order_list_id is not None:
+                primary_order_result["order_list_id"] = order_list_id
+
+        # Sonuç mesajını güncelle
+        if tp_sl_messages:
+            primary_order_result["message"] += f" | {', '.join(tp_sl_messages)}"
+
+        if response["status"] == "FILLED":
+            return primary_order_result, "success", "Emir gerçekleşti"
+        return primary_order_result, "pending", "Emir oluşturuldu (bekliyor)"
 
 
 class OrderActionThread(QThread):
-    """Emir işlemlerini (iptal/değiştir) arka planda çalıştıran thread"""
+    """Emir işlemlerini (iptal/değiştir) hesap ve sembole göre gruplayıp eşzamanlı çalıştıran thread"""
     progress_update = pyqtSignal(str, str)  # order_id, message
     finished = pyqtSignal(dict)  # results
 
-    def __init__(self, orders_data, action, modify_params=None, parent=None):
+    def __init__(self, orders_data, action, modify_params=None, symbol_order_counts=None,
+                 max_workers=DEFAULT_MAX_WORKERS, parent=None):
         super().__init__(parent)
         self.orders_data = orders_data  # {order_id: {order_info, account_data}}
         self.action = action  # "cancel" or "modify"
         self.modify_params = modify_params
+        # (hesap, sembol) -> tablodaki açık emir sayısı; sembolün tamamı seçildiyse toplu iptal kullanılır
+        self.symbol_order_counts = symbol_order_counts or {}
+        self.max_workers = max_workers
         self.results = {}
 
     def run(self):
@@ -429,133 +537,400 @@ class OrderActionThread(QThread):
         total_orders = len(self.orders_data)
         success_count = 0
         error_count = 0
+        unselected_count = 0
 
-        for i, (order_id, data) in enumerate(self.orders_data.items()):
-            order_info = data["order_info"]
-            account_data = data["account_data"]
-            account_name = data["account_name"]
-
+        for i, order_id in enumerate(self.orders_data):
             self.progress_update.emit(order_id, f"İşleniyor... ({i + 1}/{total_orders})")
 
-            try:
-                # Mevcut AccountWidget'ı kullan
-                temp_widget = AccountWidget(account_name, account_data)
-
-                if not temp_widget.connector or not temp_widget.connector.connected:
-                    self.results[order_id] = {
-                        "status": "Error",
-                        "message": "Bağlantı kurulamadı",
-                        "account": account_name
-                    }
+        # İşler rate limiter altında eşzamanlı yürütülür, sonuçlar tamamlandıkça işlenir
+        jobs = self.build_jobs()
+        for fan_result in FanOutExecutor(self.max_workers).run(self.run_job, jobs):
+            if fan_result.error is not None:
+                outcomes = [(order_id, {
+                    "status": "Error",
+                    "message": f"Hata: {str(fan_result.error)}",
+                    "account": fan_result.key[1]
+                }, f"Hata: {str(fan_result.error)}") for order_id in jobs[fan_result.key]]
+            else:
+                outcomes = fan_result.value
+
+            for order_id, result, message in outcomes:
+                self.results[order_id] = result
+                if result["status"] == "Error":
                     error_count += 1
-                    continue
-
-                if self.action == "cancel":
-                    # AccountWidget'daki cancel_order methodunu kullan
-                    if temp_widget.connector.cancel_order(order_info["symbol"], order_info["orderId"]):
-                        self.results[order_id] = {
-                            "status": "Success",
-                            "message": "Emir iptal edildi",
-                            "account": account_name
-                        }
-                        success_count += 1
-                        self.progress_update.emit(order_id, "İptal edildi")
-                    else:
-                        self.results[order_id] = {
-                            "status": "Error",
-                            "message": "İptal işlemi başarısız",
-                            "account": account_name
-                        }
-                        error_count += 1
-
-                elif self.action == "modify":
-                    # Önce eski emri iptal et
-                    temp_widget.connector.cancel_order(order_info["symbol"], order_info["orderId"])
-
-                    # Yeni emir oluştur
-                    new_params = {
-                        "symbol": order_info["symbol"],
-                        "side": order_info["side"],
-                        "type": order_info["type"],
-                        "quantity": float(order_info["origQty"])
-                    }
-
-                    # Değişiklik parametrelerini uygula
-                    if self.modify_params:
-                        if "price" in self.modify_params:
-                            new_params["price"] = self.modify_params["price"]
-                        if "quantity" in self.modify_params:
-                            new_params["quantity"] = self.modify_params["quantity"]
-                        if "stop_price" in self.modify_params:
-                            new_params["stopPrice"] = self.modify_params["stop_price"]
-
-                    # Emir tipine göre parametreleri ayarla
-                    if new_params["type"] in ["LIMIT", "STOP_LOSS_LIMIT"]:
-                        if "price" not in new_params:
-                            new_params["price"] = float(order_info["price"])
-                        new_params["timeInForce"] = "GTC"
-
-                    if "STOP_LOSS" in new_params["type"]:
-                        if "stopPrice" not in new_params:
-                            new_params["stopPrice"] = float(order_info.get("stopPrice", order_info["price"]))
-
-                    # Yeni emri oluştur
-                    response = temp_widget.connector.client.create_order(**new_params)
-
-                    self.results[order_id] = {
-                        "status": "Success",
-                        "message": f"Emir değiştirildi: {response['orderId']}",
-                        "account": account_name,
-                        "new_order_id": response["orderId"]
-                    }
-                    success_count += 1
-                    self.progress_update.emit(order_id, "Değiştirildi")
-
-                temp_widget.deleteLater()
-
-            except BinanceAPIException as e:
-                if "Unknown order" in str(e):
-                    self.results[order_id] = {
-                        "status": "Warning",
-                        "message": "Emir zaten mevcut değil",
-                        "account": account_name
-                    }
-                    success_count += 1
+                elif result["status"] == "Unselected":
+                    unselected_count += 1
                 else:
-                    self.results[order_id] = {
-                        "status": "Error",
-                        "message": f"API Hatası: {e.message}",
-                        "account": account_name
-                    }
-                    error_count += 1
-                self.progress_update.emit(order_id, f"Hata: {str(e)}")
-            except Exception as e:
-                self.results[order_id] = {
-                    "status": "Error",
-                    "message": f"Hata: {str(e)}",
-                    "account": account_name
-                }
-                self.progress_update.emit(order_id, f"Hata: {str(e)}")
-                error_count += 1
+                    success_count += 1
+                if message:
+                    self.progress_update.emit(order_id, message)
 
         # Sonuçları gönder
         summary = {
             "total": total_orders,
             "success": success_count,
             "error": error_count,
+            "unselected": unselected_count,
             "results": self.results
         }
         self.finished.emit(summary)
 
+    def build_jobs(self):
+        """Emirleri hesap ve sembole göre gruplayıp iş listesine çevirir"""
+        groups = {}
+        for order_id, data in self.orders_data.items():
+            key = (data["account_name"], data["order_info"]["symbol"])
+            groups.setdefault(key, []).append(order_id)
+
+        jobs = {}
+        for (account_name, symbol), order_ids in groups.items():
+            whole_symbol = (self.action == "cancel" and len(order_ids) > 1
+                            and self.symbol_order_counts.get((account_name, symbol)) == len(order_ids))
+            if whole_symbol:
+                jobs[("cancel_all", account_name, symbol)] = order_ids
+            else:
+                for order_id in order_ids:
+                    jobs[("order", account_name, order_id)] = [order_id]
+        return jobs
+
+    def run_job(self, job_key, order_ids):
+        """Tek bir işi çalıştırır; (order_id, sonuç, ilerleme mesajı) listesi döndürür"""
+        kind, account_name = job_key[0], job_key[1]
+        account_data = self.orders_data[order_ids[0]]["account_data"]
+
+        # Havuzdaki bağlı connector'ı kullan
+        connector = connector_pool.get(account_name, account_data)
+        if not connector.connected:
+            return [(order_id, {
+                "status": "Error",
+                "message": "Bağlantı kurulamadı",
+                "account": account_name
+            }, None) for order_id in order_ids]
+
+        if kind == "cancel_all":
+            return self.cancel_symbol(connector, account_name, job_key[2], order_ids)
+        return [self.process_order(connector, account_name, order_ids[0])]
+
+    def cancel_symbol(self, connector, account_name, symbol, order_ids):
+        """Sembolün tüm açık emirlerini DELETE openOrders ile tek istekte iptal eder.
+
+        Tablo eski olabileceği için önce sunucudaki açık emirler çekilir; seçimle birebir
+        aynı değilse (ör. sonradan verilmiş emir varsa) emirler tek tek iptal edilir.
+        """
+        open_orders = connector.get_open_orders(symbol)
+        if open_orders is None or {str(order["orderId"]) for order in open_orders} != set(order_ids):
+            return [self.process_order(connector, account_name, order_id) for order_id in order_ids]
+
+        cancelled = connector.cancel_open_orders(symbol)
+        if cancelled is None:
+            # Toplu iptal başarısızsa emirler tek tek denenir
+            return [self.process_order(connector, account_name, order_id) for order_id in order_ids]
+
+        # Kontrol ile iptal arasında verilen emirler de iptal edilmiş olabilir; sonuçlarda gösterilir
+        cancelled = {str(order_id) for order_id in cancelled}
+        outcomes = [(order_id, {
+            "status": "Unselected",
+            "message": f"Seçilmemiş {symbol} emri de iptal edildi",
+            "account": account_name
+        }, "Seçilmemiş emir de iptal edildi") for order_id in sorted(cancelled - set(order_ids))]
+
+        for order_id in order_ids:
+            if order_id in cancelled:
+                outcomes.append((order_id, {
+                    "status": "Success",
+                    "message": "Emir iptal edildi",
+                    "account": account_name
+                }, "İptal edildi"))
+            else:
+                outcomes.append((order_id, {
+                    "status": "Warning",
+                    "message": "Emir zaten mevcut değil",
+                    "account": account_name
+                }, "Emir zaten mevcut değil"))
+        return outcomes
+
+    def process_order(self, connector, account_name, order_id):
+        """Tek bir emri iptal eder veya değiştirir"""
+        order_info = self.orders_data[order_id]["order_info"]
+
+        try:
+            if self.action == "cancel":
+                # Connector'daki cancel_order methodunu kullan
+                if connector.cancel_order(order_info["symbol"], order_info["orderId"]):
+                    return order_id, {
+                        "status": "Success",
+                        "message": "Emir iptal edildi",
+                        "account": account_name
+                    }, "İptal edildi"
+                return order_id, {
+                    "status": "Error",
+                    "message": "İptal işlemi başarısız",
+                    "account": account_name
+                }, None
+
+            # Yeni emir oluştur
+            new_params = {
+                "symbol": order_info["symbol"],
+                "side": order_info["side"],
+                "type": order_info["type"],
+                "quantity": float(order_info["origQty"])
+            }
+
+            # Değişiklik parametrelerini uygula
+            if self.modify_params:
+                if "price" in self.modify_params:
+                    new_params["price"] = self.modify_params["price"]
+                if "quantity" in self.modify_params:
+                    new_params["quantity"] = self.modify_params["quantity"]
+                if "stop_price" in self.modify_params:
+                    new_params["stopPrice"] = self.modify_params["stop_price"]
+
+            # Emir tipine göre parametreleri ayarla
+            if new_params["type"] in ["LIMIT", "STOP_LOSS_LIMIT"]:
+                if "price" not in new_params:
+                    new_params["price"] = float(order_info["price"])
+                new_params["timeInForce"] = "GTC"
+
+            if "STOP_LOSS" in new_params["type"]:
+                if "stopPrice" not in new_params:
+                    new_params["stopPrice"] = float(order_info.get("stopPrice", order_info["price"]))
+
+            # Miktar ve fiyatları sembol filtrelerine göre yuvarla
+            filters = connector.get_symbol_filters(new_params["symbol"])
+            if filters:
+                new_params["quantity"] = filters.round_quantity(new_params["quantity"])
+                for key in ("price", "stopPrice"):
+                    if key in new_params:
+                        new_params[key] = filters.round_price(new_params[key])
+
+            return self.replace_order(connector, account_name, order_id, order_info, new_params)
+
+        except BinanceAPIException as e:
+            if "Unknown order" in str(e):
+                result = {
+                    "status": "Warning",
+                    "message": "Emir zaten mevcut değil",
+                    "account": account_name
+                }
+            else:
+                result = {
+                    "status": "Error",
+                    "message": f"API Hatası: {e.message}",
+                    "account": account_name
+                }
+            return order_id, result, f"Hata: {str(e)}"
+        except Exception as e:
+            return order_id, {
+                "status": "Error",
+                "message": f"Hata: {str(e)}",
+                "account": account_name
+            }, f"Hata: {str(e)}"
+
+    def replace_order(self, connector, account_name, order_id, order_info, new_params):
+        """Emri order/cancelReplace ile tek istekte değiştirir, desteklenmiyorsa iki adımda"""
+        old_order_id = order_info["orderId"]
+
+        if connector.cancel_replace_supported:
+            try:
+                response = connector.cancel_replace_order(old_order_id, **new_params)
+                new_order_id = response["newOrderResponse"]["orderId"]
+                return order_id, {
+                    "status": "Success",
+                    "message": f"Emir değiştirildi: {old_order_id} -> {new_order_id}",
+                    "account": account_name,
+                    "old_order_id": old_order_id,
+                    "new_order_id": new_order_id
+                }, "Değiştirildi"
+            except BinanceAPIException as e:
+                if e.code == CANCEL_REPLACE_CANCEL_FAILED:
+                    return order_id, {
+                        "status": "Error",
+                        "message": "Eski emir iptal edilemedi, yeni emir verilmedi",
+                        "account": account_name,
+                        "old_order_id": old_order_id
+                    }, f"Hata: {str(e)}"
+                if e.code == CANCEL_REPLACE_NEW_FAILED:
+                    return order_id, {
+                        "status": "Error",
+                        "message": "Eski emir iptal edildi ancak yeni emir verilemedi",
+                        "account": account_name,
+                        "old_order_id": old_order_id
+                    }, f"Hata: {str(e)}"
+                if e.status_code != 404:
+                    raise
+                # Uç nokta bu ağda yoksa bir daha denenmez
+                connector.cancel_replace_supported = False
+
+        # İki adımlı yol: iptal başarısızsa yeni emir verilmez
+        if not connector.cancel_order(order_info["symbol"], old_order_id):
+            return order_id, {
+                "status": "Error",
+                "message": "Eski emir iptal edilemedi, yeni emir verilmedi",
+                "account": account_name,
+                "old_order_id": old_order_id
+            }, None
+
+        response = connector.client.create_order(**new_params)
+        return order_id, {
+            "status": "Success",
+            "message": f"Emir değiştirildi: {old_order_id} -> {response['orderId']}",
+            "account": account_name,
+            "old_order_id": old_order_id,
+            "new_order_id": response["orderId"]
+        }, "Değiştirildi"
+
+
+class OpenOrdersLoaderThread(QThread):
+    """Seçilen hesapların açık emirlerini eşzamanlı yükleyen thread"""
+    orders_loaded = pyqtSignal(str, list)  # account_name, orders
+    account_failed = pyqtSignal(str, str)  # account_name, message
+    loading_complete = pyqtSignal(int)  # total order count
+
+    def __init__(self, accounts, symbol=None, max_workers=DEFAULT_MAX_WORKERS, parent=None):
+        super().__init__(parent)
+        self.accounts = accounts
+        self.symbol = symbol
+        self.max_workers = max_workers
+
+    def run(self):
+        """Her hesap tamamlandıkça emirlerini gönderir"""
+        total_orders = 0
+        executor = FanOutExecutor(self.max_workers)
+
+        for outcome in executor.run(self.load_account_orders, self.accounts):
+            if outcome.error is not None:
+                self.account_failed.emit(outcome.key, str(outcome.error))
+            elif outcome.value is None:
+                self.account_failed.emit(outcome.key, "Bağlantı kurulamadı")
+            else:
+                total_orders += len(outcome.value)
+                self.orders_loaded.emit(outcome.key, outcome.value)
+
+        self.loading_complete.emit(total_orders)
+
+    def load_account_orders(self, account_name, account_data):
+        """Tek hesabın açık emirlerini getirir (sembol filtresi sunucuda uygulanır)"""
+        connector = connector_pool.get(account_name, account_data)
+        if not connector.connected:
+            return None
+
+        open_orders = connector.get_open_orders(symbol=self.symbol)
+        if open_orders is None:
+            return None
+
+        for order in open_orders:
+            order["account_name"] = account_name
+        return open_orders
+
+
+class AsyncOpenOrdersLoader(QObject):
+    """OpenOrdersLoaderThread'in asyncio sürümü; tüm hesaplar tek event loop'ta, thread açmadan yüklenir"""
+    orders_loaded = pyqtSignal(str, list)  # account_name, orders
+    account_failed = pyqtSignal(str, str)  # account_name, message
+    loading_complete = pyqtSignal(int)  # total order count
+
+    def __init__(self, event_loop, accounts, symbol=None, parent=None):
+        super().__init__(parent)
+        self.event_loop = event_loop
+        self.accounts = accounts
+        self.symbol = symbol
+
+    def start(self):
+        self.event_loop.submit(self.run())
+
+    async def run(self):
+        """Her hesap tamamlandıkça emirlerini gönderir"""
+        total_orders = 0
+        tasks = [asyncio.ensure_future(self.load_account_orders(name, data))
+                 for name, data in self.accounts.items()]
+        for task in asyncio.as_completed(tasks):
+            account_name, open_orders, error = await task
+            if open_orders is None:
+                self.account_failed.emit(account_name, error)
+            else:
+                total_orders += len(open_orders)
+                self.orders_loaded.emit(account_name, open_orders)
+
+        self.loading_complete.emit(total_orders)
+
+    async def load_account_orders(self, account_name, account_data):
+        """(hesap, emirler, hata mesajı) döndürür; hata fırlatmaz ki her hesap ilerlemeye sayılsın"""
+        try:
+            connector = await async_binance_api.get_connector(account_name, account_data)
+            if connector is None:
+                return account_name, None, "Bağlantı kurulamadı"
+
+            open_orders = await connector.get_open_orders(symbol=self.symbol)
+        except Exception as e:
+            return account_name, None, str(e)
+        if open_orders is None:
+            return account_name, None, "Açık emirler alınamadı"
+
+        for order in open_orders:
+            order["account_name"] = account_name
+        return account_name, open_orders, None
+
+
+class ExposureSnapshotThread(QThread):
+    """Hesapların bakiye ve açık emirlerini tek eşzamanlı görüntü olarak çeken thread"""
+    account_snapshot = pyqtSignal(str, bool, list, list)  # account_name, testnet, balances, open_orders
+    account_failed = pyqtSignal(str, str)  # account_name, message
+    snapshot_complete = pyqtSignal(dict)  # {account_name: toplam USD}
+
+    def __init__(self, accounts, max_workers=DEFAULT_MAX_WORKERS, parent=None):
+        super().__init__(parent)
+        self.accounts = accounts
+        self.max_workers = max_workers
+
+    def run(self):
+        balances_by_network = {}
+        connectors = {}
+
+        for outcome in FanOutExecutor(self.max_workers).run(self.load_account, self.accounts):
+            if outcome.error is not None or outcome.value is None:
+                message = str(outcome.error) if outcome.error is not None else "Bağlantı kurulamadı"
+                self.account_failed.emit(outcome.key, message)
+                continue
+
+            connector, balances, open_orders = outcome.value
+            connectors.setdefault(connector.testnet, connector)
+            balances_by_network.setdefault(connector.testnet, {})[outcome.key] = balances
+            self.account_snapshot.emit(outcome.key, connector.testnet, balances, open_orders)
+
+        # Her ağ için fiyatlar bir kez güncellenir, hesaplar tek geçişte değerlenir
+        totals = {}
+        for testnet, balances_by_account in balances_by_network.items():
+            engine = get_valuation_engine(testnet)
+            engine.refresh(connectors[testnet])
+            totals.update(engine.value_accounts(balances_by_account))
+        self.snapshot_complete.emit(totals)
+
+    def load_account(self, account_name, account_data):
+        connector = connector_pool.get(account_name, account_data)
+        if not connector.connected:
+            return None
+
+        balances = connector.get_account_balance()
+        open_orders = connector.get_open_orders()
+        if balances is None or open_orders is None:
+            raise RuntimeError("Bakiye veya açık emirler alınamadı")
+        return connector, balances, open_orders
+
 
 class AdminPanel(QWidget):
     refresh_accounts_signal = pyqtSignal()
 
-    def __init__(self, account_manager, parent=None):
+    def __init__(self, account_manager, user_streams=None, parent=None):
         super().__init__(parent)
         self.account_manager = account_manager
+        self.user_streams = user_streams
+        self.live_updates = False
+        self.order_streams = {}  # hesap -> UserDataStream (canlı hesap güncellemeleri açıkken)
         self.current_thread = None
         self.initialization_thread = None
+        self.orders_loader = None
+        self.exposure_loader = None
+        self.exposure_book = ExposureBook()
         self.accounts_data = {}
 
         self.init_ui()
@@ -599,9 +974,15 @@ class AdminPanel(QWidget):
         self.open_orders_tab = QWidget()
         self.setup_open_orders_tab()
 
+        # Tab 4: Varlık bazında toplam pozisyon
+        self.exposure_tab = QWidget()
+        self.setup_exposure_tab()
+
         self.tabs.addTab(self.bulk_order_tab, "Bulk Order")
         self.tabs.addTab(self.summary_tab, "Account Summary")
         self.tabs.addTab(self.open_orders_tab, "Open Orders")
+        self.tabs.addTab(self.exposure_tab, "Exposure")
+        self.tabs.currentChanged.connect(self.on_tab_changed)
 
         layout.addWidget(self.tabs)
         self.main_content.setLayout(layout)
@@ -619,6 +1000,7 @@ class AdminPanel(QWidget):
         # Start initialization thread
         self.initialization_thread = InitializationThread(self.account_manager)
         self.initialization_thread.progress_update.connect(self.on_initialization_progress)
+        self.initialization_thread.accounts_listed.connect(self.on_accounts_listed)
         self.initialization_thread.accounts_loaded.connect(self.on_accounts_loaded)
         self.initialization_thread.summary_loaded.connect(self.on_summary_loaded)
         self.initialization_thread.initialization_complete.connect(self.on_initialization_complete)
@@ -629,16 +1011,37 @@ class AdminPanel(QWidget):
         """Update initialization progress"""
         self.loading_overlay.update_message(message)
 
+    @pyqtSlot(list)
+    def on_accounts_listed(self, account_names):
+        """Drop rows of accounts that no longer exist"""
+        for name in list(self.accounts_data.keys()):
+            if name not in account_names:
+                del self.accounts_data[name]
+
+        for table in (self.accounts_table, self.summary_table):
+            name_column = 1 if table is self.accounts_table else 0
+            for i in reversed(range(table.rowCount())):
+                item = table.item(i, name_column)
+                if item is None or item.text() not in account_names:
+                    table.removeRow(i)
+
+        for i in reversed(range(1, self.orders_account_filter.count())):
+            if self.orders_account_filter.itemText(i) not in account_names:
+                self.open_orders_model.remove_account(self.orders_account_filter.itemText(i))
+                self.orders_account_filter.removeItem(i)
+
     @pyqtSlot(dict)
     def on_accounts_loaded(self, accounts_data):
-        """Handle accounts loaded"""
-        self.accounts_data = accounts_data
-        self.populate_accounts_table()
+        """Handle accounts loaded (streamed as each account completes)"""
+        self.accounts_data.update(accounts_data)
+        for name, account_info in accounts_data.items():
+            self.upsert_account_row(name, account_info)
 
     @pyqtSlot(list)
     def on_summary_loaded(self, summary_data):
-        """Handle summary loaded"""
-        self.populate_summary_table(summary_data)
+        """Handle summary loaded (streamed as each account completes)"""
+        for row_data in summary_data:
+            self.upsert_summary_row(row_data)
 
     @pyqtSlot()
     def on_initialization_complete(self):
@@ -682,19 +1085,48 @@ class AdminPanel(QWidget):
             status_item.setForeground(QColor(account_info["color"]))
             self.accounts_table.setItem(i, 2, status_item)
 
-    def populate_summary_table(self, summary_data):
-        """Populate summary table with loaded data"""
-        self.summary_table.setRowCount(len(summary_data))
+    def find_table_row(self, table, column, text):
+        """Return the row whose given column has the text, or -1"""
+        for i in range(table.rowCount()):
+            item = table.item(i, column)
+            if item is not None and item.text() == text:
+                return i
+        return -1
+
+    def upsert_account_row(self, name, account_info):
+        """Add or update a single account row, keeping its checkbox state"""
+        row = self.find_table_row(self.accounts_table, 1, name)
+        if row < 0:
+            row = self.accounts_table.rowCount()
+            self.accounts_table.insertRow(row)
+
+            checkbox = QTableWidgetItem()
+            checkbox.setFlags(Qt.ItemIsUserCheckable | Qt.ItemIsEnabled)
+            checkbox.setCheckState(Qt.Unchecked)
+            self.accounts_table.setItem(row, 0, checkbox)
+            self.accounts_table.setItem(row, 1, QTableWidgetItem(name))
+
+        status_item = QTableWidgetItem(account_info["status"])
+        status_item.setForeground(QColor(account_info["color"]))
+        self.accounts_table.setItem(row, 2, status_item)
+
+        if self.orders_account_filter.findText(name) < 0:
+            self.orders_account_filter.addItem(name)
 
-        for i, row_data in enumerate(summary_data):
-            self.summary_table.setItem(i, 0, QTableWidgetItem(row_data["name"]))
+    def upsert_summary_row(self, row_data):
+        """Add or update a single summary row"""
+        row = self.find_table_row(self.summary_table, 0, row_data["name"])
+        if row < 0:
+            row = self.summary_table.rowCount()
+            self.summary_table.insertRow(row)
+            self.summary_table.setItem(row, 0, QTableWidgetItem(row_data["name"]))
 
-            status_item = QTableWidgetItem(row_data["status"])
-            status_item.setForeground(QColor(row_data["status_color"]))
-            self.summary_table.setItem(i, 1, status_item)
+        status_item = QTableWidgetItem(row_data["status"])
+        status_item.setForeground(QColor(row_data["status_color"]))
+        self.summary_table.setItem(row, 1, status_item)
 
-            self.summary_table.setItem(i, 2, QTableWidgetItem(row_data["total_value"]))
-            self.summary_table.setItem(i, 3, QTableWidgetItem(row_data["open_orders"]))
+        self.summary_table.setItem(row, 2, QTableWidgetItem(row_data["total_value"]))
+        self.summary_table.setItem(row, 3, QTableWidgetItem(row_data["open_orders"]))
 
     def setup_bulk_order_tab(self):
         layout = QVBoxLayout()
@@ -815,6 +1247,20 @@ class AdminPanel(QWidget):
         sl_layout.addWidget(self.stop_loss_input)
         order_layout.addRow("Stop Loss:", sl_layout)
 
+        # Aynı anda emir gönderilecek hesap sayısı
+        self.concurrency_input = QSpinBox()
+        self.concurrency_input.setMinimum(1)
+        self.concurrency_input.setMaximum(64)
+        self.concurrency_input.setValue(DEFAULT_MAX_WORKERS)
+        order_layout.addRow("Concurrency:", self.concurrency_input)
+
+        # Sunucu tarafı test emri: gerçek dalgadan önce eşzamanlı veya hiç
+        self.test_order_combo = QComboBox()
+        self.test_order_combo.addItem("Parallel pre-check", TEST_ORDER_PARALLEL)
+        self.test_order_combo.addItem("Skip (local validation only)", TEST_ORDER_SKIP)
+        self.test_order_combo.setCurrentIndex(self.test_order_combo.findData(DEFAULT_TEST_ORDER_MODE))
+        order_layout.addRow("Test Orders:", self.test_order_combo)
+
         # Başlangıçta görünürlüğü ayarla
         self.on_order_type_changed("MARKET")
 
@@ -868,6 +1314,24 @@ class AdminPanel(QWidget):
 
         self.summary_tab.setLayout(layout)
 
+    def setup_exposure_tab(self):
+        layout = QVBoxLayout()
+
+        # Varlık x hesap matrisi
+        self.exposure_table = QTableWidget()
+        self.exposure_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.exposure_table)
+
+        self.exposure_status_label = QLabel("")
+        layout.addWidget(self.exposure_status_label)
+
+        # Sadece değişen veya eskiyen hesaplar yeniden çekilir
+        refresh_exposure_btn = QPushButton("Refresh Exposure")
+        refresh_exposure_btn.clicked.connect(self.refresh_exposure)
+        layout.addWidget(refresh_exposure_btn)
+
+        self.exposure_tab.setLayout(layout)
+
     def setup_open_orders_tab(self):
         layout = QVBoxLayout()
 
@@ -888,21 +1352,31 @@ class AdminPanel(QWidget):
         self.orders_account_filter.addItem("ALL")
         filter_layout.addWidget(self.orders_account_filter)
 
+        # Filtreler yüklü emirlere anında uygulanır, yenileme sunucudan tekrar çeker
+        self.orders_symbol_filter.currentTextChanged.connect(self.apply_orders_filter)
+        self.orders_account_filter.currentTextChanged.connect(self.apply_orders_filter)
+
         # Yenileme butonu
         refresh_orders_btn = QPushButton("Refresh Orders")
         refresh_orders_btn.clicked.connect(self.load_open_orders)
         filter_layout.addWidget(refresh_orders_btn)
 
+        # Yükleme durumu
+        self.orders_status_label = QLabel("")
+        filter_layout.addWidget(self.orders_status_label)
+
         filter_group.setLayout(filter_layout)
         layout.addWidget(filter_group)
 
-        # Açık emirler tablosu
-        self.open_orders_table = QTableWidget()
-        self.open_orders_table.setColumnCount(10)
-        self.open_orders_table.setHorizontalHeaderLabels([
-            "Select", "Account", "Symbol", "Side", "Type", "Quantity",
-            "Price", "Stop Price", "Status", "Order ID"
-        ])
+        # Açık emirler tablosu (model/view)
+        self.open_orders_model = OpenOrdersTableModel(self)
+        self.open_orders_proxy = OpenOrdersFilterProxyModel(self)
+        self.open_orders_proxy.setSourceModel(self.open_orders_model)
+
+        self.open_orders_table = QTableView()
+        self.open_orders_table.setModel(self.open_orders_proxy)
+        self.open_orders_table.setSortingEnabled(True)
+        self.open_orders_table.verticalHeader().setVisible(False)
 
         # Tablo ayarları
         header = self.open_orders_table.horizontalHeader()
@@ -917,7 +1391,7 @@ class AdminPanel(QWidget):
         header.setSectionResizeMode(8, QHeaderView.ResizeToContents)  # Status
         header.setSectionResizeMode(9, QHeaderView.Stretch)  # Order ID
 
-        self.open_orders_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.open_orders_table.setSelectionBehavior(QTableView.SelectRows)
         layout.addWidget(self.open_orders_table)
 
         # Seçim butonları
@@ -981,6 +1455,7 @@ class AdminPanel(QWidget):
         # Start initialization thread for refresh
         self.initialization_thread = InitializationThread(self.account_manager)
         self.initialization_thread.progress_update.connect(self.on_initialization_progress)
+        self.initialization_thread.accounts_listed.connect(self.on_accounts_listed)
         self.initialization_thread.accounts_loaded.connect(self.on_accounts_loaded)
         self.initialization_thread.initialization_complete.connect(self.loading_overlay.hide_loading)
         self.initialization_thread.start()
@@ -991,119 +1466,224 @@ class AdminPanel(QWidget):
 
         self.initialization_thread = InitializationThread(self.account_manager)
         self.initialization_thread.progress_update.connect(self.on_initialization_progress)
+        self.initialization_thread.accounts_listed.connect(self.on_accounts_listed)
         self.initialization_thread.summary_loaded.connect(self.on_summary_loaded)
         self.initialization_thread.initialization_complete.connect(self.loading_overlay.hide_loading)
         self.initialization_thread.start()
 
-    def load_open_orders(self):
-        """Açık emirlerin yüklenmesi"""
-        self.loading_overlay.show_loading("Loading open orders...")
+    def on_tab_changed(self, index):
+        """Exposure sekmesi açıldığında eskiyen hesapları yenile"""
+        if self.tabs.widget(index) is self.exposure_tab:
+            self.refresh_exposure()
 
-        # Use QTimer to make it async
-        QTimer.singleShot(100, self._load_open_orders_async)
+    def refresh_exposure(self):
+        """Sadece kirli veya eskimiş hesapların görüntüsünü çekip matrisi güncelle"""
+        if self.exposure_loader is not None and self.exposure_loader.isRunning():
+            return
 
-    def _load_open_orders_async(self):
-        """Emirlerin asenkron yüklenmesi"""
-        try:
-            accounts = self.account_manager.get_all_accounts()
-            all_orders = []
-
-            # Filtreleri al
-            symbol_filter = self.orders_symbol_filter.currentText().strip()
-            account_filter = self.orders_account_filter.currentText().strip()
-
-            if symbol_filter == "ALL":
-                symbol_filter = None
-            if account_filter == "ALL":
-                account_filter = None
-
-            total_accounts = len(accounts)
-            for i, (account_name, account_data) in enumerate(accounts.items()):
-                self.loading_overlay.update_message(f"Loading orders {i + 1}/{total_accounts}: {account_name}")
-
-                # Hesap filtresi
-                if account_filter and account_name != account_filter:
-                    continue
-
-                try:
-                    # AccountWidget'ı kullanarak açık emirleri al
-                    temp_widget = AccountWidget(account_name, account_data)
-                    if temp_widget.connector and temp_widget.connector.connected:
-                        # Mevcut get_open_orders methodunu kullan
-                        open_orders = temp_widget.connector.get_open_orders()
-
-                        if open_orders:
-                            for order in open_orders:
-                                # Sembol filtresi
-                                if symbol_filter and order["symbol"] != symbol_filter:
-                                    continue
-
-                                order["account_name"] = account_name
-                                order["account_data"] = account_data
-                                all_orders.append(order)
-
-                    temp_widget.deleteLater()
-                except Exception as e:
-                    continue
-
-            # Tabloyu doldur
-            self.open_orders_table.setRowCount(len(all_orders))
-
-            for i, order in enumerate(all_orders):
-                # Checkbox
-                checkbox = QTableWidgetItem()
-                checkbox.setFlags(Qt.ItemIsUserCheckable | Qt.ItemIsEnabled)
-                checkbox.setCheckState(Qt.Unchecked)
-                self.open_orders_table.setItem(i, 0, checkbox)
-
-                # Hesap adı
-                self.open_orders_table.setItem(i, 1, QTableWidgetItem(order["account_name"]))
-
-                # Sembol
-                self.open_orders_table.setItem(i, 2, QTableWidgetItem(order["symbol"]))
-
-                # Side
-                side_item = QTableWidgetItem(order["side"])
-                if order["side"] == "BUY":
-                    side_item.setForeground(QColor("green"))
-                else:
-                    side_item.setForeground(QColor("red"))
-                self.open_orders_table.setItem(i, 3, side_item)
+        accounts = self.account_manager.get_all_accounts()
+        self.exposure_book.retain(accounts)
+        stale = self.exposure_book.accounts_to_refresh(accounts)
+        if not stale:
+            self.render_exposure()
+            return
 
-                # Type
-                self.open_orders_table.setItem(i, 4, QTableWidgetItem(order["type"]))
+        self.exposure_status_label.setText(f"Refreshing {len(stale)} of {len(accounts)} accounts...")
+        self.exposure_loader = ExposureSnapshotThread({name: accounts[name] for name in stale},
+                                                      max_workers=self.concurrency_input.value(), parent=self)
+        self.exposure_loader.account_snapshot.connect(self.on_exposure_snapshot)
+        self.exposure_loader.account_failed.connect(self.on_exposure_failed)
+        self.exposure_loader.snapshot_complete.connect(self.on_exposure_complete)
+        self.exposure_loader.start()
 
-                # Quantity
-                self.open_orders_table.setItem(i, 5, QTableWidgetItem(f"{float(order['origQty']):.8f}"))
+    @pyqtSlot(str, bool, list, list)
+    def on_exposure_snapshot(self, account_name, testnet, balances, open_orders):
+        self.exposure_book.update(account_name, testnet, balances, open_orders)
+
+    @pyqtSlot(str, str)
+    def on_exposure_failed(self, account_name, message):
+        print(f"{account_name} pozisyon görüntüsü alınamadı: {message}")
 
-                # Price
-                price_text = f"{float(order['price']):.8f}" if order.get("price") and float(
-                    order["price"]) > 0 else "Market"
-                self.open_orders_table.setItem(i, 6, QTableWidgetItem(price_text))
+    @pyqtSlot(dict)
+    def on_exposure_complete(self, totals):
+        """Matrisi çiz ve özet tablosundaki toplam değerleri güncelle"""
+        for name, total in totals.items():
+            row = self.find_table_row(self.summary_table, 0, name)
+            if row >= 0:
+                self.summary_table.setItem(row, 2, QTableWidgetItem(f"{total:.2f}"))
+        self.render_exposure()
+
+    def render_exposure(self):
+        """(Ağ, varlık) x hesap matrisini ağ başına toplamlarla birlikte tabloya yaz"""
+        pivot = self.exposure_book.pivot(valuation_engines)
+        accounts = pivot["accounts"]
+        network_totals = pivot["network_totals_usd"]
+        headers = ["Asset", "Network"] + accounts + ["Total", "Locked", "Resting Orders (USD)", "Total (USD)"]
+
+        self.exposure_table.clear()
+        self.exposure_table.setColumnCount(len(headers))
+        self.exposure_table.setHorizontalHeaderLabels(headers)
+        self.exposure_table.setRowCount(len(pivot["rows"]) + len(network_totals))
+
+        for i, entry in enumerate(pivot["rows"]):
+            self.exposure_table.setItem(i, 0, QTableWidgetItem(entry["asset"]))
+            self.exposure_table.setItem(i, 1, QTableWidgetItem(entry["network"]))
+            for j, account in enumerate(accounts):
+                amount = entry["amounts"][account]
+                self.exposure_table.setItem(i, j + 2, QTableWidgetItem(f"{amount:.8f}" if amount else "-"))
+
+            column = len(accounts) + 2
+            self.exposure_table.setItem(i, column, QTableWidgetItem(f"{entry['total']:.8f}"))
+            self.exposure_table.setItem(i, column + 1, QTableWidgetItem(f"{entry['locked']:.8f}"))
+
+            resting_item = QTableWidgetItem(f"{entry['resting_usd']:+.2f}" if entry["resting_usd"] else "-")
+            if entry["resting_usd"]:
+                resting_item.setForeground(QColor("green" if entry["resting_usd"] > 0 else "red"))
+            self.exposure_table.setItem(i, column + 2, resting_item)
+
+            total_usd = entry["total_usd"]
+            self.exposure_table.setItem(i, column + 3, QTableWidgetItem(
+                f"${total_usd:.2f}" if total_usd is not None else "N/A"))
+
+        # Son satırlar: her ağ için hesap başına ve genel USD toplamı (testnet ve mainnet toplanmaz)
+        for k, network in enumerate(sorted(network_totals)):
+            last = len(pivot["rows"]) + k
+            self.exposure_table.setItem(last, 0, QTableWidgetItem("Total (USD)"))
+            self.exposure_table.setItem(last, 1, QTableWidgetItem(network))
+            for j, account in enumerate(accounts):
+                if pivot["account_networks"][account] == network:
+                    self.exposure_table.setItem(last, j + 2, QTableWidgetItem(
+                        f"${pivot['account_totals_usd'][account]:.2f}"))
+            self.exposure_table.setItem(last, len(headers) - 1, QTableWidgetItem(f"${network_totals[network]:.2f}"))
+
+        self.exposure_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.exposure_status_label.setText(
+            f"{len(accounts)} account(s), {len(pivot['rows'])} asset(s), "
+            f"updated {datetime.now().strftime('%H:%M:%S')}")
+
+    def load_open_orders(self):
+        """Açık emirleri arka planda, hesaplar tamamlandıkça tabloya ekleyerek yükle"""
+        accounts = self.account_manager.get_all_accounts()
+
+        # Filtreleri al
+        symbol_filter = self.orders_symbol_filter.currentText().strip()
+        account_filter = self.orders_account_filter.currentText().strip()
+
+        if symbol_filter == "ALL":
+            symbol_filter = None
+        if account_filter and account_filter != "ALL":
+            accounts = {name: data for name, data in accounts.items() if name == account_filter}
+
+        self.orders_loaded_accounts = 0
+        self.orders_total_accounts = len(accounts)
+        self.orders_status_label.setText(f"Loading 0/{len(accounts)} accounts...")
+
+        # Önceki yükleme sürüyorsa sonuçları artık dikkate alınmaz. aiohttp kuruluysa hesaplar
+        # thread havuzu yerine ortak asyncio döngüsünde yüklenir
+        event_loop = async_binance_api.get_event_loop()
+        if event_loop is not None and async_binance_api.is_available():
+            self.orders_loader = AsyncOpenOrdersLoader(event_loop, accounts, symbol=symbol_filter, parent=self)
+        else:
+            self.orders_loader = OpenOrdersLoaderThread(accounts, symbol=symbol_filter, parent=self)
+        self.orders_loader.orders_loaded.connect(self.on_account_orders_loaded)
+        self.orders_loader.account_failed.connect(self.on_account_orders_failed)
+        self.orders_loader.loading_complete.connect(self.on_open_orders_loaded)
+        self.orders_loader.start()
+
+    @pyqtSlot(str, list)
+    def on_account_orders_loaded(self, account_name, orders):
+        """Bir hesabın emirlerini tabloya ekle"""
+        if self.sender() is not self.orders_loader:
+            return
 
-                # Stop Price
-                stop_price_text = f"{float(order['stopPrice']):.8f}" if order.get("stopPrice") else "-"
-                self.open_orders_table.setItem(i, 7, QTableWidgetItem(stop_price_text))
+        # Sadece değişen satırlar güncellenir
+        self.open_orders_model.set_account_orders(account_name, orders, symbol=self.orders_loader.symbol)
+        if self.orders_loader.symbol is None:
+            self.exposure_book.update_orders(account_name, orders)
+        self.attach_order_stream(account_name)
+        self.advance_orders_status()
 
-                # Status
-                status_item = QTableWidgetItem(order["status"])
-                if order["status"] == "NEW":
-                    status_item.setForeground(QColor("blue"))
-                elif order["status"] == "PARTIALLY_FILLED":
-                    status_item.setForeground(QColor("orange"))
-                self.open_orders_table.setItem(i, 8, status_item)
+    @pyqtSlot(str, str)
+    def on_account_orders_failed(self, account_name, message):
+        """Emirleri alınamayan hesabı ilerlemeye say"""
+        if self.sender() is not self.orders_loader:
+            return
+        print(f"{account_name} açık emirleri alınamadı: {message}")
+        self.advance_orders_status()
+
+    def advance_orders_status(self):
+        self.orders_loaded_accounts += 1
+        self.orders_status_label.setText(
+            f"Loading {self.orders_loaded_accounts}/{self.orders_total_accounts} accounts...")
+
+    @pyqtSlot(int)
+    def on_open_orders_loaded(self, total_orders):
+        """Yükleme tamamlandığında"""
+        loader = self.sender()
+        if loader is not self.orders_loader:
+            loader.deleteLater()
+            return
 
-                # Order ID
-                self.open_orders_table.setItem(i, 9, QTableWidgetItem(str(order["orderId"])))
+        self.orders_status_label.setText(f"{total_orders} open orders")
+        self.orders_loader.deleteLater()
+        self.orders_loader = None
 
-            # Bilgi mesajı
-            if len(all_orders) == 0:
-                QMessageBox.information(self, "Info", "No open orders found.")
+        # Bilgi mesajı
+        if total_orders == 0:
+            QMessageBox.information(self, "Info", "No open orders found.")
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to load orders: {str(e)}")
-        finally:
-            self.loading_overlay.hide_loading()
+    def set_live_updates(self, enabled):
+        """Açık emirler tablosunu bağlı hesapların user-data akışlarından güncelle"""
+        self.live_updates = enabled and self.user_streams is not None
+        if self.live_updates:
+            for account_name in self.account_manager.get_all_accounts():
+                self.attach_order_stream(account_name)
+        else:
+            for account_name in list(self.order_streams):
+                self.detach_order_stream(account_name)
+
+    def attach_order_stream(self, account_name):
+        """Hesabın akışını (bağlantısı kuruluysa) açık emirler tablosuna bağla"""
+        if not self.live_updates or account_name in self.order_streams:
+            return
+        connector = connector_pool.peek(account_name)
+        if connector is None or not connector.connected:
+            return
+
+        stream = self.user_streams.start(account_name, connector)
+        stream.snapshot_loaded.connect(self.on_stream_snapshot)
+        stream.order_changed.connect(self.on_stream_order)
+        self.order_streams[account_name] = stream
+
+    def detach_order_stream(self, account_name):
+        stream = self.order_streams.pop(account_name)
+        stream.snapshot_loaded.disconnect(self.on_stream_snapshot)
+        stream.order_changed.disconnect(self.on_stream_order)
+        self.user_streams.release(account_name)
+
+    def on_stream_snapshot(self, balances, orders):
+        """Akışın mutabakat görüntüsüyle hesabın emirlerini yenile"""
+        account_name = self.sender().account_name
+        self.open_orders_model.set_account_orders(account_name, orders)
+        self.exposure_book.update_orders(account_name, orders)
+
+    def on_stream_order(self, order):
+        """Tek emir güncellemesini tabloya satır bazında uygula"""
+        stream = self.sender()
+        if order["status"] in OPEN_ORDER_STATUSES:
+            self.open_orders_model.upsert_order(stream.account_name, order)
+        else:
+            self.open_orders_model.remove_order(stream.account_name, order["orderId"])
+        self.exposure_book.update_orders(stream.account_name, stream.state.get_open_orders())
+
+    def apply_orders_filter(self):
+        """Sembol ve hesap filtrelerini proxy model üzerinden uygula"""
+        symbol_filter = self.orders_symbol_filter.currentText().strip()
+        account_filter = self.orders_account_filter.currentText().strip()
+        self.open_orders_proxy.set_filters(
+            symbol=None if symbol_filter == "ALL" else symbol_filter,
+            account=None if account_filter == "ALL" else account_filter
+        )
 
     def select_all_accounts(self):
         """Tüm hesapları seç"""
@@ -1116,48 +1696,30 @@ class AdminPanel(QWidget):
             self.accounts_table.item(i, 0).setCheckState(Qt.Unchecked)
 
     def select_all_orders(self):
-        """Tüm emirleri seç"""
-        for i in range(self.open_orders_table.rowCount()):
-            self.open_orders_table.item(i, 0).setCheckState(Qt.Checked)
+        """Görünen tüm emirleri seç"""
+        self.open_orders_model.set_checked(self.open_orders_proxy.source_rows(), True)
 
     def select_no_orders(self):
-        """Tüm emirlerin seçimini kaldır"""
-        for i in range(self.open_orders_table.rowCount()):
-            self.open_orders_table.item(i, 0).setCheckState(Qt.Unchecked)
+        """Görünen tüm emirlerin seçimini kaldır"""
+        self.open_orders_model.set_checked(self.open_orders_proxy.source_rows(), False)
 
     def get_selected_orders(self):
-        """Seçilen emirleri döndür"""
+        """Seçilen (ve filtrede görünen) emirleri döndür"""
         selected_orders = {}
+        visible_rows = set(self.open_orders_proxy.source_rows())
 
-        for i in range(self.open_orders_table.rowCount()):
-            if self.open_orders_table.item(i, 0).checkState() == Qt.Checked:
-                order_id = self.open_orders_table.item(i, 9).text()
-                account_name = self.open_orders_table.item(i, 1).text()
-
-                # Emir bilgilerini topla
-                order_info = {
-                    "orderId": order_id,
-                    "symbol": self.open_orders_table.item(i, 2).text(),
-                    "side": self.open_orders_table.item(i, 3).text(),
-                    "type": self.open_orders_table.item(i, 4).text(),
-                    "origQty": self.open_orders_table.item(i, 5).text(),
-                    "price": self.open_orders_table.item(i, 6).text().replace("Market", "0"),
-                    "status": self.open_orders_table.item(i, 8).text()
-                }
-
-                # Stop price varsa ekle
-                stop_price = self.open_orders_table.item(i, 7).text()
-                if stop_price != "-":
-                    order_info["stopPrice"] = stop_price
+        for row in self.open_orders_model.checked_rows():
+            if row not in visible_rows:
+                continue
 
-                # Hesap verilerini al
-                account_data = self.account_manager.get_account(account_name)
+            order_info = self.open_orders_model.order_info(row)
+            account_name = self.open_orders_model.accounts[row]
 
-                selected_orders[order_id] = {
-                    "order_info": order_info,
-                    "account_data": account_data,
-                    "account_name": account_name
-                }
+            selected_orders[order_info["orderId"]] = {
+                "order_info": order_info,
+                "account_data": self.account_manager.get_account(account_name),
+                "account_name": account_name
+            }
 
         return selected_orders
 
@@ -1191,7 +1753,11 @@ class AdminPanel(QWidget):
         self.orders_progress_text.clear()
 
         # Thread'i başlat
-        self.current_thread = OrderActionThread(selected_orders, "cancel")
+        self.current_thread = OrderActionThread(
+            selected_orders, "cancel",
+            symbol_order_counts=self.open_orders_model.order_counts(),
+            max_workers=self.concurrency_input.value()
+        )
         self.current_thread.progress_update.connect(self.on_order_progress_update)
         self.current_thread.finished.connect(self.on_order_action_finished)
         self.current_thread.start()
@@ -1237,7 +1803,10 @@ class AdminPanel(QWidget):
             self.orders_progress_text.clear()
 
             # Thread'i başlat
-            self.current_thread = OrderActionThread(selected_orders, "modify", modify_params)
+            self.current_thread = OrderActionThread(
+                selected_orders, "modify", modify_params,
+                max_workers=self.concurrency_input.value()
+            )
             self.current_thread.progress_update.connect(self.on_order_progress_update)
             self.current_thread.finished.connect(self.on_order_action_finished)
             self.current_thread.start()
@@ -1256,6 +1825,7 @@ class AdminPanel(QWidget):
         self.cancel_selected_btn.setEnabled(True)
         self.modify_selected_btn.setEnabled(True)
         self.orders_progress_bar.setVisible(False)
+        self.exposure_book.mark_dirty({result["account"] for result in results["results"].values()})
 
         # Sonuçları göster
         success_count = results["success"]
@@ -1265,7 +1835,10 @@ class AdminPanel(QWidget):
         result_text = f"Order Action Completed!\n\n"
         result_text += f"Total Orders: {total}\n"
         result_text += f"Successful Actions: {success_count}\n"
-        result_text += f"Failed Actions: {error_count}\n\n"
+        result_text += f"Failed Actions: {error_count}\n"
+        if results.get("unselected"):
+            result_text += f"WARNING - Unselected Orders Also Canceled: {results['unselected']}\n"
+        result_text += "\n"
 
         result_text += "Details:\n"
         for order_id, result in results["results"].items():
@@ -1400,8 +1973,36 @@ class AdminPanel(QWidget):
         self.progress_bar.setValue(0)
         self.progress_text.clear()
 
-        # Thread'i başlat
-        self.current_thread = BulkOrderThread(selected_accounts, order_params)
+        # Önce hazırlık aşaması; emirler önizlemeden sonra gönderilir
+        self.current_thread = BulkOrderArmThread(selected_accounts, order_params,
+                                                 max_workers=self.concurrency_input.value(),
+                                                 test_order_mode=self.test_order_combo.currentData())
+        self.current_thread.progress_update.connect(self.on_progress_update)
+        self.current_thread.armed.connect(self.on_bulk_order_armed)
+        self.current_thread.start()
+
+    @pyqtSlot(dict)
+    def on_bulk_order_armed(self, armed):
+        """Hazırlanan emirleri önizlet, onaylanırsa tek dalgada gönder"""
+        preview = BulkOrderPreviewDialog(armed, self)
+        fire = preview.exec_() == QDialog.Accepted and armed["orders"]
+
+        # Bekleme çok uzadıysa fiyat/bakiye bilgisi bayatlamış olabilir
+        if fire and time.time() - armed["armed_at"] > ARMED_ORDER_MAX_AGE:
+            QMessageBox.warning(self, "Warning", "Armed orders expired, please execute again.")
+            fire = False
+
+        if not fire:
+            self.execute_btn.setEnabled(True)
+            self.progress_bar.setVisible(False)
+            self.progress_text.append("Bulk order cancelled before firing.")
+            self.current_thread = None
+            return
+
+        self.progress_bar.setMaximum(len(armed["orders"]))
+        self.progress_bar.setValue(0)
+
+        self.current_thread = BulkOrderThread(armed, max_workers=self.concurrency_input.value())
         self.current_thread.progress_update.connect(self.on_progress_update)
         self.current_thread.finished.connect(self.on_bulk_order_finished)
         self.current_thread.start()
@@ -1419,6 +2020,7 @@ class AdminPanel(QWidget):
         """Toplu emir tamamlandığında"""
         self.execute_btn.setEnabled(True)
         self.progress_bar.setVisible(False)
+        self.exposure_book.mark_dirty(results["results"].keys())
 
         # Sonuçları göster
         success_count = results["success"]
@@ -1428,11 +2030,16 @@ class AdminPanel(QWidget):
         result_text = f"Bulk Order Completed!\n\n"
         result_text += f"Total Accounts: {total}\n"
         result_text += f"Successful Orders: {success_count}\n"
-        result_text += f"Failed Orders: {error_count}\n\n"
+        result_text += f"Failed Orders: {error_count}\n"
+        result_text += f"Arm Phase: {results.get('arm_ms', 0.0):.0f} ms\n"
+        result_text += f"Fire Spread: {results.get('fire_spread_ms', 0.0):.0f} ms\n\n"
 
         result_text += "Details:\n"
         for account, result in results["results"].items():
-            result_text += f"{account}: {result['status']} - {result['message']}\n"
+            result_text += f"{account}: {result['status']} - {result['message']}"
+            if "latency_ms" in result:
+                result_text += f" ({result['latency_ms']:.0f} ms)"
+            result_text += "\n"
 
         # Sonuç dialog'u
         dialog = QDialog(self)
@@ -1459,6 +2066,68 @@ class AdminPanel(QWidget):
         self.current_thread = None
 
 
+class BulkOrderPreviewDialog(QDialog):
+    """Hazırlanan toplu emirlerin gönderim öncesi önizlemesi"""
+
+    def __init__(self, armed, parent=None):
+        super().__init__(parent)
+        self.armed = armed
+        self.setWindowTitle("Bulk Order Preview")
+        self.setMinimumSize(700, 400)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        orders = self.armed["orders"]
+        errors = self.armed["errors"]
+        info_label = QLabel(
+            f"{len(orders)} of {len(orders) + len(errors)} account(s) armed in "
+            f"{self.armed['arm_ms']:.0f} ms. Fire sends all ready orders at once.")
+        info_label.setWordWrap(True)
+        layout.addWidget(info_label)
+
+        table = QTableWidget()
+        table.setColumnCount(8)
+        table.setHorizontalHeaderLabels([
+            "Account", "Side", "Type", "Quantity", "Price", "Stop Price", "TP / SL", "Status"
+        ])
+        table.setRowCount(len(orders) + len(errors))
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+
+        row = 0
+        for account_name, order in orders.items():
+            params = order["params"]
+            exits = " / ".join(str(price or "-") for price in
+                               (order["take_profit_price"], order["stop_loss_price"]))
+            values = [account_name, params["side"], params["type"], str(params["quantity"]),
+                      str(params.get("price", "Market")), str(params.get("stopPrice", "-")), exits, "Ready"]
+            for column, value in enumerate(values):
+                table.setItem(row, column, QTableWidgetItem(value))
+            table.item(row, 7).setForeground(QColor("green"))
+            row += 1
+
+        for account_name, result in errors.items():
+            table.setItem(row, 0, QTableWidgetItem(account_name))
+            status_item = QTableWidgetItem(result["message"])
+            status_item.setForeground(QColor("red"))
+            table.setItem(row, 7, status_item)
+            row += 1
+
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(table)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.button(QDialogButtonBox.Ok).setText("Fire")
+        buttons.button(QDialogButtonBox.Ok).setEnabled(bool(orders))
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        self.setLayout(layout)
+
+
 class ModifyOrderDialog(QDialog):
     """Emir değiştirme dialog'u"""
 
@@ -0,0 +1,297 @@
+import hmac
+import time
+import asyncio
+import hashlib
+import threading
+from urllib.parse import urlencode
+from binance.exceptions import BinanceAPIException
+from rate_limiter import get_rate_limiter, endpoint_weight
+from price_cache import price_cache
+from metrics import metrics
+from binance_api import account_balances, cancelled_order_ids, MAX_RATE_LIMIT_RETRIES
+from order_history import get_history_store, OrderHistorySync
+
+try:
+    import aiohttp
+except ImportError:
+    # aiohttp kurulu değilse uygulama senkron BinanceConnector ile çalışır
+    aiohttp = None
+
+MAINNET_API_URL = "https://api.binance.com/api/v3"
+TESTNET_API_URL = "https://testnet.binance.vision/api/v3"
+
+# Ortak bağlantı havuzunda aynı anda açık tutulacak en fazla bağlantı
+CONNECTION_POOL_SIZE = 100
+
+
+def is_available():
+    """Async connector kullanılabilir mi (aiohttp kurulu mu)"""
+    return aiohttp is not None
+
+
+class AsyncBinanceConnector:
+    """BinanceConnector'ın asyncio sürümü; tüm hesaplar tek HTTP bağlantı havuzunu paylaşır"""
+
+    _sessions = {}  # event loop -> aiohttp.ClientSession
+
+    def __init__(self, api_key, api_secret, testnet=True, account_name=None):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.testnet = testnet
+        self.account_name = account_name
+        self.base_url = TESTNET_API_URL if testnet else MAINNET_API_URL
+        self.rate_limiter = get_rate_limiter(testnet)
+        self.connected = False
+
+    @classmethod
+    def get_session(cls):
+        """Çalışan event loop için ortak oturumu döndürür"""
+        loop = asyncio.get_running_loop()
+        session = cls._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit=CONNECTION_POOL_SIZE)
+            session = aiohttp.ClientSession(connector=connector)
+            cls._sessions[loop] = session
+        return session
+
+    @classmethod
+    async def close_sessions(cls):
+        """Çalışan event loop'a ait ortak oturumu kapatır"""
+        session = cls._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+    async def _request(self, method, path, signed=False, params=None):
+        """İmzalı/imzasız REST isteği; limitleyici ve ölçümlerden geçer"""
+        params = {key: value for key, value in (params or {}).items() if value is not None}
+        weight, is_order = endpoint_weight(method, path, params)
+        endpoint = f"{method.upper()} {path}"
+        headers = {"X-MBX-APIKEY": self.api_key}
+
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            await self.rate_limiter.acquire_async(weight, self.api_key, is_order)
+
+            query = dict(params)
+            if signed:
+                query["timestamp"] = int(time.time() * 1000)
+                query_string = urlencode(query)
+                signature = hmac.new(self.api_secret.encode(), query_string.encode(), hashlib.sha256)
+                query["signature"] = signature.hexdigest()
+
+            started = time.perf_counter()
+            try:
+                async with self.get_session().request(method.upper(), f"{self.base_url}/{path}",
+                                                      params=query, headers=headers) as response:
+                    text = await response.text()
+                    self.rate_limiter.sync_headers(response.headers, self.api_key)
+                    metrics.set_used_weight("testnet" if self.testnet else "mainnet",
+                                            self.rate_limiter.server_used_weight)
+
+                    if response.status < 400:
+                        metrics.record_request(endpoint, self.account_name, time.perf_counter() - started)
+                        return await response.json(content_type=None)
+
+                    error = BinanceAPIException(response, response.status, text)
+                    metrics.record_request(endpoint, self.account_name, time.perf_counter() - started,
+                                           error.code)
+                    if response.status not in (429, 418):
+                        raise error
+                    retry_after = int(response.headers.get("Retry-After", 60))
+                    self.rate_limiter.block(retry_after, banned=response.status == 418)
+                    # 418 IP yasağıdır; yeniden denemek yasağı uzatır, istek hemen başarısız olur
+                    if response.status == 418 or attempt == MAX_RATE_LIMIT_RETRIES:
+                        raise error
+                    print(f"Rate limit aşıldı ({response.status}), {retry_after} sn bekleniyor")
+            except aiohttp.ClientError as e:
+                metrics.record_request(endpoint, self.account_name, time.perf_counter() - started,
+                                       type(e).__name__)
+                raise
+
+    async def connect(self):
+        """Binance API'ye bağlanır"""
+        try:
+            await self._request("get", "account", signed=True)
+            self.connected = True
+            return True
+        except BinanceAPIException as e:
+            print(f"Binance API Hatası: {e}")
+            return False
+        except Exception as e:
+            print(f"Bağlantı hatası: {e}")
+            return False
+
+    async def get_account_balance(self):
+        """Hesap bakiyelerini getirir"""
+        if not self.connected:
+            return None
+
+        try:
+            account_info = await self._request("get", "account", signed=True)
+            return account_balances(account_info)
+        except Exception as e:
+            print(f"Bakiye bilgisi alınırken hata: {e}")
+            return None
+
+    async def get_ticker_prices(self, symbols=None):
+        """Belirli sembollerin veya tüm sembollerin fiyatlarını getirir"""
+        if not self.connected:
+            return None
+
+        try:
+            # Tek istekle tüm fiyatlar alınır ve ortak önbelleğe yazılır
+            tickers = await self._request("get", "ticker/price")
+            price_cache.update(self.testnet, {ticker['symbol']: ticker['price'] for ticker in tickers})
+            if symbols:
+                prices = {ticker['symbol']: ticker['price'] for ticker in tickers}
+                return {symbol: prices[symbol] for symbol in symbols if symbol in prices}
+            return tickers
+        except Exception as e:
+            print(f"Fiyat bilgisi alınırken hata: {e}")
+            return None
+
+    async def get_open_orders(self, symbol=None):
+        """Açık emirleri getirir"""
+        if not self.connected:
+            return None
+
+        try:
+            return await self._request("get", "openOrders", signed=True, params={"symbol": symbol})
+        except Exception as e:
+            print(f"Açık emirler alınırken hata: {e}")
+            return None
+
+    async def cancel_order(self, symbol, order_id):
+        """Belirli bir emri iptal eder"""
+        if not self.connected:
+            return False
+
+        try:
+            await self._request("delete", "order", signed=True,
+                                params={"symbol": symbol, "orderId": order_id})
+            return True
+        except Exception as e:
+            print(f"Emir iptal edilirken hata: {e}")
+            return False
+
+    async def cancel_open_orders(self, symbol):
+        """Sembolün tüm açık emirlerini tek istekle iptal eder"""
+        if not self.connected:
+            return None
+
+        try:
+            response = await self._request("delete", "openOrders", signed=True,
+                                           params={"symbol": symbol})
+            return cancelled_order_ids(response)
+        except Exception as e:
+            print(f"Açık emirler toplu iptal edilirken hata: {e}")
+            return None
+
+    async def get_order_history(self, symbol=None, limit=50):
+        """Geçmiş emirleri getirir"""
+        if not self.connected:
+            return None
+
+        try:
+            if symbol:
+                symbols = [symbol]
+            else:
+                # Geçmiş deposunun bildiği semboller ve açık emirlerin sembolleri
+                open_orders = await self.get_open_orders()
+                symbols = sorted(OrderHistorySync(get_history_store()).active_symbols(
+                    self.account_name, open_orders))
+            results = await asyncio.gather(
+                *[self._request("get", "allOrders", signed=True, params={"symbol": sym, "limit": limit})
+                  for sym in symbols],
+                return_exceptions=True
+            )
+
+            orders = []
+            for result in results:
+                if not isinstance(result, Exception):
+                    orders.extend(result)  # Bu sembol için hata varsa geç
+
+            orders.sort(key=lambda x: x['time'], reverse=True)
+            return orders[:limit]
+        except Exception as e:
+            print(f"Geçmiş emirler alınırken hata: {e}")
+            return None
+
+
+class AsyncEventLoop:
+    """Qt ile birlikte çalışan tek asyncio event loop'u.
+
+    qasync kuruluysa asyncio döngüsü Qt döngüsünün içinde çalışır ve sonuçlar
+    doğrudan arayüz thread'inde alınır. Kurulu değilse döngü tek bir arka plan
+    thread'inde çalışır; sonuçlar arayüze sinyallerle taşınmalıdır.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        try:
+            import qasync
+        except ImportError:
+            qasync = None
+
+        if qasync is not None:
+            self.loop = qasync.QEventLoop(app)
+            asyncio.set_event_loop(self.loop)
+            self.integrated = True
+        else:
+            self.loop = asyncio.new_event_loop()
+            self.integrated = False
+            threading.Thread(target=self.loop.run_forever, daemon=True).start()
+
+    def submit(self, coro):
+        """Coroutine'i döngüde çalıştırır, future döndürür"""
+        if self.integrated:
+            return asyncio.ensure_future(coro, loop=self.loop)
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def exec_(self):
+        """Uygulama döngüsünü çalıştırır ve çıkış kodunu döndürür"""
+        if self.integrated:
+            # qasync run_forever Qt döngüsünün çıkış kodunu döndürür (eski sürümlerde None)
+            with self.loop:
+                code = self.loop.run_forever()
+            return 0 if code is None else code
+        return self.app.exec_()
+
+
+_event_loop = None
+_connectors = {}  # hesap -> bağlı AsyncBinanceConnector (sadece event loop thread'inden kullanılır)
+
+
+async def get_connector(account_name, account_data):
+    """Hesap için bağlı async connector döndürür, yoksa bağlantı kurar (bağlanamazsa None)"""
+    connector = _connectors.get(account_name)
+    if (connector is not None and connector.api_key == account_data["api_key"]
+            and connector.api_secret == account_data["api_secret"]
+            and connector.testnet == account_data.get("testnet", True)):
+        return connector
+
+    connector = AsyncBinanceConnector(account_data["api_key"], account_data["api_secret"],
+                                      testnet=account_data.get("testnet", True), account_name=account_name)
+    if not await connector.connect():
+        return None
+    _connectors[account_name] = connector
+    return connector
+
+
+def invalidate_connectors(account_name=None):
+    """Hesabın (veya tüm hesapların) async connector'ını bırakır; hesap eklenince/silinince çağrılır"""
+    if account_name is None:
+        _connectors.clear()
+    else:
+        _connectors.pop(account_name, None)
+
+
+def install_event_loop(app):
+    """Uygulama genelindeki asyncio döngüsünü kurar"""
+    global _event_loop
+    _event_loop = AsyncEventLoop(app)
+    return _event_loop
+
+
+def get_event_loop():
+    """Kurulu asyncio döngüsünü döndürür"""
+    return _event_loop
@@ -1,25 +1,152 @@
+import time
+from urllib.parse import urlparse
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
+from exchange_info import exchange_info_cache
+from price_cache import price_cache
+from rate_limiter import get_rate_limiter, endpoint_weight, endpoint_path
+from metrics import metrics
+from order_history import get_history_store, OrderHistorySync
+
+# 429/418 yanıtlarında isteğin kaç kez yeniden deneneceği
+MAX_RATE_LIMIT_RETRIES = 3
+
+
+class RateLimitedClient(Client):
+    """Her isteği ortak ağırlık limitleyicisinden geçiren ve ölçen Binance istemcisi"""
+
+    def __init__(self, api_key=None, api_secret=None, testnet=False, account_name=None, **kwargs):
+        # Üst sınıfın kurucusu ping attığı için limitleyici önce atanır
+        self.rate_limiter = get_rate_limiter(testnet)
+        self.limiter_account_key = api_key
+        self.account_name = account_name
+        self.network = "testnet" if testnet else "mainnet"
+        super().__init__(api_key, api_secret, testnet=testnet, **kwargs)
+
+    def _request(self, method, uri, signed, force_params=False, **kwargs):
+        params = kwargs.get("data") or kwargs.get("params") or {}
+        path = urlparse(uri).path
+        weight, is_order = endpoint_weight(method, path, params)
+        endpoint = f"{method.upper()} {endpoint_path(path)}"
+
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            self.rate_limiter.acquire(weight, self.limiter_account_key, is_order)
+
+            # İmzalı isteklerde data sözlüğü yerinde değiştirildiği için her denemede kopyalanır
+            attempt_kwargs = dict(kwargs)
+            if isinstance(kwargs.get("data"), dict):
+                attempt_kwargs["data"] = {key: value for key, value in kwargs["data"].items()
+                                          if key not in ("timestamp", "signature")}
+
+            started = time.perf_counter()
+            try:
+                result = super()._request(method, uri, signed, force_params, **attempt_kwargs)
+                metrics.record_request(endpoint, self.account_name, time.perf_counter() - started)
+                self._sync_rate_limits()
+                return result
+            except BinanceAPIException as e:
+                metrics.record_request(endpoint, self.account_name, time.perf_counter() - started, e.code)
+                self._sync_rate_limits()
+                if e.status_code not in (429, 418):
+                    raise
+                # Limit aşıldı: Retry-After kadar tüm istemciler bekletilir
+                retry_after = 60
+                if self.response is not None:
+                    retry_after = int(self.response.headers.get("Retry-After", retry_after))
+                self.rate_limiter.block(retry_after, banned=e.status_code == 418)
+                # 418 IP yasağıdır; yeniden denemek yasağı uzatır, istek hemen başarısız olur
+                if e.status_code == 418 or attempt == MAX_RATE_LIMIT_RETRIES:
+                    raise
+                print(f"Rate limit aşıldı ({e.status_code}), {retry_after} sn bekleniyor")
+            except Exception as e:
+                # Ağ hataları istisna sınıfı adıyla sayılır
+                metrics.record_request(endpoint, self.account_name, time.perf_counter() - started,
+                                       type(e).__name__)
+                raise
+
+    def _sync_rate_limits(self):
+        if getattr(self, "response", None) is not None:
+            self.rate_limiter.sync_headers(self.response.headers, self.limiter_account_key)
+            metrics.set_used_weight(self.network, self.rate_limiter.server_used_weight)
+
+
+def create_client(api_key, api_secret, testnet=True, account_name=None):
+    """Ortak limitleyiciye ve ölçümlere bağlı bir Binance istemcisi oluşturur"""
+    return RateLimitedClient(api_key, api_secret, testnet=testnet, account_name=account_name)
+
+
+# order/cancelReplace hata kodları (STOP_ON_FAILURE modunda)
+CANCEL_REPLACE_CANCEL_FAILED = -2022  # iptal başarısız, yeni emir verilmedi
+CANCEL_REPLACE_NEW_FAILED = -2021  # iptal edildi, yeni emir başarısız
+
+
+def account_balances(account_info):
+    """GET account yanıtından sıfır olmayan bakiyeleri çıkarır"""
+    return [{
+        'asset': asset['asset'],
+        'free': asset['free'],
+        'locked': asset['locked']
+    } for asset in account_info['balances'] if float(asset['free']) > 0 or float(asset['locked']) > 0]
+
+
+def cancelled_order_ids(response):
+    """DELETE openOrders yanıtından iptal edilen emir ID'lerini çıkarır (OCO listeleri dahil)"""
+    order_ids = set()
+    for entry in response or []:
+        if "orders" in entry:
+            order_ids.update(order["orderId"] for order in entry["orders"])
+        elif "orderId" in entry:
+            order_ids.add(entry["orderId"])
+    return order_ids
+
+
+def oco_exit_params(symbol, entry_side, quantity, take_profit_price, stop_loss_price,
+                    stop_loss_type="STOP_LOSS_LIMIT"):
+    """Giriş emrinin TP/SL bacaklarını orderList/oco parametrelerine çevirir.
+
+    Alışın çıkışında TP üst, SL alt bacaktır; satışın çıkışında tersi.
+    """
+    exit_side = "SELL" if entry_side == "BUY" else "BUY"
+    tp_leg, sl_leg = ("above", "below") if exit_side == "SELL" else ("below", "above")
+
+    params = {
+        "symbol": symbol,
+        "side": exit_side,
+        "quantity": quantity,
+        f"{tp_leg}Type": "LIMIT_MAKER",
+        f"{tp_leg}Price": take_profit_price,
+        f"{sl_leg}Type": stop_loss_type,
+        f"{sl_leg}StopPrice": stop_loss_price
+    }
+    if stop_loss_type == "STOP_LOSS_LIMIT":
+        params[f"{sl_leg}Price"] = stop_loss_price
+        params[f"{sl_leg}TimeInForce"] = "GTC"
+    return params
 
 
 class BinanceConnector:
-    def __init__(self, api_key, api_secret, testnet=True):
+    def __init__(self, api_key, api_secret, testnet=True, account_name=None):
         self.api_key = api_key
         self.api_secret = api_secret
+        self.account_name = account_name
         self.client = None
         self.connected = False
         self.testnet = testnet
+        # Son alınan bakiyeler (emir ön doğrulaması için)
+        self.cached_balances = None
+        self.balances_cached_at = 0.0
+        # order/cancelReplace desteklenmiyorsa iki adımlı değiştirmeye geçilir
+        self.cancel_replace_supported = True
 
     def connect(self):
         """Binance API'ye bağlanır"""
         try:
-            if self.testnet:
-                self.client = Client(self.api_key, self.api_secret, testnet=True)
-            else:
-                self.client = Client(self.api_key, self.api_secret)
+            self.client = create_client(self.api_key, self.api_secret, testnet=self.testnet,
+                                        account_name=self.account_name)
 
-            # Bağlantıyı test etmek için hesap durumu
-            self.client.get_account()
+            # Bağlantıyı test etmek için hesap durumu; yanıttaki bakiyeler ilk gösterim için saklanır
+            account_info = self.client.get_account()
+            self.cache_balances(account_balances(account_info))
             self.connected = True
             return True
         except BinanceAPIException as e:
@@ -29,50 +156,75 @@ class BinanceConnector:
             print(f"Bağlantı hatası: {e}")
             return False
 
+    def close(self):
+        """HTTP oturumunu kapatır"""
+        self.connected = False
+        if self.client:
+            try:
+                self.client.close_connection()
+            except Exception as e:
+                print(f"Bağlantı kapatılırken hata: {e}")
+
     def get_account_balance(self):
         """Hesap bakiyelerini getirir"""
         if not self.connected:
             return None
 
         try:
-            account_info = self.client.get_account()
-            balances = []
-            for asset in account_info['balances']:
-                if float(asset['free']) > 0 or float(asset['locked']) > 0:
-                    balances.append({
-                        'asset': asset['asset'],
-                        'free': asset['free'],
-                        'locked': asset['locked']
-                    })
+            balances = account_balances(self.client.get_account())
+            self.cache_balances(balances)
             return balances
         except Exception as e:
             print(f"Bakiye bilgisi alınırken hata: {e}")
             return None
 
+    def cache_balances(self, balances):
+        """Bakiyeleri ön doğrulamada kullanılmak üzere saklar"""
+        self.cached_balances = balances
+        self.balances_cached_at = time.time()
+
     def get_ticker_prices(self, symbols=None):
         """Belirli sembollerin veya tüm sembollerin fiyatlarını getirir"""
         if not self.connected:
             return None
 
         try:
+            # Tüm fiyatlar ortak önbellekten tek istekle okunur
+            all_prices = price_cache.get_prices(self.client, self.testnet)
             if symbols:
-                prices = {}
-                for symbol in symbols:
-                    price = self.client.get_symbol_ticker(symbol=symbol)
-                    prices[symbol] = price['price']
-                return prices
+                return {symbol: str(all_prices[symbol]) for symbol in symbols if symbol in all_prices}
             else:
-                return self.client.get_all_tickers()
+                return [{'symbol': symbol, 'price': str(price)} for symbol, price in all_prices.items()]
         except Exception as e:
             print(f"Fiyat bilgisi alınırken hata: {e}")
             return None
 
-    def get_open_orders(self):
-        """Açık emirleri getirir"""
+    def get_price_map(self, max_age=None):
+        """Tüm fiyatları {sembol: float} olarak ortak önbellekten getirir"""
+        return price_cache.get_prices(self.client, self.testnet, max_age)
+
+    def get_price(self, symbol, max_age=None):
+        """Tek bir sembolün fiyatını ortak önbellekten getirir"""
+        return price_cache.get_price(self.client, self.testnet, symbol, max_age)
+
+    def get_symbol_filters(self, symbol):
+        """Sembolün borsa filtrelerini ortak önbellekten getirir"""
+        exchange_info_cache.ensure_loaded(self.client, self.testnet)
+        return exchange_info_cache.get_filters(symbol, self.testnet)
+
+    def get_symbols(self, quote_asset=None):
+        """Borsadaki sembol adlarını ortak önbellekten getirir"""
+        exchange_info_cache.ensure_loaded(self.client, self.testnet)
+        return exchange_info_cache.get_symbols(self.testnet, quote_asset)
+
+    def get_open_orders(self, symbol=None):
+        """Açık emirleri getirir (sembol verilirse sadece o sembolün emirlerini)"""
         if not self.connected:
             return None
 
         try:
+            if symbol:
+                return self.client.get_open_orders(symbol=symbol)
             return self.client.get_open_orders()
         except Exception as e:
             print(f"Açık emirler alınırken hata: {e}")
@@ -90,32 +242,88 @@ class BinanceConnector:
             print(f"Emir iptal edilirken hata: {e}")
             return False
 
+    def cancel_open_orders(self, symbol):
+        """Sembolün tüm açık emirlerini tek istekle iptal eder, iptal edilen emir ID'lerini döndürür"""
+        if not self.connected:
+            return None
+
+        try:
+            response = self.client._delete('openOrders', True, data={'symbol': symbol})
+            return cancelled_order_ids(response)
+        except Exception as e:
+            print(f"Açık emirler toplu iptal edilirken hata: {e}")
+            return None
+
+    def cancel_replace_order(self, order_id, **params):
+        """Emri tek istekte iptal edip yenisini verir; hatalar çağırana iletilir"""
+        data = dict(params, cancelOrderId=order_id, cancelReplaceMode='STOP_ON_FAILURE')
+        if hasattr(self.client, 'cancel_replace_order'):
+            return self.client.cancel_replace_order(**data)
+        return self.client._post('order/cancelReplace', True, data=data)
+
+    def place_exit_orders(self, symbol, entry_side, quantity, take_profit_price=None,
+                          stop_loss_price=None, stop_loss_type="STOP_LOSS_LIMIT"):
+        """TP/SL emirlerini verir; ikisi birlikteyse tek OCO isteğiyle.
+
+        (orderListId veya None, mesaj listesi) döndürür.
+        """
+        if take_profit_price and stop_loss_price:
+            try:
+                response = self.client._post('orderList/oco', True, data=oco_exit_params(
+                    symbol, entry_side, quantity, take_profit_price, stop_loss_price, stop_loss_type))
+                return response["orderListId"], [f"OCO: {response['orderListId']}"]
+            except Exception as e:
+                return None, [f"OCO Error: {str(e)[:30]}"]
+
+        # Tek bacak OCO olamaz, bağımsız emir olarak verilir
+        exit_side = "SELL" if entry_side == "BUY" else "BUY"
+        messages = []
+        if take_profit_price:
+            try:
+                response = self.client.create_order(symbol=symbol, side=exit_side, type="LIMIT",
+                                                    timeInForce="GTC", quantity=quantity,
+                                                    price=take_profit_price)
+                messages.append(f"TP: {response['orderId']}")
+            except Exception as e:
+                messages.append(f"TP Error: {str(e)[:30]}")
+
+        if stop_loss_price:
+            try:
+                params = {"symbol": symbol, "side": exit_side, "type": stop_loss_type,
+                          "quantity": quantity, "stopPrice": stop_loss_price}
+                if stop_loss_type == "STOP_LOSS_LIMIT":
+                    params["price"] = stop_loss_price
+                    params["timeInForce"] = "GTC"
+                response = self.client.create_order(**params)
+                messages.append(f"SL: {response['orderId']}")
+            except Exception as e:
+                messages.append(f"SL Error: {str(e)[:30]}")
+
+        return None, messages
+
     def get_order_history(self, symbol=None, limit=50):
-        """Geçmiş emirleri getirir"""
+        """Geçmiş emirleri yerel depodan getirir; önce yeni emirleri eşitler"""
         if not self.connected:
             return None
 
         try:
-            params = {'limit': limit}
-            if symbol:
-                params['symbol'] = symbol
-                orders = self.client.get_all_orders(**params)
-            else:
-                # Sembol belirtilmezse, birkaç popüler sembol için geçmiş emirleri alıp birleştirir
-                orders = []
-                for sym in ['BTCUSDT', 'ETHUSDT', 'BNBUSDT']:
-                    try:
-                        params['symbol'] = sym
-                        sym_orders = self.client.get_all_orders(**params)
-                        orders.extend(sym_orders)
-                    except:
-                        pass  # Bu sembol için emir yoksa geç
-
-                # Son 50 emri alır ve sıralar
-                orders.sort(key=lambda x: x['time'], reverse=True)
-                orders = orders[:limit]
-
-            return orders
+            store = get_history_store()
+            OrderHistorySync(store).sync(self, self.account_name, [symbol] if symbol else None)
+            return store.get_orders(self.account_name, symbol, limit)
         except Exception as e:
             print(f"Geçmiş emirler alınırken hata: {e}")
             return None
+
+    def get_trade_history(self, symbol=None, limit=50):
+        """Gerçekleşen işlemleri yerel depodan getirir; sembol verilirse önce yenilerini eşitler"""
+        if not self.connected:
+            return None
+
+        try:
+            store = get_history_store()
+            if symbol:
+                OrderHistorySync(store).sync_trades(self, self.account_name, symbol)
+            return store.get_trades(self.account_name, symbol, limit)
+        except Exception as e:
+            print(f"İşlem geçmişi alınırken hata: {e}")
+            return None
@@ -0,0 +1,77 @@
+import threading
+from binance_api import BinanceConnector
+
+
+class ConnectorPool:
+    """Hesap adına göre bağlı BinanceConnector nesnelerini süreç genelinde paylaşır"""
+
+    def __init__(self):
+        self._connectors = {}
+        self._account_locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, account_name, account_data):
+        """Hesap için bağlı bir connector döndürür, yoksa bağlantı kurar.
+
+        Bağlantı kurulamazsa HTTP oturumu kapatılmış, connected=False olan connector döner ve
+        havuza eklenmez.
+        """
+        with self._lock:
+            connector = self._connectors.get(account_name)
+            if connector and self._matches(connector, account_data):
+                return connector
+            account_lock = self._account_locks.setdefault(account_name, threading.Lock())
+
+        # Aynı hesap için eşzamanlı iki bağlantı kurulmasını engeller
+        with account_lock:
+            with self._lock:
+                connector = self._connectors.get(account_name)
+                if connector and self._matches(connector, account_data):
+                    return connector
+
+            connector = BinanceConnector(
+                account_data["api_key"],
+                account_data["api_secret"],
+                testnet=account_data.get("testnet", True),
+                account_name=account_name
+            )
+            if connector.connect():
+                with self._lock:
+                    old_connector = self._connectors.get(account_name)
+                    self._connectors[account_name] = connector
+                if old_connector and old_connector is not connector:
+                    old_connector.close()
+            else:
+                # Başarısız denemenin oturumu açık bırakılmaz
+                connector.close()
+            return connector
+
+    def peek(self, account_name):
+        """Hesabın havuzdaki bağlı connector'ı; yoksa bağlantı kurmadan None döndürür"""
+        with self._lock:
+            connector = self._connectors.get(account_name)
+            return connector if connector is not None and connector.connected else None
+
+    def invalidate(self, account_name=None):
+        """Hesabın (veya tüm hesapların) bağlantısını havuzdan çıkarır"""
+        with self._lock:
+            if account_name is None:
+                removed = list(self._connectors.values())
+                self._connectors.clear()
+            else:
+                connector = self._connectors.pop(account_name, None)
+                removed = [connector] if connector else []
+
+        for connector in removed:
+            connector.close()
+
+    def _matches(self, connector, account_data):
+        """Havuzdaki connector hesap bilgileriyle hâlâ uyumlu mu"""
+        return (connector.connected
+                and connector.api_key == account_data["api_key"]
+                and connector.api_secret == account_data["api_secret"]
+                and connector.testnet == account_data.get("testnet", True))
+
+
+# Tüm uygulama tarafından kullanılan ortak havuz
+connector_pool = ConnectorPool()
@@ -0,0 +1,399 @@
+import time
+from PyQt5.QtWidgets import (QScrollArea, QWidget, QFrame, QVBoxLayout, QHBoxLayout,
+                             QLabel, QPushButton)
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from connector_pool import connector_pool
+from valuation import get_valuation_engine
+from workers import JobRunner
+
+# Kutucuk boyutları ve aralarındaki boşluk (piksel)
+TILE_WIDTH = 260
+TILE_HEIGHT = 140
+TILE_SPACING = 8
+
+# Görünür alanın üstünde ve altında önceden bağlanan satır sayısı
+OVERSCAN_ROWS = 1
+
+# Yeniden kullanılmak üzere gizli tutulan en fazla kutucuk
+MAX_SPARE_TILES = 8
+
+# Bu süreden eski özetler kutucuk görünür olduğunda yeniden çekilir (saniye)
+SNAPSHOT_MAX_AGE = 60.0
+
+# Kaydırma durduktan sonra görünür kutucukların yüklenmesi için bekleme (milisaniye)
+LOAD_DEBOUNCE_MS = 250
+
+# Kutucukta gösterilen en değerli varlık sayısı
+TOP_ASSETS = 3
+
+
+class AccountTile(QFrame):
+    """Tek hesabın özetini gösteren, farklı hesaplara yeniden bağlanabilen kompakt kutucuk"""
+    open_requested = pyqtSignal(str)  # account_name
+    remove_requested = pyqtSignal(str)  # account_name
+
+    def __init__(self, dashboard, parent=None):
+        super().__init__(parent)
+        self.dashboard = dashboard
+        self.account_name = None
+        self.testnet = True
+        self.user_stream = None
+        self.init_ui()
+
+    def init_ui(self):
+        self.setFrameShape(QFrame.StyledPanel)
+        self.setFixedSize(TILE_WIDTH, TILE_HEIGHT)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(8, 6, 8, 6)
+
+        title_layout = QHBoxLayout()
+        self.name_label = QLabel()
+        self.name_label.setStyleSheet("font-weight: bold;")
+        title_layout.addWidget(self.name_label)
+        self.status_label = QLabel()
+        title_layout.addWidget(self.status_label, alignment=Qt.AlignRight)
+        layout.addLayout(title_layout)
+
+        self.total_label = QLabel()
+        self.total_label.setStyleSheet("font-size: 14px; font-weight: bold; color: green;")
+        layout.addWidget(self.total_label)
+
+        self.assets_label = QLabel()
+        self.assets_label.setStyleSheet("color: gray;")
+        layout.addWidget(self.assets_label)
+
+        self.orders_label = QLabel()
+        layout.addWidget(self.orders_label)
+
+        button_layout = QHBoxLayout()
+        open_button = QPushButton("Open")
+        open_button.clicked.connect(lambda: self.open_requested.emit(self.account_name))
+        button_layout.addWidget(open_button)
+        remove_button = QPushButton("Remove")
+        remove_button.clicked.connect(lambda: self.remove_requested.emit(self.account_name))
+        button_layout.addWidget(remove_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
+    def bind(self, account_name, testnet, snapshot):
+        """Kutucuğu bir hesaba bağlar ve bilinen son özetini gösterir"""
+        self.account_name = account_name
+        self.testnet = testnet
+        self.name_label.setText(account_name)
+        self.render(snapshot)
+
+    def unbind(self):
+        self.detach_user_stream()
+        self.account_name = None
+
+    def render(self, snapshot):
+        if snapshot is None:
+            self.status_label.setText("Loading...")
+            self.status_label.setStyleSheet("color: gray;")
+            self.total_label.setText("Total Value: -")
+            self.assets_label.setText("")
+            self.orders_label.setText("")
+            return
+
+        if snapshot["status"] == "Connected":
+            self.status_label.setStyleSheet("color: green;")
+        else:
+            self.status_label.setStyleSheet("color: red;")
+        self.status_label.setText(snapshot["status"])
+        self.total_label.setText(f"Total Value: ${snapshot['total_usd']:.2f}")
+
+        values, _ = get_valuation_engine(self.testnet).get_values(self.account_name)
+        top_assets = sorted(values.items(), key=lambda item: item[1] or 0.0, reverse=True)[:TOP_ASSETS]
+        self.assets_label.setText("  ".join(f"{asset} ${value:.0f}" if value is not None else asset
+                                            for asset, value in top_assets))
+        self.orders_label.setText(f"Open Orders: {len(snapshot['open_orders'])}")
+
+    def mouseDoubleClickEvent(self, event):
+        if self.account_name is not None:
+            self.open_requested.emit(self.account_name)
+        super().mouseDoubleClickEvent(event)
+
+    # RefreshScheduler arayüzü
+    def is_connected(self):
+        # Özeti alınamamış hesaplar da zamanlayıcının artan beklemesiyle yeniden denenir
+        if connector_pool.peek(self.account_name) is not None:
+            return True
+        snapshot = self.dashboard.snapshots.get(self.account_name)
+        return snapshot is not None and snapshot.get("status") == "Connection Error"
+
+    def refresh_job(self):
+        # Akış açıkken özet zaten günceldir
+        if self.user_stream is not None and self.user_stream.is_live:
+            return None
+        return self.dashboard.refresh_account(self.account_name)
+
+    def attach_user_stream(self, stream):
+        """Bakiye ve açık emirleri user-data akışından güncelle"""
+        self.user_stream = stream
+        stream.snapshot_loaded.connect(self.on_stream_snapshot)
+        stream.balances_changed.connect(self.on_stream_balances)
+        stream.order_changed.connect(self.on_stream_order)
+
+    def detach_user_stream(self):
+        if self.user_stream is not None:
+            self.user_stream.snapshot_loaded.disconnect(self.on_stream_snapshot)
+            self.user_stream.balances_changed.disconnect(self.on_stream_balances)
+            self.user_stream.order_changed.disconnect(self.on_stream_order)
+            self.user_stream = None
+
+    def on_stream_snapshot(self, balances, orders):
+        self.dashboard.update_snapshot(self.account_name, balances=balances, open_orders=orders)
+
+    def on_stream_balances(self, changed):
+        self.dashboard.apply_balance_changes(self.account_name, changed)
+
+    def on_stream_order(self, order):
+        self.dashboard.apply_order_change(self.account_name, order)
+
+
+class AccountDashboard(QScrollArea):
+    """Hesap kutucuklarını sanal bir ızgarada gösterir.
+
+    Sadece görünür satırlardaki hesaplar için kutucuk widget'ı, zamanlayıcı kaydı ve akış
+    aboneliği tutulur; ekran dışına çıkan kutucuklar başka hesaplar için yeniden kullanılır.
+    Hesap özetleri (bakiyeler, açık emirler, toplam değer) kutucuklardan bağımsız saklanır.
+    """
+    open_requested = pyqtSignal(str)  # account_name
+    remove_requested = pyqtSignal(str)  # account_name
+
+    def __init__(self, account_manager, refresh_scheduler, user_streams, parent=None):
+        super().__init__(parent)
+        self.account_manager = account_manager
+        self.refresh_scheduler = refresh_scheduler
+        self.user_streams = user_streams
+        self.live_updates = False
+        self.accounts = []  # gösterim sırasına göre hesap adları
+        self.snapshots = {}  # account -> {"status", "balances", "open_orders", "total_usd", "updated_at"}
+        self.bound = {}  # account -> görünür AccountTile
+        self.spare_tiles = []
+        self.jobs = JobRunner(self)
+
+        self.canvas = QWidget()
+        self.setWidget(self.canvas)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.verticalScrollBar().valueChanged.connect(self.update_visible)
+
+        # Hızlı kaydırmada üzerinden geçilen hesaplar için istek gönderilmez
+        self.load_timer = QTimer(self)
+        self.load_timer.setSingleShot(True)
+        self.load_timer.setInterval(LOAD_DEBOUNCE_MS)
+        self.load_timer.timeout.connect(self.load_visible)
+
+    def add_account(self, account_name):
+        if account_name in self.accounts:
+            return False
+        self.accounts.append(account_name)
+        self.layout_canvas()
+        return True
+
+    def remove_account(self, account_name):
+        if account_name not in self.accounts:
+            return
+        if account_name in self.bound:
+            self.release(account_name)
+        self.accounts.remove(account_name)
+        self.snapshots.pop(account_name, None)
+        self.jobs.cancel(account_name)
+        self.layout_canvas()
+
+    def columns(self):
+        return max(1, (self.viewport().width() - TILE_SPACING) // (TILE_WIDTH + TILE_SPACING))
+
+    def layout_canvas(self):
+        """Tuvali tüm hesapları içerecek boyuta getirir, kutucukları sadece görünür satırlar için konumlar"""
+        rows = -(-len(self.accounts) // self.columns())
+        self.canvas.resize(self.viewport().width(), rows * (TILE_HEIGHT + TILE_SPACING) + TILE_SPACING)
+        self.update_visible()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.layout_canvas()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.layout_canvas()
+
+    def hideEvent(self, event):
+        # Görünüm gizliyken (ör. admin paneli) hiçbir hesap kutucuk ve abonelik tutmaz
+        super().hideEvent(event)
+        for account_name in list(self.bound):
+            self.release(account_name)
+
+    def update_visible(self):
+        columns = self.columns()
+        row_height = TILE_HEIGHT + TILE_SPACING
+        top = self.verticalScrollBar().value()
+        first_row = max(0, top // row_height - OVERSCAN_ROWS)
+        last_row = (top + self.viewport().height()) // row_height + OVERSCAN_ROWS
+
+        visible = {}
+        if self.isVisible():
+            last_index = min(len(self.accounts), (last_row + 1) * columns)
+            for index in range(first_row * columns, last_index):
+                visible[self.accounts[index]] = index
+
+        for account_name in list(self.bound):
+            if account_name not in visible:
+                self.release(account_name)
+
+        for account_name, index in visible.items():
+            tile = self.bound.get(account_name) or self.acquire(account_name)
+            row, col = divmod(index, columns)
+            tile.move(TILE_SPACING + col * (TILE_WIDTH + TILE_SPACING), TILE_SPACING + row * row_height)
+
+        self.load_timer.start()
+
+    def acquire(self, account_name):
+        """Hesap için boştaki bir kutucuğu (yoksa yenisini) bağlar"""
+        if self.spare_tiles:
+            tile = self.spare_tiles.pop()
+        else:
+            tile = AccountTile(self, self.canvas)
+            tile.open_requested.connect(self.open_requested)
+            tile.remove_requested.connect(self.remove_requested)
+
+        account_data = self.account_manager.get_account(account_name) or {}
+        tile.bind(account_name, account_data.get("testnet", True), self.snapshots.get(account_name))
+        tile.show()
+        self.bound[account_name] = tile
+        self.refresh_scheduler.register(tile)
+        if self.live_updates:
+            self.attach_stream(tile)
+        return tile
+
+    def release(self, account_name):
+        """Ekrandan çıkan hesabın kutucuğunu, zamanlayıcı kaydını ve akış aboneliğini bırakır"""
+        tile = self.bound.pop(account_name)
+        self.refresh_scheduler.unregister(tile)
+        self.detach_stream(tile)
+        tile.unbind()
+        tile.hide()
+        if len(self.spare_tiles) < MAX_SPARE_TILES:
+            self.spare_tiles.append(tile)
+        else:
+            tile.deleteLater()
+
+    def load_visible(self):
+        """Özeti hiç çekilmemiş veya eskimiş görünür hesapları yükler"""
+        now = time.time()
+        for account_name in self.bound:
+            snapshot = self.snapshots.get(account_name)
+            if snapshot is not None and now - snapshot["updated_at"] < SNAPSHOT_MAX_AGE:
+                continue
+            if not self.jobs.is_running(account_name):
+                self.refresh_account(account_name)
+
+    def refresh_visible(self):
+        for tile in self.bound.values():
+            self.refresh_scheduler.refresh_now(tile)
+
+    def refresh_account(self, account_name):
+        """Hesabın özetini arka planda çeker; başlatılan işi döndürür"""
+        account_data = self.account_manager.get_account(account_name)
+        if not account_data:
+            return None
+        return self.jobs.submit(account_name, self.fetch_snapshot, account_name, account_data,
+                                on_result=lambda result: self.on_snapshot_loaded(account_name, result),
+                                on_error=lambda error: self.on_snapshot_failed(account_name, error))
+
+    def fetch_snapshot(self, account_name, account_data):
+        """Bakiye ve açık emirleri ortak connector havuzu üzerinden çeker (arka plan thread'i)"""
+        connector = connector_pool.get(account_name, account_data)
+        if not connector.connected:
+            return None
+
+        balances = connector.get_account_balance()
+        open_orders = connector.get_open_orders()
+        if balances is None or open_orders is None:
+            return None
+
+        get_valuation_engine(connector.testnet).refresh(connector)
+        return {"balances": balances, "open_orders": open_orders}
+
+    def on_snapshot_loaded(self, account_name, result):
+        if account_name not in self.accounts:
+            return
+        if result is None:
+            self.on_snapshot_failed(account_name, "Connection error")
+            return
+
+        self.update_snapshot(account_name, balances=result["balances"], open_orders=result["open_orders"])
+        tile = self.bound.get(account_name)
+        if tile is not None and self.live_updates and tile.user_stream is None:
+            self.attach_stream(tile)
+
+    def on_snapshot_failed(self, account_name, error):
+        print(f"{account_name} özeti alınamadı: {error}")
+        snapshot = self.snapshots.setdefault(account_name, {
+            "balances": [], "open_orders": [], "total_usd": 0.0, "updated_at": time.time()
+        })
+        snapshot["status"] = "Connection Error"
+        self.render(account_name)
+
+    def update_snapshot(self, account_name, balances=None, open_orders=None):
+        """Özeti günceller, bakiyeler değiştiyse hesabı yeniden değerler"""
+        snapshot = self.snapshots.setdefault(account_name, {"balances": [], "open_orders": [], "total_usd": 0.0})
+        if balances is not None:
+            account_data = self.account_manager.get_account(account_name) or {}
+            engine = get_valuation_engine(account_data.get("testnet", True))
+            snapshot["balances"] = balances
+            snapshot["total_usd"] = engine.set_holdings(account_name, balances)
+        if open_orders is not None:
+            snapshot["open_orders"] = open_orders
+        snapshot["status"] = "Connected"
+        snapshot["updated_at"] = time.time()
+        self.render(account_name)
+
+    def apply_balance_changes(self, account_name, changed):
+        """Akıştan gelen sadece değişen varlık bakiyelerini uygular"""
+        snapshot = self.snapshots.get(account_name)
+        if snapshot is None:
+            return
+        balances = {balance['asset']: balance for balance in snapshot["balances"]}
+        for balance in changed:
+            if float(balance['free']) > 0 or float(balance['locked']) > 0:
+                balances[balance['asset']] = balance
+            else:
+                balances.pop(balance['asset'], None)
+        self.update_snapshot(account_name, balances=list(balances.values()))
+
+    def apply_order_change(self, account_name, order):
+        """Akıştan gelen tek emir güncellemesini açık emirlere uygular"""
+        snapshot = self.snapshots.get(account_name)
+        if snapshot is None:
+            return
+        orders = [o for o in snapshot["open_orders"] if o['orderId'] != order['orderId']]
+        if order['status'] in ("NEW", "PARTIALLY_FILLED", "PENDING_NEW"):
+            orders.append(order)
+        self.update_snapshot(account_name, open_orders=orders)
+
+    def render(self, account_name):
+        tile = self.bound.get(account_name)
+        if tile is not None:
+            tile.render(self.snapshots.get(account_name))
+
+    def set_live_updates(self, enabled):
+        """Görünür kutucukları user-data akışlarına bağlar veya bağlantılarını keser"""
+        self.live_updates = enabled
+        for tile in self.bound.values():
+            if enabled:
+                self.attach_stream(tile)
+            else:
+                self.detach_stream(tile)
+
+    def attach_stream(self, tile):
+        # Bağlantı henüz kurulmadıysa akış ilk özet yüklendiğinde açılır
+        connector = connector_pool.peek(tile.account_name)
+        if connector is not None and tile.user_stream is None:
+            tile.attach_user_stream(self.user_streams.start(tile.account_name, connector))
+
+    def detach_stream(self, tile):
+        if tile.user_stream is not None:
+            tile.detach_user_stream()
+            self.user_streams.release(tile.account_name)
@@ -0,0 +1,115 @@
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                             QLabel, QTableWidget, QTableWidgetItem, QGroupBox,
+                             QHeaderView, QFileDialog, QMessageBox)
+from PyQt5.QtCore import Qt, QTimer
+from metrics import metrics
+
+
+class DiagnosticsPanel(QWidget):
+    """Uç nokta ve hesap bazlı REST gecikme ve hata ölçümlerini gösterir"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.init_ui()
+
+        # Panel görünürken ölçümleri periyodik olarak yenile
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(2000)
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        # Kullanılan ağırlık
+        self.weight_label = QLabel("Used weight: -")
+        self.weight_label.setStyleSheet("font-size: 14px; font-weight: bold;")
+        layout.addWidget(self.weight_label)
+
+        # Gecikme tablosu
+        latency_group = QGroupBox("Request Latency")
+        latency_layout = QVBoxLayout()
+        self.latency_table = QTableWidget()
+        self.latency_table.setColumnCount(7)
+        self.latency_table.setHorizontalHeaderLabels(
+            ["Endpoint", "Account", "Calls", "Errors", "Avg (ms)", "p95 (ms)", "Max (ms)"])
+        self.latency_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.latency_table.horizontalHeader().setStretchLastSection(True)
+        self.latency_table.setSortingEnabled(True)
+        latency_layout.addWidget(self.latency_table)
+        latency_group.setLayout(latency_layout)
+        layout.addWidget(latency_group)
+
+        # Hata tablosu
+        errors_group = QGroupBox("Errors by Code")
+        errors_layout = QVBoxLayout()
+        self.errors_table = QTableWidget()
+        self.errors_table.setColumnCount(4)
+        self.errors_table.setHorizontalHeaderLabels(["Endpoint", "Account", "Code", "Count"])
+        self.errors_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.errors_table.horizontalHeader().setStretchLastSection(True)
+        self.errors_table.setSortingEnabled(True)
+        errors_layout.addWidget(self.errors_table)
+        errors_group.setLayout(errors_layout)
+        layout.addWidget(errors_group)
+
+        # Butonlar
+        buttons_layout = QHBoxLayout()
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        export_btn = QPushButton("Export Metrics")
+        export_btn.clicked.connect(self.export_metrics)
+        buttons_layout.addWidget(refresh_btn)
+        buttons_layout.addWidget(export_btn)
+        layout.addLayout(buttons_layout)
+
+        self.setLayout(layout)
+
+    def refresh(self):
+        """Ölçüm tablolarını güncelle"""
+        if not self.isVisible():
+            return
+
+        snapshot = metrics.snapshot()
+
+        weights = [f"{network}: {weight}" for network, weight in sorted(snapshot["used_weight"].items())]
+        self.weight_label.setText("Used weight (1m): " + (", ".join(weights) if weights else "-"))
+
+        self.latency_table.setSortingEnabled(False)
+        self.latency_table.setRowCount(len(snapshot["requests"]))
+        for i, row in enumerate(snapshot["requests"]):
+            self.latency_table.setItem(i, 0, QTableWidgetItem(row["endpoint"]))
+            self.latency_table.setItem(i, 1, QTableWidgetItem(row["account"]))
+            self.latency_table.setItem(i, 2, self.number_item(row["count"]))
+            self.latency_table.setItem(i, 3, self.number_item(row["errors"]))
+            self.latency_table.setItem(i, 4, self.number_item(round(row["avg_ms"], 1)))
+            self.latency_table.setItem(i, 5, self.number_item(round(row["p95_ms"], 1)))
+            self.latency_table.setItem(i, 6, self.number_item(round(row["max_ms"], 1)))
+        self.latency_table.setSortingEnabled(True)
+
+        self.errors_table.setSortingEnabled(False)
+        self.errors_table.setRowCount(len(snapshot["errors"]))
+        for i, row in enumerate(snapshot["errors"]):
+            self.errors_table.setItem(i, 0, QTableWidgetItem(row["endpoint"]))
+            self.errors_table.setItem(i, 1, QTableWidgetItem(row["account"]))
+            self.errors_table.setItem(i, 2, QTableWidgetItem(row["code"]))
+            self.errors_table.setItem(i, 3, self.number_item(row["count"]))
+        self.errors_table.setSortingEnabled(True)
+
+    def number_item(self, value):
+        """Sayısal sıralanan, sağa hizalı hücre"""
+        item = QTableWidgetItem()
+        item.setData(Qt.DisplayRole, value)
+        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        return item
+
+    def export_metrics(self):
+        """Metrikleri Prometheus metin dosyası olarak kaydet"""
+        path, _ = QFileDialog.getSaveFileName(self, "Export Metrics", "binance_metrics.prom",
+                                              "Prometheus text (*.prom *.txt)")
+        if not path:
+            return
+        try:
+            metrics.dump(path)
+            QMessageBox.information(self, "Success", f"Metrics written to {path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to export metrics: {e}")
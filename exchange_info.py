@@ -0,0 +1,175 @@
+import os
+import json
+import time
+import threading
+from decimal import Decimal, ROUND_DOWN, ROUND_HALF_UP
+
+# Borsa bilgisinin yeniden indirilmeden kullanılacağı süre (saniye)
+EXCHANGE_INFO_TTL = 6 * 60 * 60
+
+# İndirme başarısız olduğunda tekrar denemeden önce beklenecek süre; art arda hatalarda katlanır (saniye)
+FAILURE_BACKOFF = 30
+MAX_FAILURE_BACKOFF = 15 * 60
+
+
+class SymbolFilters:
+    """Bir sembolün LOT_SIZE, PRICE_FILTER ve MIN_NOTIONAL kuralları"""
+
+    def __init__(self, symbol_info):
+        self.symbol = symbol_info["symbol"]
+        self.status = symbol_info.get("status", "TRADING")
+        self.base_asset = symbol_info.get("baseAsset", "")
+        self.quote_asset = symbol_info.get("quoteAsset", "")
+
+        filters = {f["filterType"]: f for f in symbol_info.get("filters", [])}
+        lot_size = filters.get("LOT_SIZE", {})
+        price_filter = filters.get("PRICE_FILTER", {})
+        # Yeni API'de MIN_NOTIONAL yerine NOTIONAL filtresi gelir
+        notional = filters.get("MIN_NOTIONAL") or filters.get("NOTIONAL") or {}
+
+        self.step_size = Decimal(lot_size.get("stepSize", "0"))
+        self.min_qty = Decimal(lot_size.get("minQty", "0"))
+        self.max_qty = Decimal(lot_size.get("maxQty", "0"))
+        self.tick_size = Decimal(price_filter.get("tickSize", "0"))
+        self.min_price = Decimal(price_filter.get("minPrice", "0"))
+        self.max_price = Decimal(price_filter.get("maxPrice", "0"))
+        self.min_notional = Decimal(notional.get("minNotional", "0"))
+
+        self.raw_filters = symbol_info.get("filters", [])
+
+    def round_quantity(self, quantity):
+        """Miktarı stepSize'a göre aşağı yuvarlar ve metin olarak döndürür"""
+        return _to_step(quantity, self.step_size, ROUND_DOWN)
+
+    def round_price(self, price):
+        """Fiyatı tickSize'a göre en yakın adıma yuvarlar ve metin olarak döndürür"""
+        return _to_step(price, self.tick_size, ROUND_HALF_UP)
+
+    def to_dict(self):
+        """Diskte saklanacak sade sembol bilgisi"""
+        return {
+            "symbol": self.symbol,
+            "status": self.status,
+            "baseAsset": self.base_asset,
+            "quoteAsset": self.quote_asset,
+            "filters": self.raw_filters
+        }
+
+
+def _to_step(value, step, rounding):
+    """Değeri verilen adımın katına yuvarlar, adım hassasiyetinde metne çevirir"""
+    value = Decimal(str(value))
+    if step <= 0:
+        return format(value.normalize(), "f")
+
+    rounded = (value / step).to_integral_value(rounding=rounding) * step
+    decimals = max(0, -step.normalize().as_tuple().exponent)
+    return f"{rounded:.{decimals}f}"
+
+
+class ExchangeInfoCache:
+    """Testnet ve mainnet için ayrı, diske kaydedilen borsa bilgisi önbelleği"""
+
+    def __init__(self, ttl=EXCHANGE_INFO_TTL, cache_dir="."):
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self._symbols = {}  # testnet -> {symbol: SymbolFilters}
+        self._loaded_at = {}  # testnet -> zaman damgası
+        self._failures = {}  # testnet -> (art arda hata sayısı, son hata zamanı)
+        self._lock = threading.Lock()
+
+    def _cache_file(self, testnet):
+        name = "exchange_info_testnet.json" if testnet else "exchange_info_mainnet.json"
+        return os.path.join(self.cache_dir, name)
+
+    def _is_fresh(self, testnet):
+        return time.time() - self._loaded_at.get(testnet, 0) < self.ttl
+
+    def ensure_loaded(self, client, testnet):
+        """Önbellek eskiyse önce diskten, gerekirse API'den yükler"""
+        if self._is_fresh(testnet):
+            return True
+
+        with self._lock:
+            if self._is_fresh(testnet):
+                return True
+            if self._in_backoff(testnet):
+                # Son indirme yakın zamanda başarısız oldu; her çağrıda tekrar denenmez
+                return bool(self._symbols.get(testnet))
+            if self._load_from_disk(testnet):
+                return True
+            if client is None:
+                return False
+
+            try:
+                exchange_info = client.get_exchange_info()
+            except Exception as e:
+                count = self._failures.get(testnet, (0, 0))[0] + 1
+                self._failures[testnet] = (count, time.time())
+                print(f"Borsa bilgisi alınırken hata: {e}")
+                return bool(self._symbols.get(testnet))
+
+            self._failures.pop(testnet, None)
+            self._set_symbols(testnet, exchange_info["symbols"], time.time())
+            self._save_to_disk(testnet)
+            return True
+
+    def _in_backoff(self, testnet):
+        count, failed_at = self._failures.get(testnet, (0, 0))
+        if not count:
+            return False
+        return time.time() - failed_at < min(FAILURE_BACKOFF * 2 ** (count - 1), MAX_FAILURE_BACKOFF)
+
+    def _set_symbols(self, testnet, symbols, loaded_at):
+        self._symbols[testnet] = {info["symbol"]: SymbolFilters(info) for info in symbols}
+        self._loaded_at[testnet] = loaded_at
+
+    def _load_from_disk(self, testnet):
+        """Diskteki önbellek taze ise yükler"""
+        path = self._cache_file(testnet)
+        if not os.path.exists(path):
+            return False
+
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Borsa bilgisi önbelleği okunamadı: {e}")
+            return False
+
+        if time.time() - data.get("loaded_at", 0) >= self.ttl:
+            return False
+
+        self._set_symbols(testnet, data.get("symbols", []), data["loaded_at"])
+        return True
+
+    def _save_to_disk(self, testnet):
+        try:
+            data = {
+                "loaded_at": self._loaded_at[testnet],
+                "symbols": [filters.to_dict() for filters in self._symbols[testnet].values()]
+            }
+            with open(self._cache_file(testnet), "w") as f:
+                json.dump(data, f)
+        except Exception as e:
+            print(f"Borsa bilgisi önbelleği kaydedilemedi: {e}")
+
+    def get_filters(self, symbol, testnet):
+        """Sembolün filtrelerini ağ çağrısı yapmadan döndürür"""
+        return self._symbols.get(testnet, {}).get(symbol)
+
+    def get_symbols(self, testnet, quote_asset=None):
+        """Önbellekteki sembol adlarını döndürür"""
+        symbols = self._symbols.get(testnet, {})
+        return [name for name, filters in symbols.items()
+                if quote_asset is None or filters.quote_asset == quote_asset]
+
+    def get_pairs(self, testnet):
+        """İşlemdeki sembollerin {sembol: (baz, kote)} eşlemesi"""
+        symbols = self._symbols.get(testnet, {})
+        return {name: (filters.base_asset, filters.quote_asset)
+                for name, filters in symbols.items() if filters.status == "TRADING"}
+
+
+# Tüm connector'ların paylaştığı önbellek
+exchange_info_cache = ExchangeInfoCache()
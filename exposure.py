@@ -0,0 +1,130 @@
+import time
+import threading
+
+# Bu süreden eski hesap görüntüleri yenilemede tekrar çekilir (saniye)
+EXPOSURE_MAX_AGE = 60.0
+
+
+class ExposureBook:
+    """Hesapların son bakiye ve açık emir görüntülerini tutup varlık x hesap matrisine çevirir"""
+
+    def __init__(self, max_age=EXPOSURE_MAX_AGE):
+        self.max_age = max_age
+        self.snapshots = {}  # account -> {"testnet", "balances", "open_orders", "fetched_at"}
+        self.dirty = set()
+        self._lock = threading.Lock()
+
+    def mark_dirty(self, accounts):
+        """Emir işlemlerinden etkilenen hesaplar bir sonraki yenilemede tekrar çekilir"""
+        with self._lock:
+            self.dirty.update(accounts)
+
+    def accounts_to_refresh(self, accounts):
+        """Kirli, eski veya hiç çekilmemiş hesaplar"""
+        now = time.time()
+        with self._lock:
+            return [name for name in accounts
+                    if name in self.dirty or name not in self.snapshots
+                    or now - self.snapshots[name]["fetched_at"] >= self.max_age]
+
+    def update(self, account, testnet, balances, open_orders):
+        with self._lock:
+            self.snapshots[account] = {
+                "testnet": testnet,
+                "balances": balances,
+                "open_orders": open_orders,
+                "fetched_at": time.time()
+            }
+            self.dirty.discard(account)
+
+    def update_orders(self, account, open_orders):
+        """Başka bir yükleyiciden gelen güncel açık emirleri görüntüye işler"""
+        with self._lock:
+            if account in self.snapshots:
+                self.snapshots[account]["open_orders"] = open_orders
+
+    def retain(self, accounts):
+        """Artık listede olmayan hesapları bırakır"""
+        with self._lock:
+            for name in list(self.snapshots):
+                if name not in accounts:
+                    del self.snapshots[name]
+            self.dirty.intersection_update(accounts)
+
+    def pivot(self, engines):
+        """(ağ, varlık) x hesap miktar matrisi, satır toplamları ve ağ başına USD toplamları.
+
+        Testnet ve mainnet bakiyeleri ayrı satırlarda ve ayrı toplamlarda tutulur.
+        engines: {testnet: ValuationEngine}; çift bilgisi ve USD fiyatları her ağın kendi motorundan alınır.
+        """
+        with self._lock:
+            snapshots = {name: dict(snapshot) for name, snapshot in self.snapshots.items()}
+
+        markets = {testnet: engine.market_snapshot() for testnet, engine in engines.items()}
+        accounts = sorted(snapshots)
+        account_networks = {account: network_name(snapshots[account]["testnet"]) for account in accounts}
+        rows = {}
+
+        def row(network, asset, asset_prices):
+            return rows.setdefault((network, asset), {
+                "network": network,
+                "asset": asset,
+                "amounts": dict.fromkeys(accounts, 0.0),
+                "locked": 0.0,
+                "resting_usd": 0.0,
+                "usd_price": asset_prices.get(asset)
+            })
+
+        for account in accounts:
+            snapshot = snapshots[account]
+            network = account_networks[account]
+            pairs, asset_prices = markets[snapshot["testnet"]]
+
+            for balance in snapshot["balances"]:
+                entry = row(network, balance["asset"], asset_prices)
+                entry["amounts"][account] += float(balance["free"]) + float(balance["locked"])
+                entry["locked"] += float(balance["locked"])
+
+            # Bekleyen emirler: alışlar baz varlığa +, satışlar - notional (USD)
+            for order in snapshot["open_orders"]:
+                pair = pairs.get(order["symbol"])
+                if pair is None:
+                    continue
+                base, quote = pair
+                remaining = float(order["origQty"]) - float(order.get("executedQty", 0))
+                price = float(order.get("price") or 0) or float(order.get("stopPrice") or 0)
+                quote_usd = asset_prices.get(quote)
+                if not price or quote_usd is None:
+                    continue
+                notional = remaining * price * quote_usd
+                entry = row(network, base, asset_prices)
+                entry["resting_usd"] += notional if order["side"] == "BUY" else -notional
+
+        result_rows = []
+        network_totals = {}
+        for key in sorted(rows):
+            entry = rows[key]
+            entry["total"] = sum(entry["amounts"].values())
+            entry["total_usd"] = entry["total"] * entry["usd_price"] if entry["usd_price"] is not None else None
+            network_totals.setdefault(entry["network"], 0.0)
+            if entry["total_usd"]:
+                network_totals[entry["network"]] += entry["total_usd"]
+            result_rows.append(entry)
+
+        account_totals = dict.fromkeys(accounts, 0.0)
+        for entry in result_rows:
+            if entry["usd_price"] is not None:
+                for account, amount in entry["amounts"].items():
+                    account_totals[account] += amount * entry["usd_price"]
+
+        return {
+            "accounts": accounts,
+            "account_networks": account_networks,
+            "rows": result_rows,
+            "account_totals_usd": account_totals,
+            "network_totals_usd": network_totals
+        }
+
+
+def network_name(testnet):
+    return "testnet" if testnet else "mainnet"
@@ -0,0 +1,53 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Aynı anda çalışacak en fazla hesap işi
+DEFAULT_MAX_WORKERS = 16
+
+
+class FanOutResult:
+    """Tek bir hesap işinin sonucu ve zamanlaması"""
+
+    def __init__(self, key, value=None, error=None, started=0.0, finished=0.0):
+        self.key = key
+        self.value = value
+        self.error = error
+        self.started = started
+        self.finished = finished
+
+    @property
+    def latency_ms(self):
+        """İşin başlangıcından bitişine geçen süre (ms)"""
+        return (self.finished - self.started) * 1000.0
+
+
+class FanOutExecutor:
+    """Aynı işi birden çok hesap için sınırlı eşzamanlılıkla çalıştırır"""
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS):
+        self.max_workers = max(1, int(max_workers))
+
+    def run(self, func, items):
+        """items sözlüğündeki her (key, value) için func(key, value) çağırır.
+
+        Sonuçlar tamamlanma sırasına göre FanOutResult olarak üretilir.
+        """
+        if not items:
+            return
+
+        workers = min(self.max_workers, len(items))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self._timed_call, func, key, value)
+                       for key, value in items.items()]
+            for future in as_completed(futures):
+                yield future.result()
+
+    @staticmethod
+    def _timed_call(func, key, value):
+        """İşi çalıştırır, hatayı yakalayıp sonuca ekler"""
+        started = time.perf_counter()
+        try:
+            result = func(key, value)
+            return FanOutResult(key, value=result, started=started, finished=time.perf_counter())
+        except Exception as e:
+            return FanOutResult(key, error=e, started=started, finished=time.perf_counter())
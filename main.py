@@ -17,12 +17,23 @@ from binance_api import BinanceConnector
 from transaction import AccountWidget
 from left_menu import SideMenuWidget
 from main_screen import MainWindow
+from metrics import metrics
+from async_binance_api import install_event_loop
 
 def main():
     app = QApplication(sys.argv)
+
+    # İstenirse metrikler http://127.0.0.1:<port>/metrics adresinden sunulur
+    metrics_port = os.environ.get("BINANCE_METRICS_PORT")
+    if metrics_port:
+        metrics.start_http_server(int(metrics_port))
+
+    # AsyncBinanceConnector'lar için Qt ile birleşik asyncio döngüsü
+    event_loop = install_event_loop(app)
+
     window = MainWindow()
     window.show()
-    sys.exit(app.exec_())
+    sys.exit(event_loop.exec_())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,12 +1,18 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QLabel, QSplitter,
-                             QMessageBox, QGridLayout, QPushButton,
+                             QMessageBox, QPushButton,
                              QStackedWidget, QToolBar, QAction, QMenuBar, QMenu)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QIcon
 from account_manager import AccountManager
 from transaction import AccountWidget
 from admin_panel import AdminPanel
+from market_stream import MarketDataStream
+from user_data_stream import UserStreamManager
+from rate_limiter import rate_limiters
+from diagnostics_panel import DiagnosticsPanel
+from refresh_scheduler import RefreshScheduler
+from dashboard import AccountDashboard
 
 
 class MainWindow(QMainWindow):
@@ -14,7 +20,16 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.account_manager = AccountManager()
-        self.account_widgets = {}  # Açık hesap widget'ları
+        self.account_widgets = {}  # Ayrıntısı açık hesap widget'ı (panodan açılır)
+        self.market_streams = {}  # testnet -> MarketDataStream (canlı fiyat modu açıkken)
+        self.user_streams = UserStreamManager()  # hesap başına user-data akışları
+        self.refresh_scheduler = RefreshScheduler(self)  # hesap widget'larının periyodik yenilemeleri
+
+        # Sembol değişiklikleri (ör. yazarken) tek bir yeniden bağlanmada birleştirilir
+        self.stream_symbols_timer = QTimer(self)
+        self.stream_symbols_timer.setSingleShot(True)
+        self.stream_symbols_timer.setInterval(1000)
+        self.stream_symbols_timer.timeout.connect(self.update_stream_symbols)
         self.current_view = "accounts"  # Başlangıç görünümü: "accounts" veya "admin"
         self.init_ui()
 
@@ -50,10 +65,23 @@ class MainWindow(QMainWindow):
         self.empty_label.setAlignment(Qt.AlignCenter)
         self.empty_label.setStyleSheet("font-size: 16px; color: gray;")
 
-        # Hesapların gösterileceği grid widget
-        self.grid_widget = QWidget()
-        self.grid_layout = QGridLayout()
-        self.grid_widget.setLayout(self.grid_layout)
+        # Hesap kutucukları (sanal ızgara) ve seçilen hesabın ayrıntı paneli
+        self.dashboard = AccountDashboard(self.account_manager, self.refresh_scheduler, self.user_streams)
+        self.dashboard.open_requested.connect(self.open_account_detail)
+        self.dashboard.remove_requested.connect(self.remove_account_from_view)
+
+        self.detail_panel = QWidget()
+        self.detail_layout = QVBoxLayout()
+        self.detail_layout.setContentsMargins(0, 0, 0, 0)
+        close_detail_button = QPushButton("Close")
+        close_detail_button.clicked.connect(self.close_account_detail)
+        self.detail_layout.addWidget(close_detail_button, alignment=Qt.AlignRight)
+        self.detail_panel.setLayout(self.detail_layout)
+        self.detail_panel.hide()
+
+        self.accounts_splitter = QSplitter(Qt.Horizontal)
+        self.accounts_splitter.addWidget(self.dashboard)
+        self.accounts_splitter.addWidget(self.detail_panel)
 
         # Başlangıçta boş ekran mesajı
         accounts_layout.addWidget(self.empty_label)
@@ -62,6 +90,9 @@ class MainWindow(QMainWindow):
         # 2. Admin Paneli Görünümü (başlatma lazy loading ile yapılacak)
         self.admin_panel = None
 
+        # 3. Tanı Paneli Görünümü (lazy loading)
+        self.diagnostics_panel = None
+
         # Görünümleri StackedWidget'a ekle
         self.stacked_widget.addWidget(self.accounts_view)
 
@@ -72,6 +103,14 @@ class MainWindow(QMainWindow):
         central_widget.setLayout(main_layout)
         self.setCentralWidget(central_widget)
 
+        # API ağırlık kotası göstergesi
+        self.rate_limit_label = QLabel()
+        self.statusBar().addPermanentWidget(self.rate_limit_label)
+        self.rate_limit_timer = QTimer(self)
+        self.rate_limit_timer.timeout.connect(self.update_rate_limit_label)
+        self.rate_limit_timer.start(1000)
+        self.update_rate_limit_label()
+
     def create_menu_bar(self):
         """Güvenlik menüsünü oluştur"""
         menubar = self.menuBar()
@@ -109,6 +148,26 @@ class MainWindow(QMainWindow):
         self.admin_action.triggered.connect(lambda: self.switch_view("admin"))
         self.toolbar.addAction(self.admin_action)
 
+        # Tanı paneli butonu
+        self.diagnostics_action = QAction("Diagnostics", self)
+        self.diagnostics_action.setCheckable(True)
+        self.diagnostics_action.triggered.connect(lambda: self.switch_view("diagnostics"))
+        self.toolbar.addAction(self.diagnostics_action)
+
+        self.toolbar.addSeparator()
+
+        # Canlı fiyat akışı (WebSocket) butonu
+        self.live_prices_action = QAction("Live Prices", self)
+        self.live_prices_action.setCheckable(True)
+        self.live_prices_action.toggled.connect(self.toggle_live_prices)
+        self.toolbar.addAction(self.live_prices_action)
+
+        # Bakiye ve emirlerin user-data akışıyla güncellenmesi
+        self.live_account_action = QAction("Live Account Updates", self)
+        self.live_account_action.setCheckable(True)
+        self.live_account_action.toggled.connect(self.toggle_live_account_updates)
+        self.toolbar.addAction(self.live_account_action)
+
         # Araç çubuğuna stil ekle
         self.toolbar.setStyleSheet("""
             QToolBar {
@@ -126,6 +185,17 @@ class MainWindow(QMainWindow):
             }
         """)
 
+    def update_rate_limit_label(self):
+        """Mainnet ve testnet için kalan API ağırlığını göster"""
+        parts = []
+        for testnet, name in ((False, "Mainnet"), (True, "Testnet")):
+            headroom = rate_limiters[testnet].headroom()
+            text = f"{name} weight: {headroom['weight_available']}/{headroom['weight_capacity']}"
+            if headroom["blocked_for"] > 0:
+                text += f" (paused {headroom['blocked_for']:.0f}s)"
+            parts.append(text)
+        self.rate_limit_label.setText("  |  ".join(parts))
+
     def show_change_password_dialog(self):
         """Şifre değiştirme diyaloğunu göster"""
         from password_dialog import PasswordManager
@@ -171,15 +241,69 @@ class MainWindow(QMainWindow):
                 # Kullanıcı şifre diyaloğunu iptal etti
                 self.close()
 
+    def toggle_live_prices(self, enabled):
+        """Canlı fiyat akışını aç veya kapat"""
+        if enabled:
+            for widget in self.account_widgets.values():
+                self.attach_market_stream(widget)
+            self.update_stream_symbols()
+        else:
+            for stream in self.market_streams.values():
+                stream.stop()
+                stream.deleteLater()
+            self.market_streams = {}
+
+    def toggle_live_account_updates(self, enabled):
+        """Açık hesapların user-data akışlarını aç veya kapat"""
+        self.dashboard.set_live_updates(enabled)
+        for widget in self.account_widgets.values():
+            if enabled:
+                self.attach_user_stream(widget)
+            else:
+                widget.detach_user_stream()
+        if self.admin_panel is not None:
+            self.admin_panel.set_live_updates(enabled)
+        if not enabled:
+            self.user_streams.stop()
+
+    def attach_user_stream(self, widget):
+        """Hesap widget'ını kendi user-data akışına bağla"""
+        if widget.connector.connected:
+            widget.attach_user_stream(self.user_streams.start(widget.account_name, widget.connector))
+
+    def attach_market_stream(self, widget):
+        """Hesap widget'ını kendi ağının fiyat akışına bağla"""
+        stream = self.market_streams.get(widget.testnet)
+        if stream is None:
+            stream = MarketDataStream(testnet=widget.testnet, parent=self)
+            self.market_streams[widget.testnet] = stream
+        stream.prices_updated.connect(widget.on_prices_updated)
+
+    def update_stream_symbols(self):
+        """Açık hesap widget'larının kullandığı sembolleri akışlara bildir"""
+        if not self.live_prices_action.isChecked():
+            return
+
+        symbols = {testnet: set() for testnet in self.market_streams}
+        for widget in self.account_widgets.values():
+            symbols.setdefault(widget.testnet, set()).update(widget.stream_symbols())
+
+        for testnet, stream in self.market_streams.items():
+            stream.set_symbols(symbols.get(testnet, set()))
+
     def create_admin_panel(self):
         """Admin panelini lazy loading ile oluştur"""
         if self.admin_panel is None:
-            self.admin_panel = AdminPanel(self.account_manager)
+            self.admin_panel = AdminPanel(self.account_manager, self.user_streams)
+            self.admin_panel.set_live_updates(self.live_account_action.isChecked())
             self.admin_panel.refresh_accounts_signal.connect(self.load_account_widgets)
             self.stacked_widget.addWidget(self.admin_panel)
 
     def switch_view(self, view_name):
         """Görünümler arasında geçiş yap"""
+        # Hesap panelleri sadece hesaplar görünümündeyken yenilenir
+        self.refresh_scheduler.set_paused(view_name != "accounts")
+
         if view_name == "accounts":
             self.stacked_widget.setCurrentIndex(0)
             self.current_view = "accounts"
@@ -187,32 +311,9 @@ class MainWindow(QMainWindow):
             # Butonları güncelle
             self.accounts_action.setChecked(True)
             self.admin_action.setChecked(False)
+            self.diagnostics_action.setChecked(False)
 
-            # Hesap görünümünde grid'i yeniden düzenle
-            if len(self.account_widgets) > 0:
-                # Hesaplar görünümünün layout'undan boş etiketi kaldır
-                layout = self.accounts_view.layout()
-                if layout.itemAt(0).widget() == self.empty_label:
-                    layout.takeAt(0)
-                    self.empty_label.setParent(None)
-
-                # Grid widget'ı ekle
-                if not layout.count():
-                    layout.addWidget(self.grid_widget)
-
-                self.update_grid_layout()
-            else:
-                # Hesap yok, boş ekranı göster
-                layout = self.accounts_view.layout()
-                if layout.count() == 0 or layout.itemAt(0).widget() != self.empty_label:
-                    # Önceki widget'ı kaldır (eğer varsa)
-                    while layout.count():
-                        item = layout.takeAt(0)
-                        if item.widget():
-                            item.widget().setParent(None)
-
-                    # Boş ekran mesajını ekle
-                    layout.addWidget(self.empty_label)
+            self.update_accounts_view()
 
         elif view_name == "admin":
             # Admin panelini lazy loading ile oluştur
@@ -226,12 +327,28 @@ class MainWindow(QMainWindow):
             # Butonları güncelle
             self.accounts_action.setChecked(False)
             self.admin_action.setChecked(True)
+            self.diagnostics_action.setChecked(False)
 
             # Admin paneli başlatması otomatik olarak başlayacak
             # Eğer daha önceden yüklenmişse ve kullanıcı tekrar geçiş yapıyorsa,
             # veri tazeleme isteğe bağlı yapılabilir
             self.refresh_admin_panel_if_needed()
 
+        elif view_name == "diagnostics":
+            if self.diagnostics_panel is None:
+                self.diagnostics_panel = DiagnosticsPanel()
+                self.stacked_widget.addWidget(self.diagnostics_panel)
+
+            self.stacked_widget.setCurrentWidget(self.diagnostics_panel)
+            self.current_view = "diagnostics"
+
+            # Butonları güncelle
+            self.accounts_action.setChecked(False)
+            self.admin_action.setChecked(False)
+            self.diagnostics_action.setChecked(True)
+
+            self.diagnostics_panel.refresh()
+
     def refresh_admin_panel_if_needed(self):
         """Admin panelinin verilerini gerekirse tazele"""
         if self.admin_panel is not None:
@@ -250,119 +367,97 @@ class MainWindow(QMainWindow):
                 # Açık emirleri yenile
                 self.admin_panel.load_open_orders()
 
-    def add_account_to_view(self, account_name):
-        """Seçili hesabı görüntüleme ekranına ekle"""
-        # Maksimum 4 hesap kontrolü
-        if len(self.account_widgets) >= 4:
-            QMessageBox.warning(self, "Warning", "Maximum of 4 accounts can be displayed at once. "
-                                                 "Remove an account before adding a new one.")
-            return
+    def update_accounts_view(self):
+        """Hesap yoksa boş ekran mesajını, varsa kutucuk panosunu göster"""
+        layout = self.accounts_view.layout()
+        widget = self.accounts_splitter if self.dashboard.accounts else self.empty_label
+        current = layout.itemAt(0).widget() if layout.count() else None
+        if current is not widget:
+            if current is not None:
+                layout.takeAt(0)
+                current.setParent(None)
+            layout.addWidget(widget)
 
+    def add_account_to_view(self, account_name):
+        """Seçili hesabı görüntüleme ekranındaki panoya ekle"""
         # Hesap zaten ekranda mı?
-        if account_name in self.account_widgets:
+        if account_name in self.dashboard.accounts:
             QMessageBox.information(self, "Info", f"Account '{account_name}' is already displayed.")
             return
 
         # Hesap bilgilerini al
+        if not self.account_manager.get_account(account_name):
+            QMessageBox.warning(self, "Error", f"Account '{account_name}' not found.")
+            return
+
+        # Kutucuk sadece görünür olduğunda widget, yenileme ve akış aboneliği alır
+        self.dashboard.add_account(account_name)
+
+        # Otomatik olarak hesaplar görünümüne geç
+        self.switch_view("accounts")
+
+    def open_account_detail(self, account_name):
+        """Hesabın tam panelini kutucuk panosunun yanında aç"""
+        if account_name in self.account_widgets:
+            return
+        self.close_account_detail()
+
         account_data = self.account_manager.get_account(account_name)
         if not account_data:
             QMessageBox.warning(self, "Error", f"Account '{account_name}' not found.")
             return
 
-        # Yeni hesap widget'ı oluştur
+        # Yeni hesap widget'ı oluştur; bağlantı arka planda kurulur, ekran beklemez
         account_widget = AccountWidget(account_name, account_data)
+        account_widget.symbols_changed.connect(self.stream_symbols_timer.start)
+        account_widget.account_connected.connect(lambda: self.on_account_connected(account_widget))
+        if self.live_prices_action.isChecked():
+            self.attach_market_stream(account_widget)
+            self.update_stream_symbols()
 
         # Widget'ı kaydet
         self.account_widgets[account_name] = account_widget
+        self.refresh_scheduler.register(account_widget)
+        self.detail_layout.addWidget(account_widget)
+        self.detail_panel.show()
 
-        # Eğer hesaplar görünümündeysek, görünümü güncelle
-        if self.current_view == "accounts":
-            # Boş ekran mesajını kaldır
-            if len(self.account_widgets) == 1:
-                layout = self.accounts_view.layout()
-                if layout.itemAt(0).widget() == self.empty_label:
-                    layout.takeAt(0)
-                    self.empty_label.setParent(None)
+    def on_account_connected(self, widget):
+        """Bağlantısı kurulan hesabı açıksa user-data akışına bağla"""
+        if self.live_account_action.isChecked() and widget.user_stream is None:
+            self.attach_user_stream(widget)
 
-                # Grid widget'ı ekle
-                layout.addWidget(self.grid_widget)
-
-            # Grid'e ekle
-            count = len(self.account_widgets)
-            row, col = divmod(count - 1, 2)  # 2x2 grid için satır ve sütun hesaplama
-            self.grid_layout.addWidget(account_widget, row, col)
-
-            # Grid düzenini güncelle
-            self.update_grid_layout()
-
-        # Otomatik olarak hesaplar görünümüne geç
-        self.switch_view("accounts")
+    def close_account_detail(self):
+        """Ayrıntı panelindeki hesap widget'ını kapat"""
+        for account_name, widget in self.account_widgets.items():
+            self.refresh_scheduler.unregister(widget)
+            widget.jobs.cancel_all()
+            if widget.user_stream is not None:
+                widget.detach_user_stream()
+                self.user_streams.release(account_name)
+            self.detail_layout.removeWidget(widget)
+            widget.setParent(None)
+            widget.deleteLater()
+        self.account_widgets = {}
+        self.detail_panel.hide()
+        self.update_stream_symbols()
 
     def remove_account_from_view(self, account_name):
         """Hesabı görüntüleme ekranından kaldır"""
-        if account_name not in self.account_widgets:
+        if account_name not in self.dashboard.accounts:
             return
 
-        # Widget'ı grid'den kaldır (eğer şu an gösteriliyorsa)
-        if self.current_view == "accounts":
-            widget = self.account_widgets[account_name]
-            self.grid_layout.removeWidget(widget)
-            widget.setParent(None)
-
-        # Widget'ı listeden çıkar ve belleği temizle
-        self.account_widgets[account_name].deleteLater()
-        del self.account_widgets[account_name]
+        if account_name in self.account_widgets:
+            self.close_account_detail()
+        self.dashboard.remove_account(account_name)
 
         # Eğer tüm hesaplar kaldırıldıysa, boş ekran mesajını göster
-        if len(self.account_widgets) == 0:
-            if self.current_view == "accounts":
-                layout = self.accounts_view.layout()
-                # Grid widget'ı kaldır
-                if layout.count() > 0 and layout.itemAt(0).widget() == self.grid_widget:
-                    layout.takeAt(0)
-                    self.grid_widget.setParent(None)
-
-                # Boş ekran mesajını ekle
-                layout.addWidget(self.empty_label)
-        else:
-            # Mevcut hesaplar varsa grid düzenini güncelle
-            if self.current_view == "accounts":
-                self.update_grid_layout()
-
-    def update_grid_layout(self):
-        """Grid layout'u yeniden düzenle"""
-        # Önce tüm widget'ları grid'den kaldır
-        for i in reversed(range(self.grid_layout.count())):
-            item = self.grid_layout.itemAt(i)
-            if item.widget():
-                self.grid_layout.removeItem(item)
-                item.widget().setParent(None)
-
-        # Şimdi yeniden düzenle
-        accounts = list(self.account_widgets.items())
-
-        if len(accounts) == 1:
-            # Tek hesap varsa, tam ekran göster
-            self.grid_layout.addWidget(accounts[0][1], 0, 0)
-        elif len(accounts) == 2:
-            # İki hesap varsa, yan yana göster
-            self.grid_layout.addWidget(accounts[0][1], 0, 0)
-            self.grid_layout.addWidget(accounts[1][1], 0, 1)
-        elif len(accounts) == 3:
-            # Üç hesap varsa, üstte 2, altta 1 şeklinde göster
-            self.grid_layout.addWidget(accounts[0][1], 0, 0)
-            self.grid_layout.addWidget(accounts[1][1], 0, 1)
-            self.grid_layout.addWidget(accounts[2][1], 1, 0, 1, 2)  # Son widget iki sütunu da kaplasın
-        elif len(accounts) == 4:
-            # Dört hesap varsa, 2x2 grid şeklinde göster
-            self.grid_layout.addWidget(accounts[0][1], 0, 0)
-            self.grid_layout.addWidget(accounts[1][1], 0, 1)
-            self.grid_layout.addWidget(accounts[2][1], 1, 0)
-            self.grid_layout.addWidget(accounts[3][1], 1, 1)
+        if self.current_view == "accounts":
+            self.update_accounts_view()
 
     def load_account_widgets(self):
         """Hesap widget'larını yenile"""
         # Mevcut hesap widget'larını güncelle
         for account_name, widget in self.account_widgets.items():
-            # Hesabın bağlantısını ve verilerini yenile
-            widget.refresh_data()
\ No newline at end of file
+            # Açık sekme bir sonraki tikten itibaren kademeli olarak arka planda yenilenir
+            self.refresh_scheduler.refresh_now(widget)
+        self.dashboard.refresh_visible()
\ No newline at end of file
@@ -0,0 +1,179 @@
+import json
+import asyncio
+import threading
+import websockets
+from PyQt5.QtCore import QObject, QThread, QTimer, pyqtSignal
+from price_cache import price_cache
+
+MAINNET_STREAM_URL = "wss://stream.binance.com:9443"
+TESTNET_STREAM_URL = "wss://stream.testnet.binance.vision"
+
+# Biriken güncellemelerin arayüze aktarılma aralığı (ms)
+FRAME_INTERVAL_MS = 100
+
+# Bağlantı koptuğunda yeniden denemeden önce beklenecek en uzun süre (saniye)
+MAX_RECONNECT_DELAY = 30
+
+
+# Durdurulmuş ama thread'i henüz bitmemiş worker'lar (bitene kadar referans tutulur)
+_stopping_workers = set()
+
+
+class StreamWorker(QThread):
+    """WebSocket bağlantısını kendi asyncio döngüsünde dinleyen thread.
+
+    stop() beklemez: dinleme görevi döngü içinden iptal edilir (bağlantı kurulurken veya
+    yeniden bağlanma beklemesindeyken de), worker thread bitince kendini siler.
+    """
+
+    def __init__(self, url, on_message, on_connected=None, parent=None):
+        super().__init__(parent)
+        self.url = url
+        self.on_message = on_message
+        self.on_connected = on_connected  # her (yeniden) bağlanmada worker thread'inde çağrılır
+        self._stopped = threading.Event()
+        self._loop = None
+        self._task = None
+        self.finished.connect(self._on_finished)
+
+    def run(self):
+        loop = asyncio.new_event_loop()
+        self._task = loop.create_task(self._listen())
+        self._loop = loop
+        # stop() döngü atanmadan çağrıldıysa görev burada iptal edilir
+        if self._stopped.is_set():
+            self._task.cancel()
+        try:
+            loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop = None
+            loop.close()
+
+    async def _listen(self):
+        """Bağlantı koptukça artan beklemeyle yeniden bağlanır"""
+        delay = 1
+        while not self._stopped.is_set():
+            try:
+                async with websockets.connect(self.url) as websocket:
+                    delay = 1
+                    if self.on_connected is not None:
+                        self.on_connected()
+                    async for message in websocket:
+                        if self._stopped.is_set():
+                            return
+                        self.on_message(json.loads(message))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self._stopped.is_set():
+                    break
+                print(f"WebSocket bağlantı hatası: {e}")
+
+            if not self._stopped.is_set():
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    def _cancel(self):
+        """Döngü thread'inde çalışır"""
+        if self._task is not None:
+            self._task.cancel()
+
+    def stop(self):
+        """Dinlemeyi durdurur; arayüz thread'ini bloklamaz"""
+        self._stopped.set()
+        if self.isRunning():
+            _stopping_workers.add(self)
+        loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._cancel)
+            except RuntimeError:
+                # Döngü bu arada kapandı, thread zaten bitiyor
+                pass
+
+    def _on_finished(self):
+        if self._stopped.is_set():
+            _stopping_workers.discard(self)
+            self.deleteLater()
+
+
+class MarketDataStream(QObject):
+    """miniTicker ve bookTicker akışlarını dinleyip fiyatları arayüze aktarır"""
+    prices_updated = pyqtSignal(dict)  # {symbol: {"price", "change", "high", "low", "bid", "ask"}}
+
+    def __init__(self, testnet=True, url=None, frame_interval_ms=FRAME_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self.testnet = testnet
+        self.url = url or (TESTNET_STREAM_URL if testnet else MAINNET_STREAM_URL)
+        self.symbols = set()
+        self.worker = None
+
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+
+        # Güncellemeler her mesajda değil, kare aralığında topluca gönderilir
+        self.frame_timer = QTimer(self)
+        self.frame_timer.timeout.connect(self.flush)
+        self.frame_timer.start(frame_interval_ms)
+
+    def set_symbols(self, symbols):
+        """Dinlenen sembolleri günceller, değiştiyse bağlantıyı yeniler"""
+        symbols = {symbol.upper() for symbol in symbols if symbol}
+        if symbols == self.symbols and self.worker is not None:
+            return
+
+        self.symbols = symbols
+        self.stop()
+        if self.symbols:
+            self.worker = StreamWorker(self.stream_url(), self.handle_message)
+            self.worker.start()
+
+    def stream_url(self):
+        """Birleşik akış adresini oluşturur"""
+        streams = []
+        for symbol in sorted(self.symbols):
+            streams.append(f"{symbol.lower()}@miniTicker")
+            streams.append(f"{symbol.lower()}@bookTicker")
+        return f"{self.url}/stream?streams={'/'.join(streams)}"
+
+    def stop(self):
+        """Akışı durdurur"""
+        if self.worker is not None:
+            # Worker thread'i bitince kendini siler
+            self.worker.stop()
+            self.worker = None
+
+    def handle_message(self, message):
+        """WebSocket thread'inden çağrılır, sadece son değeri biriktirir"""
+        stream = message.get("stream", "")
+        data = message.get("data", message)
+        symbol = data.get("s")
+        if not symbol:
+            return
+
+        with self._pending_lock:
+            update = self._pending.setdefault(symbol, {})
+            if stream.endswith("@bookTicker"):
+                update["bid"] = float(data["b"])
+                update["ask"] = float(data["a"])
+            else:
+                close = float(data["c"])
+                open_price = float(data["o"])
+                update["price"] = close
+                update["high"] = float(data["h"])
+                update["low"] = float(data["l"])
+                update["change"] = (close - open_price) / open_price * 100 if open_price else 0.0
+
+    def flush(self):
+        """Biriken güncellemeleri fiyat önbelleğine ve arayüze aktarır"""
+        with self._pending_lock:
+            if not self._pending:
+                return
+            updates, self._pending = self._pending, {}
+
+        prices = {symbol: update["price"] for symbol, update in updates.items() if "price" in update}
+        if prices:
+            price_cache.update(self.testnet, prices)
+        self.prices_updated.emit(updates)
@@ -0,0 +1,149 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Gecikme histogramı kova sınırları (saniye)
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LatencyHistogram:
+    """Prometheus tarzı kümülatif gecikme histogramı"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[i] += 1
+
+    def quantile(self, q):
+        """Kova sınırlarına göre yaklaşık yüzdelik değeri"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        for bound, count in zip(self.buckets, self.counts):
+            if count >= target:
+                return bound
+        return self.max
+
+
+class MetricsRegistry:
+    """BinanceConnector istekleri için gecikme, hata ve ağırlık ölçümleri"""
+
+    def __init__(self):
+        self.latencies = {}  # (endpoint, account) -> LatencyHistogram
+        self.errors = {}  # (endpoint, account, code) -> adet
+        self.used_weight = {}  # network -> son X-MBX-USED-WEIGHT-1M değeri
+        self._lock = threading.Lock()
+
+    def record_request(self, endpoint, account, seconds, error_code=None):
+        """Bir isteğin süresini ve varsa hata kodunu kaydeder"""
+        account = account or "-"
+        with self._lock:
+            histogram = self.latencies.get((endpoint, account))
+            if histogram is None:
+                histogram = LatencyHistogram()
+                self.latencies[(endpoint, account)] = histogram
+            histogram.observe(seconds)
+
+            if error_code is not None:
+                key = (endpoint, account, str(error_code))
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+    def set_used_weight(self, network, weight):
+        with self._lock:
+            self.used_weight[network] = weight
+
+    def snapshot(self):
+        """Tanı paneli için uç nokta ve hesap bazlı özet satırları"""
+        with self._lock:
+            error_totals = {}
+            for (endpoint, account, _), count in self.errors.items():
+                error_totals[(endpoint, account)] = error_totals.get((endpoint, account), 0) + count
+
+            rows = []
+            for (endpoint, account), histogram in self.latencies.items():
+                rows.append({
+                    "endpoint": endpoint,
+                    "account": account,
+                    "count": histogram.count,
+                    "errors": error_totals.get((endpoint, account), 0),
+                    "avg_ms": histogram.total / histogram.count * 1000 if histogram.count else 0.0,
+                    "p95_ms": histogram.quantile(0.95) * 1000,
+                    "max_ms": histogram.max * 1000
+                })
+
+            return {
+                "requests": rows,
+                "errors": [{"endpoint": endpoint, "account": account, "code": code, "count": count}
+                           for (endpoint, account, code), count in self.errors.items()],
+                "used_weight": dict(self.used_weight)
+            }
+
+    def render_prometheus(self):
+        """Prometheus metin biçiminde çıktı üretir"""
+        lines = [
+            "# HELP binance_request_duration_seconds Binance REST request latency",
+            "# TYPE binance_request_duration_seconds histogram"
+        ]
+        with self._lock:
+            for (endpoint, account), histogram in sorted(self.latencies.items()):
+                labels = f'endpoint="{_escape(endpoint)}",account="{_escape(account)}"'
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append(f'binance_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'binance_request_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"binance_request_duration_seconds_sum{{{labels}}} {histogram.total}")
+                lines.append(f"binance_request_duration_seconds_count{{{labels}}} {histogram.count}")
+
+            lines.append("# HELP binance_request_errors_total Binance REST errors by error code")
+            lines.append("# TYPE binance_request_errors_total counter")
+            for (endpoint, account, code), count in sorted(self.errors.items()):
+                lines.append(f'binance_request_errors_total{{endpoint="{_escape(endpoint)}",'
+                             f'account="{_escape(account)}",code="{_escape(code)}"}} {count}')
+
+            lines.append("# HELP binance_used_weight Last X-MBX-USED-WEIGHT-1M reported by the server")
+            lines.append("# TYPE binance_used_weight gauge")
+            for network, weight in sorted(self.used_weight.items()):
+                lines.append(f'binance_used_weight{{network="{network}"}} {weight}')
+
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """Metrikleri Prometheus metin biçiminde dosyaya yazar"""
+        with open(path, "w") as f:
+            f.write(self.render_prometheus())
+
+    def start_http_server(self, port, host="127.0.0.1"):
+        """Metrikleri http://host:port/metrics adresinden sunar"""
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = registry.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+# Tüm istemcilerin paylaştığı ölçüm kaydı
+metrics = MetricsRegistry()
@@ -0,0 +1,254 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+# Tek istekte alınabilecek en fazla kayıt (allOrders / myTrades)
+PAGE_LIMIT = 1000
+
+# Sonradan durumu değişmeyecek emir durumları
+FINAL_ORDER_STATUSES = {"FILLED", "CANCELED", "REJECTED", "EXPIRED", "EXPIRED_IN_MATCH"}
+
+# İşlem yapılmış olabilecek sembolleri keşfederken denenecek kote varlıklar
+COMMON_QUOTE_ASSETS = ("USDT", "FDUSD", "USDC", "BTC", "ETH", "BNB", "TRY")
+
+# Bu süre içinde eşitlenmiş semboller tekrar istenmez (saniye)
+SYNC_TTL = 60
+
+# Emri bulunmayan aday semboller bu süre dolmadan tekrar denenmez (saniye)
+PROBE_TTL = 24 * 60 * 60
+
+# Depo dosyası, diğer uygulama dosyaları gibi başlangıç dizininde tutulur
+HISTORY_DB_PATH = os.path.join(os.path.abspath("."), "order_history.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    account TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    order_id INTEGER NOT NULL,
+    time INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (account, symbol, order_id)
+);
+CREATE INDEX IF NOT EXISTS orders_by_time ON orders (account, time);
+CREATE TABLE IF NOT EXISTS trades (
+    account TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    trade_id INTEGER NOT NULL,
+    order_id INTEGER NOT NULL,
+    time INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (account, symbol, trade_id)
+);
+CREATE INDEX IF NOT EXISTS trades_by_time ON trades (account, time);
+CREATE TABLE IF NOT EXISTS symbols (
+    account TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    PRIMARY KEY (account, symbol)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    account TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (account, symbol, kind)
+);
+"""
+
+
+class OrderHistoryStore:
+    """Hesapların emir ve işlem geçmişini tutan yerel SQLite deposu"""
+
+    def __init__(self, path=HISTORY_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+
+    def add_symbols(self, account, symbols):
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR IGNORE INTO symbols VALUES (?, ?)",
+                                 [(account, symbol) for symbol in symbols])
+
+    def get_symbols(self, account):
+        with self._lock:
+            rows = self._db.execute("SELECT symbol FROM symbols WHERE account = ?", (account,))
+            return [row[0] for row in rows]
+
+    def mark_synced(self, account, symbol, kind):
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?)",
+                             (account, symbol, kind, time.time()))
+
+    def synced_at(self, account, kind):
+        """Sembol -> son eşitleme zamanı"""
+        with self._lock:
+            rows = self._db.execute("SELECT symbol, synced_at FROM sync_state WHERE account = ? AND kind = ?",
+                                    (account, kind))
+            return dict(rows.fetchall())
+
+    def save_orders(self, account, orders):
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR REPLACE INTO orders VALUES (?, ?, ?, ?, ?, ?)", [
+                (account, order["symbol"], order["orderId"], order["time"], order["status"], json.dumps(order))
+                for order in orders
+            ])
+
+    def save_trades(self, account, trades):
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR REPLACE INTO trades VALUES (?, ?, ?, ?, ?, ?)", [
+                (account, trade["symbol"], trade["id"], trade["orderId"], trade["time"], json.dumps(trade))
+                for trade in trades
+            ])
+
+    def order_cursor(self, account, symbol):
+        """Sonraki allOrders isteğinin başlayacağı orderId.
+
+        Her zaman bilinen son emrin ötesinden devam edilir; açık kalan eski emirler imleci
+        geri çekmez, durumları ayrıca güncellenir (bkz. open_order_ids).
+        İmleç verilmezse Binance sadece en yeni emirleri döndürdüğü için ilk eşitleme 0'dan başlar.
+        """
+        with self._lock:
+            last = self._db.execute("SELECT MAX(order_id) FROM orders WHERE account = ? AND symbol = ?",
+                                    (account, symbol)).fetchone()[0]
+            return last + 1 if last is not None else 0
+
+    def open_order_ids(self, account, symbol):
+        """Depoda henüz kapanmamış görünen emirlerin ID'leri"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT order_id FROM orders WHERE account = ? AND symbol = ? AND status NOT IN (%s)"
+                % ",".join("?" * len(FINAL_ORDER_STATUSES)),
+                (account, symbol, *FINAL_ORDER_STATUSES))
+            return [row[0] for row in rows]
+
+    def trade_cursor(self, account, symbol):
+        """Sonraki myTrades isteğinin başlayacağı işlem ID'si"""
+        with self._lock:
+            last = self._db.execute("SELECT MAX(trade_id) FROM trades WHERE account = ? AND symbol = ?",
+                                    (account, symbol)).fetchone()[0]
+            return last + 1 if last is not None else 0
+
+    def get_orders(self, account, symbol=None, limit=50):
+        """En yeniden eskiye emirler"""
+        return self._query("orders", account, symbol, limit)
+
+    def get_trades(self, account, symbol=None, limit=50):
+        """En yeniden eskiye işlemler"""
+        return self._query("trades", account, symbol, limit)
+
+    def _query(self, table, account, symbol, limit):
+        sql = f"SELECT data FROM {table} WHERE account = ?"
+        params = [account]
+        if symbol:
+            sql += " AND symbol = ?"
+            params.append(symbol)
+        sql += " ORDER BY time DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return [json.loads(row[0]) for row in self._db.execute(sql, params)]
+
+
+class OrderHistorySync:
+    """Emir ve işlem geçmişini orderId/fromId imleçleriyle sayfalayarak depoya eşitler"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def discover_symbols(self, connector, account):
+        """Hesabın işlem yapmış olabileceği sembolleri bulur.
+
+        Binance bu listeyi vermediği için emri görülmüş semboller ve açık emirler kullanılır.
+        Bakiyedeki varlıkların yaygın kotelerle oluşturduğu adaylar sadece bir kez (emir
+        bulunmazsa PROBE_TTL sonra tekrar) denenir.
+        """
+        symbols = self.active_symbols(account, connector.get_open_orders())
+
+        probed = self.store.synced_at(account, "orders")
+        now = time.time()
+        balances = connector.cached_balances or connector.get_account_balance() or []
+        assets = {balance["asset"] for balance in balances}
+        quotes = assets | set(COMMON_QUOTE_ASSETS)
+        for symbol in connector.get_symbols():
+            if symbol in symbols or now - probed.get(symbol, 0) < PROBE_TTL:
+                continue
+            filters = connector.get_symbol_filters(symbol)
+            if filters and filters.base_asset in assets and filters.quote_asset in quotes:
+                symbols.add(symbol)
+        return sorted(symbols)
+
+    def active_symbols(self, account, open_orders):
+        """Emri görülmüş semboller ile açık emirlerin sembolleri"""
+        return set(self.store.get_symbols(account)) | {order["symbol"] for order in open_orders or []}
+
+    def sync(self, connector, account, symbols=None):
+        """Verilen (yoksa keşfedilen) sembollerin yeni emirlerini indirir.
+
+        İşlemler sadece işlem geçmişi görünümü için ayrıca eşitlenir (sync_trades).
+        """
+        if symbols is None:
+            symbols = self.discover_symbols(connector, account)
+
+        synced_at = self.store.synced_at(account, "orders")
+        now = time.time()
+        for symbol in symbols:
+            if now - synced_at.get(symbol, 0) < SYNC_TTL:
+                continue
+            try:
+                self.sync_orders(connector, account, symbol)
+            except Exception as e:
+                print(f"{account} {symbol} geçmişi eşitlenirken hata: {e}")
+
+    def sync_orders(self, connector, account, symbol):
+        # İmleç, aşağıda kaydedilen güncel açık emirlerden önce alınır ki aradaki emirler atlanmasın
+        cursor = self.store.order_cursor(account, symbol)
+
+        # Depoda açık görünen eski emirler: hâlâ açık olanlar tek istekle, kapananlar tek tek güncellenir
+        stale_ids = self.store.open_order_ids(account, symbol)
+        if stale_ids:
+            open_orders = connector.client.get_open_orders(symbol=symbol)
+            self.store.save_orders(account, open_orders)
+            still_open = {order["orderId"] for order in open_orders}
+            for order_id in stale_ids:
+                if order_id not in still_open:
+                    self.store.save_orders(account, [connector.client.get_order(symbol=symbol, orderId=order_id)])
+
+        while True:
+            params = {"symbol": symbol, "orderId": cursor, "limit": PAGE_LIMIT}
+            orders = connector.client.get_all_orders(**params)
+            if orders:
+                self.store.save_orders(account, orders)
+                self.store.add_symbols(account, [symbol])
+            if len(orders) < PAGE_LIMIT:
+                break
+            cursor = orders[-1]["orderId"] + 1
+        self.store.mark_synced(account, symbol, "orders")
+
+    def sync_trades(self, connector, account, symbol):
+        if time.time() - self.store.synced_at(account, "trades").get(symbol, 0) < SYNC_TTL:
+            return
+        cursor = self.store.trade_cursor(account, symbol)
+        while True:
+            params = {"symbol": symbol, "fromId": cursor, "limit": PAGE_LIMIT}
+            trades = connector.client.get_my_trades(**params)
+            if trades:
+                self.store.save_trades(account, trades)
+            if len(trades) < PAGE_LIMIT:
+                break
+            cursor = trades[-1]["id"] + 1
+        self.store.mark_synced(account, symbol, "trades")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_history_store():
+    """Süreç genelinde paylaşılan geçmiş deposu (ilk kullanımda açılır)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = OrderHistoryStore()
+        return _store
@@ -0,0 +1,117 @@
+import os
+import time
+from decimal import Decimal, InvalidOperation
+
+# Test emri modları: "parallel" test emirlerini gerçek dalgadan önce tüm hesaplarda
+# eşzamanlı gönderir, "skip" sadece yerel doğrulama yapar
+TEST_ORDER_PARALLEL = "parallel"
+TEST_ORDER_SKIP = "skip"
+TEST_ORDER_MODES = (TEST_ORDER_PARALLEL, TEST_ORDER_SKIP)
+DEFAULT_TEST_ORDER_MODE = os.environ.get("BINANCE_TEST_ORDER_MODE", TEST_ORDER_PARALLEL)
+if DEFAULT_TEST_ORDER_MODE not in TEST_ORDER_MODES:
+    DEFAULT_TEST_ORDER_MODE = TEST_ORDER_PARALLEL
+
+# Önbellekteki bakiyenin doğrulamada kullanılacağı en fazla yaş (saniye)
+BALANCE_MAX_AGE = 60.0
+
+
+def _decimal(value):
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def _is_multiple(value, step):
+    return step <= 0 or (value / step) == (value / step).to_integral_value()
+
+
+def percent_price_bounds(filters, side, reference_price):
+    """PERCENT_PRICE(_BY_SIDE) filtresine göre izin verilen fiyat aralığı; filtre yoksa None"""
+    for f in filters.raw_filters:
+        if f["filterType"] == "PERCENT_PRICE_BY_SIDE":
+            prefix = "bid" if side == "BUY" else "ask"
+            up = Decimal(f[f"{prefix}MultiplierUp"])
+            down = Decimal(f[f"{prefix}MultiplierDown"])
+            return reference_price * down, reference_price * up
+        if f["filterType"] == "PERCENT_PRICE":
+            return reference_price * Decimal(f["multiplierDown"]), reference_price * Decimal(f["multiplierUp"])
+    return None
+
+
+def free_balance(balances, asset):
+    for balance in balances:
+        if balance["asset"] == asset:
+            return Decimal(str(balance["free"]))
+    return Decimal("0")
+
+
+def validate_order(filters, params, balances=None, reference_price=None):
+    """Emri önbellekteki borsa filtreleri ve bakiyelerle yerelde doğrular.
+
+    create_test_order'ın yakaladığı hata sınıflarını (hassasiyet, min/max miktar,
+    min notional, fiyat bandı, yetersiz bakiye) kontrol eder; hata mesajları listesi döndürür.
+    """
+    errors = []
+    if filters is None:
+        return errors
+
+    if filters.status != "TRADING":
+        errors.append(f"{filters.symbol} işleme kapalı ({filters.status})")
+
+    quantity = _decimal(params.get("quantity"))
+    if quantity is None or quantity <= 0:
+        errors.append("Geçersiz miktar")
+        return errors
+
+    if not _is_multiple(quantity, filters.step_size):
+        errors.append(f"Miktar adımı hatalı (stepSize {filters.step_size.normalize()})")
+    if quantity < filters.min_qty:
+        errors.append(f"Miktar minimumun altında ({filters.min_qty.normalize()})")
+    if filters.max_qty > 0 and quantity > filters.max_qty:
+        errors.append(f"Miktar maksimumun üstünde ({filters.max_qty.normalize()})")
+
+    for key in ("price", "stopPrice"):
+        if key not in params:
+            continue
+        price = _decimal(params[key])
+        if price is None or price <= 0:
+            errors.append(f"Geçersiz {key}")
+            continue
+        if not _is_multiple(price, filters.tick_size):
+            errors.append(f"{key} adımı hatalı (tickSize {filters.tick_size.normalize()})")
+        if price < filters.min_price or (filters.max_price > 0 and price > filters.max_price):
+            errors.append(f"{key} izin verilen aralığın dışında")
+
+    # Notional ve bakiye için limit fiyatı, yoksa referans fiyat kullanılır
+    price = _decimal(params.get("price")) or _decimal(reference_price)
+    reference = _decimal(reference_price)
+
+    if price:
+        notional = quantity * price
+        if notional < filters.min_notional:
+            errors.append(f"Emir tutarı minimumun altında ({filters.min_notional.normalize()} "
+                          f"{filters.quote_asset})")
+
+    if "price" in params and reference:
+        bounds = percent_price_bounds(filters, params["side"], reference)
+        if bounds and not bounds[0] <= _decimal(params["price"]) <= bounds[1]:
+            errors.append("Fiyat, piyasa fiyatına göre izin verilen bandın dışında")
+
+    if balances is not None:
+        if params["side"] == "BUY":
+            if price and free_balance(balances, filters.quote_asset) < quantity * price:
+                errors.append(f"Yetersiz {filters.quote_asset} bakiyesi")
+        elif free_balance(balances, filters.base_asset) < quantity:
+            errors.append(f"Yetersiz {filters.base_asset} bakiyesi")
+
+    return errors
+
+
+def validate_with_connector(connector, params, balances=None):
+    """Connector'ın ortak filtre/fiyat önbellekleri ve son bakiyeleriyle doğrular"""
+    filters = connector.get_symbol_filters(params["symbol"])
+    if balances is None and time.time() - connector.balances_cached_at <= BALANCE_MAX_AGE:
+        balances = connector.cached_balances
+    reference_price = connector.get_price(params["symbol"])
+    return validate_order(filters, params, balances, reference_price)
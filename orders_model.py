@@ -0,0 +1,254 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QSortFilterProxyModel, QModelIndex
+from PyQt5.QtGui import QColor
+
+HEADERS = ["Select", "Account", "Symbol", "Side", "Type", "Quantity",
+           "Price", "Stop Price", "Status", "Order ID"]
+
+# Sütun indeksleri
+COL_SELECT, COL_ACCOUNT, COL_SYMBOL, COL_SIDE, COL_TYPE, COL_QTY, \
+    COL_PRICE, COL_STOP, COL_STATUS, COL_ORDER_ID = range(len(HEADERS))
+
+SIDE_COLORS = {"BUY": QColor("green"), "SELL": QColor("red")}
+STATUS_COLORS = {"NEW": QColor("blue"), "PARTIALLY_FILLED": QColor("orange")}
+
+
+class OpenOrdersTableModel(QAbstractTableModel):
+    """Tüm hesapların açık emirlerini sütun bazlı listelerde tutan tablo modeli"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.accounts = []
+        self.symbols = []
+        self.sides = []
+        self.types = []
+        self.quantities = []
+        self.prices = []
+        self.stop_prices = []
+        self.statuses = []
+        self.order_ids = []
+        self.checked = []
+        self._columns = [self.accounts, self.symbols, self.sides, self.types, self.quantities,
+                         self.prices, self.stop_prices, self.statuses, self.order_ids, self.checked]
+        self._rows = {}  # (account, orderId) -> satır
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.order_ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return None
+
+    def flags(self, index):
+        if index.column() == COL_SELECT:
+            return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+
+        if role == Qt.DisplayRole:
+            return self.display_text(row, column)
+        if role == Qt.UserRole:
+            # Proxy model sıralaması ham değerlerle yapılır
+            return self.sort_value(row, column)
+        if role == Qt.CheckStateRole and column == COL_SELECT:
+            return Qt.Checked if self.checked[row] else Qt.Unchecked
+        if role == Qt.ForegroundRole:
+            if column == COL_SIDE:
+                return SIDE_COLORS.get(self.sides[row])
+            if column == COL_STATUS:
+                return STATUS_COLORS.get(self.statuses[row])
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role == Qt.CheckStateRole and index.column() == COL_SELECT:
+            self.checked[index.row()] = value == Qt.Checked
+            self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+            return True
+        return False
+
+    def display_text(self, row, column):
+        if column == COL_ACCOUNT:
+            return self.accounts[row]
+        if column == COL_SYMBOL:
+            return self.symbols[row]
+        if column == COL_SIDE:
+            return self.sides[row]
+        if column == COL_TYPE:
+            return self.types[row]
+        if column == COL_QTY:
+            return f"{self.quantities[row]:.8f}"
+        if column == COL_PRICE:
+            return f"{self.prices[row]:.8f}" if self.prices[row] > 0 else "Market"
+        if column == COL_STOP:
+            return f"{self.stop_prices[row]:.8f}" if self.stop_prices[row] > 0 else "-"
+        if column == COL_STATUS:
+            return self.statuses[row]
+        if column == COL_ORDER_ID:
+            return str(self.order_ids[row])
+        return None
+
+    def sort_value(self, row, column):
+        if column == COL_SELECT:
+            return int(self.checked[row])
+        return self._columns[column - 1][row]
+
+    def set_account_orders(self, account_name, orders, symbol=None):
+        """Hesabın (sembol verilirse sadece o sembolün) emirlerini satır farklarıyla uygular"""
+        incoming = {(account_name, order["orderId"]): order for order in orders}
+
+        # Artık açık olmayan emirler kaldırılır
+        stale_rows = sorted((row for (account, order_id), row in self._rows.items()
+                             if account == account_name
+                             and (symbol is None or self.symbols[row] == symbol)
+                             and (account, order_id) not in incoming), reverse=True)
+        for row in stale_rows:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            for column in self._columns:
+                del column[row]
+            self.endRemoveRows()
+        if stale_rows:
+            self._reindex()
+
+        # Mevcut emirler yerinde güncellenir, yeniler sona eklenir
+        new_orders = []
+        for key, order in incoming.items():
+            row = self._rows.get(key)
+            if row is None:
+                new_orders.append(order)
+            elif self._write_row(row, account_name, order):
+                self.dataChanged.emit(self.index(row, COL_ACCOUNT), self.index(row, COL_ORDER_ID))
+
+        if new_orders:
+            first = len(self.order_ids)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_orders) - 1)
+            for order in new_orders:
+                for column in self._columns:
+                    column.append(None)
+                self.checked[-1] = False
+                self._write_row(len(self.order_ids) - 1, account_name, order)
+                self._rows[(account_name, order["orderId"])] = len(self.order_ids) - 1
+            self.endInsertRows()
+
+    def upsert_order(self, account_name, order):
+        """Tek emri günceller, tabloda yoksa sona ekler"""
+        key = (account_name, order["orderId"])
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self.order_ids)
+            self.beginInsertRows(QModelIndex(), row, row)
+            for column in self._columns:
+                column.append(None)
+            self.checked[-1] = False
+            self._write_row(row, account_name, order)
+            self._rows[key] = row
+            self.endInsertRows()
+        elif self._write_row(row, account_name, order):
+            self.dataChanged.emit(self.index(row, COL_ACCOUNT), self.index(row, COL_ORDER_ID))
+
+    def remove_order(self, account_name, order_id):
+        """Tek emrin satırını kaldırır"""
+        row = self._rows.get((account_name, order_id))
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        for column in self._columns:
+            del column[row]
+        self.endRemoveRows()
+        self._reindex()
+
+    def remove_account(self, account_name):
+        """Hesabın tüm emirlerini kaldırır"""
+        self.set_account_orders(account_name, [])
+
+    def _write_row(self, row, account_name, order):
+        """Satırın değerlerini yazar; değişiklik olduysa True döndürür"""
+        values = (
+            account_name,
+            order["symbol"],
+            order["side"],
+            order["type"],
+            float(order["origQty"]),
+            float(order.get("price") or 0),
+            float(order.get("stopPrice") or 0),
+            order["status"],
+            order["orderId"]
+        )
+        changed = False
+        for column, value in zip(self._columns, values):
+            if column[row] != value:
+                column[row] = value
+                changed = True
+        return changed
+
+    def _reindex(self):
+        self._rows = {(account, order_id): row
+                      for row, (account, order_id) in enumerate(zip(self.accounts, self.order_ids))}
+
+    def set_checked(self, rows, checked):
+        """Verilen kaynak satırların seçimini değiştirir"""
+        rows = list(rows)
+        if not rows:
+            return
+        for row in rows:
+            self.checked[row] = checked
+        self.dataChanged.emit(self.index(min(rows), COL_SELECT), self.index(max(rows), COL_SELECT),
+                              [Qt.CheckStateRole])
+
+    def checked_rows(self):
+        return [row for row, checked in enumerate(self.checked) if checked]
+
+    def order_counts(self):
+        """(hesap, sembol) başına tablodaki açık emir sayısı"""
+        counts = {}
+        for key in zip(self.accounts, self.symbols):
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def order_info(self, row):
+        """Satırı REST emir sözlüğü biçiminde döndürür"""
+        info = {
+            "orderId": str(self.order_ids[row]),
+            "symbol": self.symbols[row],
+            "side": self.sides[row],
+            "type": self.types[row],
+            "origQty": f"{self.quantities[row]:.8f}",
+            "price": f"{self.prices[row]:.8f}",
+            "status": self.statuses[row]
+        }
+        if self.stop_prices[row] > 0:
+            info["stopPrice"] = f"{self.stop_prices[row]:.8f}"
+        return info
+
+
+class OpenOrdersFilterProxyModel(QSortFilterProxyModel):
+    """Sembol ve hesap filtresini istemci tarafında uygular"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.symbol_filter = None
+        self.account_filter = None
+        self.setSortRole(Qt.UserRole)
+
+    def set_filters(self, symbol=None, account=None):
+        self.symbol_filter = symbol or None
+        self.account_filter = account or None
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        model = self.sourceModel()
+        if self.symbol_filter and model.symbols[source_row] != self.symbol_filter:
+            return False
+        if self.account_filter and model.accounts[source_row] != self.account_filter:
+            return False
+        return True
+
+    def source_rows(self):
+        """Filtreden geçen satırların kaynak indeksleri"""
+        return [self.mapToSource(self.index(row, 0)).row() for row in range(self.rowCount())]
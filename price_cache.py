@@ -0,0 +1,73 @@
+import time
+import threading
+
+# Fiyatların yeniden istenmeden kullanılabileceği en uzun süre (saniye)
+PRICE_MAX_AGE = 5.0
+
+
+class PriceCache:
+    """Testnet ve mainnet için ayrı tutulan, süreç genelinde ortak fiyat önbelleği"""
+
+    def __init__(self, max_age=PRICE_MAX_AGE):
+        self.max_age = max_age
+        self._prices = {}  # testnet -> {symbol: fiyat}
+        self._updated_at = {}  # testnet -> {symbol: zaman damgası}
+        self._refreshed_at = {}  # testnet -> son toplu yenileme zamanı
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def _is_fresh(self, testnet, max_age):
+        return time.time() - self._refreshed_at.get(testnet, 0) < max_age
+
+    def refresh(self, client, testnet):
+        """Tüm sembollerin fiyatını tek istekle yeniler"""
+        tickers = client.get_all_tickers()
+        now = time.time()
+        with self._lock:
+            prices = self._prices.setdefault(testnet, {})
+            updated_at = self._updated_at.setdefault(testnet, {})
+            for ticker in tickers:
+                prices[ticker["symbol"]] = float(ticker["price"])
+                updated_at[ticker["symbol"]] = now
+            self._refreshed_at[testnet] = now
+
+    def _ensure_fresh(self, client, testnet, max_age):
+        """Önbellek eskiyse tek bir thread yeniler, diğerleri sonucu bekler"""
+        if self._is_fresh(testnet, max_age) or client is None:
+            return
+
+        with self._refresh_lock:
+            if not self._is_fresh(testnet, max_age):
+                self.refresh(client, testnet)
+
+    def get_prices(self, client, testnet, max_age=None):
+        """Tüm fiyatları {sembol: fiyat} olarak döndürür"""
+        max_age = self.max_age if max_age is None else max_age
+        self._ensure_fresh(client, testnet, max_age)
+        with self._lock:
+            return dict(self._prices.get(testnet, {}))
+
+    def get_price(self, client, testnet, symbol, max_age=None):
+        """Tek bir sembolün fiyatını döndürür, yoksa None"""
+        max_age = self.max_age if max_age is None else max_age
+        with self._lock:
+            updated_at = self._updated_at.get(testnet, {}).get(symbol, 0)
+        if time.time() - updated_at >= max_age:
+            self._ensure_fresh(client, testnet, max_age)
+
+        with self._lock:
+            return self._prices.get(testnet, {}).get(symbol)
+
+    def update(self, testnet, prices):
+        """Dış kaynaktan (ör. WebSocket) gelen fiyatları önbelleğe yazar"""
+        now = time.time()
+        with self._lock:
+            cached = self._prices.setdefault(testnet, {})
+            updated_at = self._updated_at.setdefault(testnet, {})
+            for symbol, price in prices.items():
+                cached[symbol] = float(price)
+                updated_at[symbol] = now
+
+
+# Tüm connector'ların paylaştığı önbellek
+price_cache = PriceCache()
@@ -0,0 +1,213 @@
+import time
+import asyncio
+import threading
+
+# Binance spot REQUEST_WEIGHT limiti (IP başına, dakikada)
+REQUEST_WEIGHT_LIMIT = 6000
+
+# Hesap başına 10 saniyede verilebilecek emir sayısı
+ORDER_LIMIT_10S = 100
+
+# Sunucu limitine tam dayanmamak için kullanılan pay
+SAFETY_RATIO = 0.9
+
+# Uç nokta ağırlıkları: (method, path) -> ağırlık
+ENDPOINT_WEIGHTS = {
+    ("get", "ping"): 1,
+    ("get", "time"): 1,
+    ("get", "exchangeInfo"): 20,
+    ("get", "account"): 20,
+    ("get", "openOrders"): 6,
+    ("get", "allOrders"): 20,
+    ("get", "myTrades"): 20,
+    ("get", "order"): 4,
+    ("get", "ticker/price"): 2,
+    ("get", "ticker/24hr"): 2,
+    ("get", "ticker/bookTicker"): 2,
+    ("post", "order"): 1,
+    ("post", "order/test"): 1,
+    ("post", "order/cancelReplace"): 1,
+    ("post", "order/oco"): 1,
+    ("post", "orderList/oco"): 1,
+    ("delete", "order"): 1,
+    ("delete", "openOrders"): 1,
+    ("post", "userDataStream"): 2,
+    ("put", "userDataStream"): 2,
+    ("delete", "userDataStream"): 2,
+}
+
+# Sembol verilmediğinde tüm piyasayı döndüren uç noktaların ağırlıkları
+ALL_SYMBOLS_WEIGHTS = {
+    ("get", "openOrders"): 80,
+    ("get", "ticker/price"): 4,
+    ("get", "ticker/24hr"): 80,
+    ("get", "ticker/bookTicker"): 4,
+}
+
+# Emir sayısı limitine dahil olan uç noktalar
+ORDER_ENDPOINTS = {
+    ("post", "order"),
+    ("post", "order/cancelReplace"),
+    ("post", "order/oco"),
+    ("post", "orderList/oco"),
+}
+
+
+def endpoint_path(path):
+    """'/api/v3/order/test' -> 'order/test'"""
+    for prefix in ("/api/v3/", "/api/v1/"):
+        if path.startswith(prefix):
+            return path[len(prefix):]
+    return path.lstrip("/")
+
+
+def endpoint_weight(method, path, params=None):
+    """Bir isteğin ağırlığını ve emir limitine dahil olup olmadığını döndürür"""
+    key = (method.lower(), endpoint_path(path))
+    if key in ALL_SYMBOLS_WEIGHTS and not (params or {}).get("symbol"):
+        weight = ALL_SYMBOLS_WEIGHTS[key]
+    else:
+        weight = ENDPOINT_WEIGHTS.get(key, 1)
+    return weight, key in ORDER_ENDPOINTS
+
+
+class RateLimitBanned(Exception):
+    """418 IP yasağı sürerken istek gönderilmeden hata verilir"""
+
+
+class TokenBucket:
+    """Belirli bir pencerede dolan basit token kovası"""
+
+    def __init__(self, capacity, window_seconds):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / window_seconds
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount):
+        """amount kadar token için beklenmesi gereken süre"""
+        if self.tokens >= amount:
+            return 0.0
+        return (min(amount, self.capacity) - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Aynı IP'yi kullanan tüm istemcilerin paylaştığı ağırlık ve emir limitleyicisi"""
+
+    def __init__(self, weight_limit=REQUEST_WEIGHT_LIMIT, order_limit=ORDER_LIMIT_10S,
+                 safety_ratio=SAFETY_RATIO):
+        self.weight_limit = weight_limit
+        self.order_limit = order_limit
+        self.weight_bucket = TokenBucket(weight_limit * safety_ratio, 60)
+        self.order_buckets = {}  # api_key -> TokenBucket
+        self.safety_ratio = safety_ratio
+        self.server_used_weight = 0
+        self.blocked_until = 0.0
+        self.banned_until = 0.0
+        self._lock = threading.Lock()
+
+    def _order_bucket(self, account_key):
+        bucket = self.order_buckets.get(account_key)
+        if bucket is None:
+            bucket = TokenBucket(self.order_limit * self.safety_ratio, 10)
+            self.order_buckets[account_key] = bucket
+        return bucket
+
+    def try_acquire(self, weight, account_key=None, is_order=False):
+        """Kota varsa ayırıp 0 döndürür, yoksa beklenmesi gereken süreyi döndürür.
+
+        418 yasağı sürerken beklemek yerine RateLimitBanned fırlatır.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.banned_until > now:
+                raise RateLimitBanned(f"IP yasaklı, {self.banned_until - now:.0f} sn kaldı")
+            self.weight_bucket.refill(now)
+            wait = max(self.blocked_until - now, self.weight_bucket.wait_time(weight))
+
+            order_bucket = None
+            if is_order and account_key:
+                order_bucket = self._order_bucket(account_key)
+                order_bucket.refill(now)
+                wait = max(wait, order_bucket.wait_time(1))
+
+            if wait <= 0:
+                self.weight_bucket.tokens -= weight
+                if order_bucket is not None:
+                    order_bucket.tokens -= 1
+                return 0.0
+            return wait
+
+    def acquire(self, weight, account_key=None, is_order=False):
+        """Yeterli kota olana kadar bekler; hata fırlatmaz. Beklenen süreyi döndürür."""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(weight, account_key, is_order)
+            if wait <= 0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, weight, account_key=None, is_order=False):
+        """acquire ile aynı, event loop'u bloklamadan bekler"""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(weight, account_key, is_order)
+            if wait <= 0:
+                return waited
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def sync_headers(self, headers, account_key=None):
+        """Sunucunun X-MBX-USED-WEIGHT ve emir sayısı başlıklarıyla yerel kotayı eşitler"""
+        if not headers:
+            return
+
+        used_weight = headers.get("x-mbx-used-weight-1m") or headers.get("X-MBX-USED-WEIGHT-1M")
+        order_count = headers.get("x-mbx-order-count-10s") or headers.get("X-MBX-ORDER-COUNT-10S")
+
+        with self._lock:
+            now = time.monotonic()
+            if used_weight is not None:
+                self.server_used_weight = int(used_weight)
+                self.weight_bucket.refill(now)
+                remaining = self.weight_bucket.capacity - self.server_used_weight
+                self.weight_bucket.tokens = min(self.weight_bucket.tokens, remaining)
+
+            if order_count is not None and account_key:
+                bucket = self._order_bucket(account_key)
+                bucket.refill(now)
+                bucket.tokens = min(bucket.tokens, bucket.capacity - int(order_count))
+
+    def block(self, seconds, banned=False):
+        """429/418 sonrası Retry-After süresince tüm istekleri bekletir (418'de hemen hata verdirir)"""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            if banned:
+                self.banned_until = max(self.banned_until, time.monotonic() + seconds)
+
+    def headroom(self):
+        """Arayüzde gösterilecek kalan kota bilgisi"""
+        with self._lock:
+            now = time.monotonic()
+            self.weight_bucket.refill(now)
+            return {
+                "weight_limit": self.weight_limit,
+                "weight_capacity": int(self.weight_bucket.capacity),
+                "weight_available": max(0, int(self.weight_bucket.tokens)),
+                "server_used_weight": self.server_used_weight,
+                "headroom_ratio": max(0.0, self.weight_bucket.tokens / self.weight_bucket.capacity),
+                "blocked_for": max(0.0, self.blocked_until - now)
+            }
+
+
+# Testnet ve mainnet farklı sunuculardır, limitleri ayrı tutulur
+rate_limiters = {True: RateLimiter(), False: RateLimiter()}
+
+
+def get_rate_limiter(testnet):
+    return rate_limiters[bool(testnet)]
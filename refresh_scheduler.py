@@ -0,0 +1,152 @@
+import time
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtWidgets import QApplication
+from rate_limiter import get_rate_limiter
+
+# Zamanlayıcının vadesi gelen widget'ları kontrol etme aralığı (milisaniye)
+TICK_INTERVAL_MS = 1000
+
+# Kullanıcının çalışmadığı görünür paneller için yenileme aralığı (saniye)
+BASE_INTERVAL = 300.0
+
+# Odaktaki panelin açık sekmesi için yenileme aralığı (saniye)
+ACTIVE_INTERVAL = 30.0
+
+# Hesaplar arasındaki kaydırma; yenilemeler aynı saniyeye yığılmaz (saniye)
+STAGGER = 5.0
+
+# Art arda hatalarda yenileme aralığı en fazla bu kadar uzar (saniye)
+MAX_BACKOFF = 1800.0
+
+# Kalan ağırlık oranı bunun altındayken sadece odaktaki panel yenilenir
+LOW_HEADROOM = 0.25
+PRESSURE_DELAY = 30.0
+
+# Bir tikte başlatılabilecek en fazla yenileme (gecikmiş paneller kademeli yenilenir)
+MAX_STARTS_PER_TICK = 1
+
+
+class RefreshScheduler(QObject):
+    """Hesap widget'larının periyodik yenilemelerini tek zamanlayıcıdan yönetir.
+
+    Hesaplar kademeli zamanlanır, görünmeyen widget'lar atlanır ve odaktaki panel daha sık
+    yenilenir. Hatalarda ve API kotası baskısında yenilemeler ertelenir. Yenilemeler widget'ın
+    arka plan işleri (workers.Job) olarak çalışır, sonuçları widget kendisi uygular.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.entries = {}  # widget -> {"due", "failures", "job"}
+        self.active_widget = None
+        self.paused = False
+        self.slots = 0
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.tick)
+        self.timer.start(TICK_INTERVAL_MS)
+
+        app = QApplication.instance()
+        if app is not None:
+            app.focusChanged.connect(self.on_focus_changed)
+
+    def register(self, widget):
+        """Widget'ı zamanlamaya ekler; ilk yenileme hesabın kaydırma payı kadar gecikir"""
+        offset = (self.slots * STAGGER) % BASE_INTERVAL
+        self.slots += 1
+        self.entries[widget] = {
+            "due": time.monotonic() + BASE_INTERVAL + offset,
+            "failures": 0,
+            "job": None
+        }
+
+    def unregister(self, widget):
+        """Widget'ı zamanlamadan çıkarır"""
+        self.entries.pop(widget, None)
+        if self.active_widget is widget:
+            self.active_widget = None
+
+    def set_paused(self, paused):
+        """Hesaplar görünümü gizliyken (ör. admin paneli) yenilemeleri durdurur"""
+        self.paused = paused
+
+    def refresh_now(self, widget):
+        """Widget'ı bir sonraki tikte yenilenmek üzere öne alır"""
+        entry = self.entries.get(widget)
+        if entry is not None:
+            entry["due"] = time.monotonic()
+
+    def interval(self, widget):
+        return ACTIVE_INTERVAL if widget is self.active_widget else BASE_INTERVAL
+
+    def on_focus_changed(self, old, new):
+        """Odağı alan paneli aktif kabul eder ve yenilemesini hızlı aralığa çeker"""
+        if new is None:
+            return
+        for widget, entry in self.entries.items():
+            if widget is new or widget.isAncestorOf(new):
+                if self.active_widget is not widget:
+                    self.active_widget = widget
+                    entry["due"] = min(entry["due"], time.monotonic() + ACTIVE_INTERVAL)
+                return
+
+    def tick(self):
+        if self.paused:
+            return
+
+        now = time.monotonic()
+        started = 0
+        for widget, entry in sorted(self.entries.items(), key=lambda item: item[1]["due"]):
+            if started >= MAX_STARTS_PER_TICK or entry["due"] > now:
+                break
+            if entry["job"] is not None:
+                continue
+
+            # Gizli veya küçültülmüş paneller vadesi geçmiş olarak bekler, görünür olunca yenilenir
+            if not widget.isVisible() or widget.window().isMinimized() or not widget.is_connected():
+                continue
+
+            headroom = get_rate_limiter(widget.testnet).headroom()
+            if headroom["blocked_for"] > 0:
+                entry["due"] = now + headroom["blocked_for"] + STAGGER
+                continue
+            if headroom["headroom_ratio"] < LOW_HEADROOM and widget is not self.active_widget:
+                entry["due"] = now + PRESSURE_DELAY
+                continue
+
+            # Elle başlatılan yenileme aynı işi geçersiz kılarsa sıradaki vade yine normal aralıktır
+            entry["due"] = now + self.interval(widget)
+            job = widget.refresh_job()
+            if job is None:
+                continue
+
+            self.watch(widget, entry, job)
+            started += 1
+
+    def watch(self, widget, entry, job):
+        entry["job"] = job
+        job.succeeded.connect(lambda result: self.on_fetched(widget, result))
+        job.failed.connect(lambda error: self.on_failed(widget, str(error)))
+        job.finished.connect(lambda: self.on_job_finished(widget, job))
+
+    def on_fetched(self, widget, result):
+        # Connector metotları hata durumunda None döndürür
+        if result is None:
+            self.on_failed(widget, "Veri alınamadı")
+            return
+        entry = self.entries.get(widget)
+        if entry is not None:
+            entry["failures"] = 0
+
+    def on_failed(self, widget, message):
+        entry = self.entries.get(widget)
+        if entry is None:
+            return
+        entry["failures"] += 1
+        delay = min(self.interval(widget) * 2 ** entry["failures"], MAX_BACKOFF)
+        entry["due"] = time.monotonic() + delay
+        print(f"{widget.account_name} yenilenemedi ({message}), {delay:.0f} sn sonra tekrar denenecek")
+
+    def on_job_finished(self, widget, job):
+        entry = self.entries.get(widget)
+        if entry is not None and entry["job"] is job:
+            entry["job"] = None
@@ -0,0 +1,117 @@
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import threading
+import pytest
+
+pytest.importorskip("PyQt5")
+websockets = pytest.importorskip("websockets")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QCoreApplication
+from market_stream import StreamWorker
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+class LocalServer:
+    """Testler için yerel WebSocket sunucusu (Binance akışının yerine)"""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.port = None
+        self.loop = asyncio.new_event_loop()
+        self.ready = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self.serve())
+
+    async def serve(self):
+        self.closed = asyncio.Event()
+        async with websockets.serve(self.handler, "127.0.0.1", 0) as server:
+            self.port = server.sockets[0].getsockname()[1]
+            self.ready.set()
+            await self.closed.wait()
+
+    async def handler(self, websocket, *args):
+        for message in self.messages:
+            await websocket.send(json.dumps(message))
+        await self.closed.wait()
+
+    def __enter__(self):
+        self.thread.start()
+        self.ready.wait(5)
+        return self
+
+    def __exit__(self, *exc):
+        self.loop.call_soon_threadsafe(self.closed.set)
+        self.thread.join(5)
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.port}"
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_worker_receives_messages_and_stops(app):
+    received = []
+    with LocalServer([{"s": "BTCUSDT"}, {"s": "ETHUSDT"}]) as server:
+        worker = StreamWorker(server.url, received.append)
+        worker.start()
+        assert wait_until(lambda: len(received) == 2)
+
+        worker.stop()
+        assert worker.wait(2000)
+
+    assert received == [{"s": "BTCUSDT"}, {"s": "ETHUSDT"}]
+
+
+def test_stop_during_handshake(app):
+    # TCP bağlantısını kabul edip hiç yanıt vermeyen soket; el sıkışma tamamlanmaz
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        worker = StreamWorker(f"ws://127.0.0.1:{listener.getsockname()[1]}", lambda message: None)
+        worker.start()
+        time.sleep(0.2)
+
+        started = time.monotonic()
+        worker.stop()
+        assert worker.wait(2000)
+        assert time.monotonic() - started < 2
+
+
+def test_stop_during_reconnect_backoff(app):
+    # Kapalı port: bağlantı hemen düşer ve worker yeniden bağlanmak için bekler
+    worker = StreamWorker("ws://127.0.0.1:9", lambda message: None)
+    worker.start()
+    time.sleep(0.3)
+
+    started = time.monotonic()
+    worker.stop()
+    assert worker.wait(2000)
+    assert time.monotonic() - started < 2
+
+
+def test_stop_before_run(app):
+    worker = StreamWorker("ws://127.0.0.1:9", lambda message: None)
+    worker.start()
+    worker.stop()
+    assert worker.wait(2000)
@@ -2,20 +2,42 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout,
                            QPushButton, QLabel, QTableWidget,
                            QTableWidgetItem, QTabWidget, QGroupBox,
                            QFormLayout, QComboBox, QLineEdit, QMessageBox, QCheckBox)
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from binance_api import BinanceConnector
+from valuation import get_valuation_engine
+from order_validator import validate_with_connector, TEST_ORDER_PARALLEL, DEFAULT_TEST_ORDER_MODE
+from workers import JobRunner, sync_pool
 from binance.exceptions import BinanceAPIException
 from datetime import datetime
 
+# Sekmeden çıkıldığında bekleyen sonucu artık gösterilmeyecek işler
+TAB_JOB_KEYS = {2: ("history",), 3: ("ticker", "trades")}
+
 class AccountWidget(QWidget):
+    symbols_changed = pyqtSignal()  # canlı fiyat akışında izlenecek semboller değişti
+    account_connected = pyqtSignal()  # arka plandaki bağlantı başarıyla kuruldu
+
     def __init__(self, account_name, account_data, parent=None):
         super().__init__(parent)
         self.account_name = account_name
         self.api_key = account_data["api_key"]
         self.api_secret = account_data["api_secret"]
         self.testnet = account_data.get("testnet", True)  # Varsayılan olarak testnet
-        self.connector = BinanceConnector(self.api_key, self.api_secret, testnet=self.testnet)
+        self.connector = BinanceConnector(self.api_key, self.api_secret, testnet=self.testnet,
+                                          account_name=account_name)
+        self.last_balances = []
+        self.live_quotes = {}  # akıştan gelen son sembol verileri
+        self.user_stream = None  # canlı hesap güncellemeleri açıkken UserDataStream
+        self.valuation = get_valuation_engine(self.testnet)
+        self.jobs = JobRunner(self)  # REST çağrıları GUI thread'i dışında çalışır
+        # Henüz yüklenmemiş (veya yüklemesi sekme değişiminde iptal edilmiş) sekmeler;
+        # geçmiş ve işlem sekmeleri ilk açıldıklarında yüklenir
+        self.stale_tabs = {2, 3}
         self.init_ui()
+
+        # Panel hemen yer tutucularla gösterilir, veriler bağlantıdan sonra kademeli gelir
+        self.show_placeholder(self.balance_table, "Loading...")
+        self.show_placeholder(self.orders_table, "Loading...")
         self.connect_account()
 
     def init_ui(self):
@@ -39,7 +61,7 @@ class AccountWidget(QWidget):
         balance_layout = QVBoxLayout()
 
         # Toplam değer etiketi
-        self.total_value_label = QLabel("Total Value: $0.00")
+        self.total_value_label = QLabel("Total Value: -")
         self.total_value_label.setStyleSheet("font-size: 14px; font-weight: bold; color: green;")
         balance_layout.addWidget(self.total_value_label)
 
@@ -117,6 +139,7 @@ class AccountWidget(QWidget):
         # Sembol seçici
         self.symbol_combo = QComboBox()
         self.symbol_combo.setEditable(True)  # Kullanıcı manuel girebilir
+        self.symbol_combo.currentTextChanged.connect(self.on_symbol_changed)
         trade_form_layout.addRow("Symbol:", self.symbol_combo)
 
         # Emir tipi
@@ -209,23 +232,53 @@ class AccountWidget(QWidget):
         layout.addWidget(self.tabs)
         self.setLayout(layout)
 
-        # Otomatik yenileme için zamanlayıcı
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.refresh_data)
-        self.timer.start(300000)  # Her 5 dakikada bir yenile
+        self.current_tab = self.tabs.currentIndex()
+        self.tabs.currentChanged.connect(self.on_tab_changed)
 
     def connect_account(self):
-        """Hesaba bağlan"""
-        if self.connector.connect():
+        """Hesaba arka planda bağlan; panel bağlantıyı beklemeden gösterilir"""
+        self.status_label.setText("Connecting...")
+        return self.jobs.submit("connect", self.connector.connect, on_result=self.on_connected,
+                                on_error=lambda error: self.on_connected(False))
+
+    def on_connected(self, connected):
+        if connected:
+            self.account_connected.emit()
             self.status_label.setText("Connected")
             self.status_label.setStyleSheet("color: green;")
-            self.update_balance()
-            self.update_orders()
-            self.update_order_history()  # Ayrıca emir geçmişini güncelle
             self.load_symbols()  # Sembolleri yükle
+            self.hydrate()
         else:
             self.status_label.setText("Connection Error")
             self.status_label.setStyleSheet("color: red;")
+            self.show_placeholder(self.balance_table, "Connection error")
+            self.show_placeholder(self.orders_table, "Connection error")
+
+    def hydrate(self):
+        """Paneli sırayla doldurur: önce bakiye, ardından açık emirler, sonra açık sekme"""
+        # Bağlantı testindeki hesap yanıtının bakiyeleri kullanılır, ikinci get_account yapılmaz
+        job = self.jobs.submit("balance", self.fetch_balance, True, on_result=self.apply_balance,
+                               on_error=lambda error: print(f"Bakiye alma hatası: {error}"))
+        job.finished.connect(self.hydrate_orders)
+
+    def hydrate_orders(self):
+        job = self.update_orders()
+        job.finished.connect(lambda: self.load_tab(self.tabs.currentIndex()))
+
+    def load_tab(self, index):
+        """Sekme henüz yüklenmediyse yer tutucu gösterip yükler"""
+        if index not in self.stale_tabs or not self.connector.connected:
+            return
+        if index == 2:
+            self.show_placeholder(self.history_table, "Loading...")
+        elif index == 3:
+            self.show_placeholder(self.trade_history_table, "Loading...")
+        self.refresh_tab(index)
+
+    def show_placeholder(self, table, text):
+        """Veri gelene kadar tabloda tek satırlık durum mesajı gösterir"""
+        table.setRowCount(1)
+        table.setItem(0, 0, QTableWidgetItem(text))
 
     def load_symbols(self):
         """Tüm sembolleri yükle"""
@@ -246,178 +299,307 @@ class AccountWidget(QWidget):
 
     def load_all_symbols(self):
         """Tüm sembolleri arka planda yükle"""
-        try:
-            exchange_info = self.connector.client.get_exchange_info()
-            all_symbols = [symbol['symbol'] for symbol in exchange_info['symbols']
-                          if symbol['symbol'].endswith('USDT')]  # Sadece USDT çiftleri
+        # Ortak borsa bilgisi önbelleğinden sadece USDT çiftleri
+        return self.jobs.submit("symbols", self.connector.get_symbols, quote_asset='USDT',
+                                on_result=self.add_symbols,
+                                on_error=lambda error: print(f"Tüm sembolleri yükleme hatası: {error}"))
 
-            # Henüz eklenmemiş sembolleri ekle
-            current_symbols = [self.symbol_combo.itemText(i) for i in range(self.symbol_combo.count())]
-            new_symbols = [s for s in all_symbols if s not in current_symbols]
+    def add_symbols(self, all_symbols):
+        """Henüz eklenmemiş sembolleri ekle"""
+        current_symbols = {self.symbol_combo.itemText(i) for i in range(self.symbol_combo.count())}
+        new_symbols = [s for s in all_symbols if s not in current_symbols]
 
-            self.symbol_combo.addItems(new_symbols)
-            print(f"Toplam {len(all_symbols)} sembol yüklendi")
-        except Exception as e:
-            print(f"Tüm sembolleri yükleme hatası: {e}")
+        self.symbol_combo.addItems(new_symbols)
+        print(f"Toplam {len(all_symbols)} sembol yüklendi")
 
     def update_balance(self):
         """Bakiye bilgilerini güncelle ve toplam değeri hesapla"""
         print("Bakiye güncelleniyor...")
-        balances = self.connector.get_account_balance()
+        return self.jobs.submit("balance", self.fetch_balance, on_result=self.apply_balance,
+                                on_error=lambda error: print(f"Bakiye alma hatası: {error}"))
+
+    def fetch_balance(self, cached=False):
+        """Bakiyeleri ve değerleme fiyatlarını çeker (GUI thread'i dışında da çalışabilir).
+
+        cached verilirse connector'da saklanan son bakiyeler varsa yeniden istenmez.
+        """
+        balances = self.connector.cached_balances if cached else None
+        if balances is None:
+            balances = self.connector.get_account_balance()
         if not balances:
-            print("Bakiye verisi alınamadı")
-            return
+            return None
 
-        # Tüm fiyatları bir seferde al
+        # Değerleme grafiği ve fiyatlar ortak önbelleklerden tek seferde güncellenir
         try:
-            print("Fiyat bilgileri alınıyor...")
-            all_prices = {ticker['symbol']: float(ticker['price'])
-                         for ticker in self.connector.client.get_all_tickers()}
-            print(f"{len(all_prices)} fiyat girişi alındı")
+            self.valuation.refresh(self.connector)
         except Exception as e:
             print(f"Fiyat bilgilerini alma hatası: {e}")
-            all_prices = {}
+        return balances
+
+    def apply_balance(self, balances):
+        """Çekilen bakiyeleri göster"""
+        if not balances:
+            print("Bakiye verisi alınamadı")
+            if not self.last_balances:
+                self.show_placeholder(self.balance_table, "No balance data")
+            return
 
-        # Toplam değeri hesaplamak için
-        total_value_usd = 0.0
+        self.last_balances = balances
+        self.symbols_changed.emit()
+        self.render_balances(balances)
+        print("Bakiye güncellendi")
+
+    def render_balances(self, balances):
+        """Bakiye tablosunu değerleme motorundaki USD fiyatlarıyla doldurur"""
+        total_value_usd = self.valuation.set_holdings(self.account_name, balances)
+        values, _ = self.valuation.get_values(self.account_name)
 
         self.balance_table.setRowCount(0)
-        print("Bakiye tablosu güncelleniyor...")
-        row_index = 0
         for balance in balances:
-            asset = balance['asset']
-            free = float(balance['free'])
-            locked = float(balance['locked'])
-            total = free + locked
-
             # Sıfır olmayan bakiyeleri göster
-            if total > 0:
-                self.balance_table.insertRow(row_index)
-                self.balance_table.setItem(row_index, 0, QTableWidgetItem(asset))
-                self.balance_table.setItem(row_index, 1, QTableWidgetItem(f"{free:.8f}"))
-                self.balance_table.setItem(row_index, 2, QTableWidgetItem(f"{locked:.8f}"))
-
-                # USD değerini hesapla
-                value_usd = 0
-                if asset == 'USDT':
-                    value_usd = total
-                else:
-                    symbol = f"{asset}USDT"
-                    if symbol in all_prices:
-                        price = all_prices[symbol]
-                        value_usd = total * price
-
-                if value_usd > 0:
-                    total_value_usd += value_usd
-                    self.balance_table.setItem(row_index, 3, QTableWidgetItem(f"${value_usd:.2f}"))
-                else:
-                    self.balance_table.setItem(row_index, 3, QTableWidgetItem("N/A"))
-
-                row_index += 1
+            if float(balance['free']) + float(balance['locked']) > 0:
+                self.set_balance_row(self.balance_table.rowCount(), balance, values, insert=True)
 
         # Toplam değeri göster
         if total_value_usd > 0:
             self.total_value_label.setText(f"Total Value: ${total_value_usd:.2f}")
 
-        print("Bakiye güncellendi")
+    def set_balance_row(self, row, balance, values, insert=False):
+        """Tek bir bakiye satırını yaz"""
+        if insert:
+            self.balance_table.insertRow(row)
+        self.balance_table.setItem(row, 0, QTableWidgetItem(balance['asset']))
+        self.balance_table.setItem(row, 1, QTableWidgetItem(f"{float(balance['free']):.8f}"))
+        self.balance_table.setItem(row, 2, QTableWidgetItem(f"{float(balance['locked']):.8f}"))
+
+        # USD değeri en kısa dönüşüm yoluyla bulunur (ör. XYZ -> BTC -> USDT)
+        value_usd = values.get(balance['asset'])
+        self.balance_table.setItem(row, 3, QTableWidgetItem(f"${value_usd:.2f}" if value_usd else "N/A"))
+
+    def find_balance_row(self, asset):
+        """Varlığın bakiye tablosundaki satırını bul, yoksa -1"""
+        for row in range(self.balance_table.rowCount()):
+            item = self.balance_table.item(row, 0)
+            if item is not None and item.text() == asset:
+                return row
+        return -1
+
+    def stream_symbols(self):
+        """Canlı fiyat akışında izlenmesi gereken semboller"""
+        symbols = {symbol for balance in self.last_balances
+                   for symbol in self.valuation.path_symbols(balance['asset'])}
+        current_symbol = self.symbol_combo.currentText().strip()
+        if current_symbol:
+            symbols.add(current_symbol)
+        return symbols
+
+    def on_prices_updated(self, updates):
+        """Akıştan gelen fiyatlarla sembol bilgisini ve bakiye değerlerini güncelle"""
+        for symbol, update in updates.items():
+            self.live_quotes.setdefault(symbol, {}).update(update)
+
+        symbol = self.symbol_combo.currentText()
+        quote = self.live_quotes.get(symbol)
+        if symbol in updates and quote and "price" in quote:
+            self.price_info_label.setText(
+                f"Symbol: {symbol}\n"
+                f"Current Price: {quote['price']}\n"
+                f"24h Change: {quote['change']:.2f}%\n"
+                f"24h High: {quote['high']}\n"
+                f"24h Low: {quote['low']}\n"
+                f"Bid / Ask: {quote.get('bid', 'N/A')} / {quote.get('ask', 'N/A')}\n"
+            )
+
+        # Bakiyeler REST çağrısı yapılmadan, sadece fiyatı değişen varlıklar için yeniden değerlenir
+        changed = self.valuation.apply_prices({symbol: update["price"] for symbol, update in updates.items()
+                                               if "price" in update})
+        if any(balance['asset'] in changed for balance in self.last_balances):
+            self.render_balances(self.last_balances)
 
     def update_orders(self):
         """Açık emir bilgilerini güncelle"""
-        orders = self.connector.get_open_orders()
-        if not orders:
-            self.orders_table.setRowCount(0)
-            return
+        return self.jobs.submit("orders", self.connector.get_open_orders, on_result=self.on_orders_loaded,
+                                on_error=lambda error: print(f"Açık emirler alınırken hata: {error}"))
 
+    def on_orders_loaded(self, orders):
+        # Hata durumunda (None) tablodaki son emirler korunur
+        if orders is not None:
+            self.render_orders(orders)
+
+    def render_orders(self, orders):
+        """Açık emirler tablosunu verilen emirlerle doldur"""
         self.orders_table.setRowCount(0)
-        for i, order in enumerate(orders):
-            self.orders_table.insertRow(i)
-            self.orders_table.setItem(i, 0, QTableWidgetItem(order['symbol']))
-            self.orders_table.setItem(i, 1, QTableWidgetItem(order['side']))
-            self.orders_table.setItem(i, 2, QTableWidgetItem(str(order['origQty'])))
-            self.orders_table.setItem(i, 3, QTableWidgetItem(str(order['price'])))
-            self.orders_table.setItem(i, 4, QTableWidgetItem(order['status']))
-
-            # Her satır için iptal butonu ekle
-            cancel_btn = QPushButton("Cancel")
-            cancel_btn.setProperty("order_id", order['orderId'])
-            cancel_btn.setProperty("symbol", order['symbol'])
-            cancel_btn.clicked.connect(self.cancel_selected_order)
-            self.orders_table.setCellWidget(i, 5, cancel_btn)
 
         # Tablo başlıklarını güncelle (iptal butonu için sütun ekle)
         self.orders_table.setColumnCount(6)
         self.orders_table.setHorizontalHeaderLabels(["Symbol", "Side", "Quantity", "Price", "Status", "Action"])
 
-    def update_order_history(self):
-        """Emir geçmişi bilgilerini güncelle"""
-        try:
-            # Filtreler
-            selected_symbol = self.history_symbol_combo.currentText()
-            symbol = None if selected_symbol == "All Symbols" else selected_symbol
+        for order in orders:
+            self.set_order_row(self.orders_table.rowCount(), order, insert=True)
+
+    def set_order_row(self, row, order, insert=False):
+        """Tek bir açık emir satırını yaz"""
+        if insert:
+            self.orders_table.insertRow(row)
+        self.orders_table.setItem(row, 0, QTableWidgetItem(order['symbol']))
+        self.orders_table.setItem(row, 1, QTableWidgetItem(order['side']))
+        self.orders_table.setItem(row, 2, QTableWidgetItem(str(order['origQty'])))
+        self.orders_table.setItem(row, 3, QTableWidgetItem(str(order['price'])))
+        self.orders_table.setItem(row, 4, QTableWidgetItem(order['status']))
+
+        # Her satır için iptal butonu ekle
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.setProperty("order_id", order['orderId'])
+        cancel_btn.setProperty("symbol", order['symbol'])
+        cancel_btn.clicked.connect(self.cancel_selected_order)
+        self.orders_table.setCellWidget(row, 5, cancel_btn)
+
+    def find_order_row(self, order_id):
+        """Emir ID'sine göre tablo satırını bul, yoksa -1"""
+        for row in range(self.orders_table.rowCount()):
+            button = self.orders_table.cellWidget(row, 5)
+            if button is not None and button.property("order_id") == order_id:
+                return row
+        return -1
+
+    def attach_user_stream(self, stream):
+        """Bakiye ve açık emirleri user-data akışından artımlı güncelle"""
+        self.user_stream = stream
+        stream.snapshot_loaded.connect(self.on_stream_snapshot)
+        stream.balances_changed.connect(self.on_stream_balances)
+        stream.order_changed.connect(self.on_stream_order)
+
+    def detach_user_stream(self):
+        """Akış bağlantısını kaldır, REST yoklamasına geri dön"""
+        if self.user_stream is not None:
+            self.user_stream.snapshot_loaded.disconnect(self.on_stream_snapshot)
+            self.user_stream.balances_changed.disconnect(self.on_stream_balances)
+            self.user_stream.order_changed.disconnect(self.on_stream_order)
+            self.user_stream = None
+
+    def on_stream_snapshot(self, balances, orders):
+        """Mutabakat ile gelen tam durumu göster"""
+        self.last_balances = balances
+        self.valuation.refresh()
+        self.render_balances(balances)
+        self.render_orders(orders)
+
+    def on_stream_balances(self, changed):
+        """Sadece değişen varlıkların bakiyelerini uygula"""
+        balances = {balance['asset']: balance for balance in self.last_balances}
+        for balance in changed:
+            if float(balance['free']) > 0 or float(balance['locked']) > 0:
+                balances[balance['asset']] = balance
+            else:
+                balances.pop(balance['asset'], None)
+        placeholder = not self.last_balances
+        self.last_balances = list(balances.values())
+        if placeholder:
+            # Tabloda henüz durum mesajı varsa tamamı çizilir
+            self.render_balances(self.last_balances)
+            return
 
-            limit = int(self.history_limit_combo.currentText())
+        # Tablonun tamamı yerine sadece değişen varlıkların satırları yazılır
+        total_value_usd = self.valuation.set_holdings(self.account_name, self.last_balances)
+        values, _ = self.valuation.get_values(self.account_name)
+        for balance in changed:
+            row = self.find_balance_row(balance['asset'])
+            if balance['asset'] not in balances:
+                if row >= 0:
+                    self.balance_table.removeRow(row)
+            elif row >= 0:
+                self.set_balance_row(row, balance, values)
+            else:
+                self.set_balance_row(self.balance_table.rowCount(), balance, values, insert=True)
 
-            # Yükleniyor imleci göster
-            self.setCursor(Qt.WaitCursor)
+        if total_value_usd > 0:
+            self.total_value_label.setText(f"Total Value: ${total_value_usd:.2f}")
 
-            # Emir geçmişini al
-            orders = self.connector.get_order_history(symbol=symbol, limit=limit)
-            if not orders:
-                self.history_table.setRowCount(0)
-                self.setCursor(Qt.ArrowCursor)  # İmleci geri yükle
-                return
+    def on_stream_order(self, order):
+        """Tek emir güncellemesini tabloya satır bazında uygula"""
+        row = self.find_order_row(order['orderId'])
+        if order['status'] in ("NEW", "PARTIALLY_FILLED", "PENDING_NEW"):
+            if row >= 0:
+                self.set_order_row(row, order)
+            else:
+                self.set_order_row(self.orders_table.rowCount(), order, insert=True)
+        elif row >= 0:
+            self.orders_table.removeRow(row)
 
-            # Tabloyu temizle
-            self.history_table.setRowCount(0)
+    def update_order_history(self):
+        """Emir geçmişi bilgilerini güncelle"""
+        symbol, limit = self.history_filter()
+
+        # Yükleniyor imleci göster; filtre değişirse önceki istek iptal edilir
+        self.setCursor(Qt.WaitCursor)
+        job = self.jobs.submit("history", self.connector.get_order_history, symbol=symbol, limit=limit,
+                               executor=sync_pool,
+                               on_result=lambda orders: self.render_order_history(orders or []),
+                               on_error=lambda error: print(f"Emir geçmişi alma hatası: {error}"))
+        job.finished.connect(self.on_history_finished)
+        return job
+
+    def on_history_finished(self):
+        # Yerine yenisi gönderilen istek bittiğinde imleç beklemede kalır
+        if not self.jobs.is_running("history"):
+            self.setCursor(Qt.ArrowCursor)  # İmleci geri yükle
 
-            # Tarihe göre sırala (en yeniler önce)
-            orders.sort(key=lambda x: x['time'], reverse=True)
+    def history_filter(self):
+        """Geçmiş sekmesindeki sembol ve limit filtreleri"""
+        selected_symbol = self.history_symbol_combo.currentText()
+        symbol = None if selected_symbol == "All Symbols" else selected_symbol
+        return symbol, int(self.history_limit_combo.currentText())
+
+    def render_order_history(self, orders):
+        """Emir geçmişi tablosunu verilen emirlerle doldur"""
+        # Tabloyu temizle
+        self.history_table.setRowCount(0)
+        if not orders:
+            return
 
-            for i, order in enumerate(orders):
-                self.history_table.insertRow(i)
+        # Tarihe göre sırala (en yeniler önce)
+        orders.sort(key=lambda x: x['time'], reverse=True)
 
-                # Zaman
-                timestamp = order['time'] / 1000  # milisaniyeden saniyeye
-                date_str = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
-                self.history_table.setItem(i, 0, QTableWidgetItem(date_str))
+        for i, order in enumerate(orders):
+            self.history_table.insertRow(i)
 
-                # Diğer bilgiler
-                self.history_table.setItem(i, 1, QTableWidgetItem(order['symbol']))
-                self.history_table.setItem(i, 2, QTableWidgetItem(order['side']))
-                self.history_table.setItem(i, 3, QTableWidgetItem(order['type']))
+            # Zaman
+            timestamp = order['time'] / 1000  # milisaniyeden saniyeye
+            date_str = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+            self.history_table.setItem(i, 0, QTableWidgetItem(date_str))
 
-                qty = float(order['origQty'])
-                self.history_table.setItem(i, 4, QTableWidgetItem(f"{qty:.8f}".rstrip('0').rstrip('.')))
+            # Diğer bilgiler
+            self.history_table.setItem(i, 1, QTableWidgetItem(order['symbol']))
+            self.history_table.setItem(i, 2, QTableWidgetItem(order['side']))
+            self.history_table.setItem(i, 3, QTableWidgetItem(order['type']))
 
-                price = float(order['price']) if float(order['price']) > 0 else 0
-                self.history_table.setItem(i, 5, QTableWidgetItem(f"{price:.8f}".rstrip('0').rstrip('.')))
+            qty = float(order['origQty'])
+            self.history_table.setItem(i, 4, QTableWidgetItem(f"{qty:.8f}".rstrip('0').rstrip('.')))
 
-                self.history_table.setItem(i, 6, QTableWidgetItem(self.get_status_text(order['status'])))
+            price = float(order['price']) if float(order['price']) > 0 else 0
+            self.history_table.setItem(i, 5, QTableWidgetItem(f"{price:.8f}".rstrip('0').rstrip('.')))
 
-                # Toplam değer (Miktar * Fiyat)
-                if price > 0:
-                    total = qty * price
-                    self.history_table.setItem(i, 7, QTableWidgetItem(f"{total:.8f}".rstrip('0').rstrip('.')))
-                else:
-                    self.history_table.setItem(i, 7, QTableWidgetItem("-"))
+            self.history_table.setItem(i, 6, QTableWidgetItem(self.get_status_text(order['status'])))
 
-                # İlk 3 sütunu sola hizala
-                for col in range(3):
-                    item = self.history_table.item(i, col)
-                    item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+            # Toplam değer (Miktar * Fiyat)
+            if price > 0:
+                total = qty * price
+                self.history_table.setItem(i, 7, QTableWidgetItem(f"{total:.8f}".rstrip('0').rstrip('.')))
+            else:
+                self.history_table.setItem(i, 7, QTableWidgetItem("-"))
 
-                # Miktar, fiyat ve toplam sütunlarını sağa hizala
-                for col in range(4, 8):
-                    if self.history_table.item(i, col):
-                        self.history_table.item(i, col).setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            # İlk 3 sütunu sola hizala
+            for col in range(3):
+                item = self.history_table.item(i, col)
+                item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
 
-            # Sembol listesini güncelle (filtreleme için)
-            self.update_history_symbols(orders)
+            # Miktar, fiyat ve toplam sütunlarını sağa hizala
+            for col in range(4, 8):
+                if self.history_table.item(i, col):
+                    self.history_table.item(i, col).setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
 
-        except Exception as e:
-            print(f"Emir geçmişi alma hatası: {e}")
-        finally:
-            self.setCursor(Qt.ArrowCursor)  # İmleci geri yükle
+        # Sembol listesini güncelle (filtreleme için)
+        self.update_history_symbols(orders)
 
     def update_history_symbols(self, orders):
         """Emir geçmişinden sembolleri filtre listesine ekle"""
@@ -436,113 +618,158 @@ class AccountWidget(QWidget):
 
     def cancel_selected_order(self):
         """Seçilen emri iptal et"""
-        try:
-            sender = self.sender()
-            order_id = sender.property("order_id")
-            symbol = sender.property("symbol")
-
-            reply = QMessageBox.question(
-                self,
-                "Cancel Order",
-                f"Are you sure you want to cancel order ID {order_id} for {symbol}?",
-                QMessageBox.Yes | QMessageBox.No
-            )
+        sender = self.sender()
+        order_id = sender.property("order_id")
+        symbol = sender.property("symbol")
+
+        reply = QMessageBox.question(
+            self,
+            "Cancel Order",
+            f"Are you sure you want to cancel order ID {order_id} for {symbol}?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+
+        if reply == QMessageBox.Yes:
+            # İptal istekleri birbirini geçersiz kılmaz, her emir kendi anahtarıyla gönderilir
+            sender.setEnabled(False)
+            self.jobs.submit(f"cancel:{order_id}", self.connector.cancel_order, symbol, order_id,
+                             on_result=self.on_order_canceled, on_error=self.on_cancel_error)
+
+    def on_order_canceled(self, result):
+        if result:
+            QMessageBox.information(self, "Success", "Order successfully canceled.")
+            self.update_orders()  # Açık emirleri güncelle
+            self.update_balance()  # Bakiyeleri güncelle
+        else:
+            QMessageBox.critical(self, "Error", "An error occurred while canceling the order.")
+            self.update_orders()
 
-            if reply == QMessageBox.Yes:
-                if self.connector.cancel_order(symbol, order_id):
-                    QMessageBox.information(self, "Success", "Order successfully canceled.")
-                    self.update_orders()  # Açık emirleri güncelle
-                    self.update_balance()  # Bakiyeleri güncelle
-                else:
-                    QMessageBox.critical(self, "Error", "An error occurred while canceling the order.")
-        except Exception as e:
-            print(f"Emir iptali sırasında beklenmeyen hata: {e}")
-            QMessageBox.critical(self, "Error", f"An unexpected error occurred: {e}")
+    def on_cancel_error(self, error):
+        print(f"Emir iptali sırasında beklenmeyen hata: {error}")
+        QMessageBox.critical(self, "Error", f"An unexpected error occurred: {error}")
+        self.update_orders()
 
     def update_symbol_price(self):
         """Seçilen sembol için fiyat bilgilerini güncelle"""
         symbol = self.symbol_combo.currentText()
         if not symbol:
-            return
-
-        try:
-            #opsiyon piyasaları için fiyatları alır
-            options_data = self.connector.client.get_ticker(symbol=symbol)
-
-            # Cevabın liste olduğu durumu kontrol eder
-            if isinstance(options_data, list) and options_data:
-                options_data = options_data[0]
-
-            # Opsiyon piyasa veri tipinde verileri kontrol eder
-            price = options_data.get('lastPrice', 'N/A')
-            change = options_data.get('priceChangePercent', 'N/A')
-            high = options_data.get('high', 'N/A')
-            low = options_data.get('low', 'N/A')
-
-
-            self.price_info_label.setText(
-                f"Symbol: {symbol}\n"
-                f"Current Price: {price}\n"
-                f"24h Change: {change}%\n"
-                f"24h High: {high}\n"
-                f"24h Low: {low}\n"
-            )
-        except Exception as e:
-            self.price_info_label.setText(f"Error getting price info: {e}")
+            return None
+
+        return self.jobs.submit("ticker", self.fetch_symbol_ticker, symbol,
+                                on_result=lambda data: self.render_symbol_ticker(symbol, data),
+                                on_error=lambda error: self.price_info_label.setText(
+                                    f"Error getting price info: {error}"))
+
+    def fetch_symbol_ticker(self, symbol):
+        """Sembolün 24 saatlik ticker verisini çeker"""
+        #opsiyon piyasaları için fiyatları alır
+        options_data = self.connector.client.get_ticker(symbol=symbol)
+
+        # Cevabın liste olduğu durumu kontrol eder
+        if isinstance(options_data, list) and options_data:
+            options_data = options_data[0]
+        return options_data
+
+    def render_symbol_ticker(self, symbol, options_data):
+        """Sembol bilgi panelini ticker verisiyle doldur"""
+        # Opsiyon piyasa veri tipinde verileri kontrol eder
+        price = options_data.get('lastPrice', 'N/A')
+        change = options_data.get('priceChangePercent', 'N/A')
+        high = options_data.get('high', 'N/A')
+        low = options_data.get('low', 'N/A')
+
+        self.price_info_label.setText(
+            f"Symbol: {symbol}\n"
+            f"Current Price: {price}\n"
+            f"24h Change: {change}%\n"
+            f"24h High: {high}\n"
+            f"24h Low: {low}\n"
+        )
 
     def update_trade_history(self):
         """İşlem geçmişini güncelle"""
-        try:
-            # Mevcut sembolü kontrol eder
-            symbol = self.symbol_combo.currentText()
-
-            if not symbol:
-                self.trade_history_table.setRowCount(0)
-                QMessageBox.warning(self, "Warning", "Please select a symbol first to view trade history.")
-                return
-
-            self.table_headers = ["Date", "Symbol", "Side", "Quantity", "Price", "Status"]
-
-            # Son 10 işlemi alır
-            trades = self.connector.client.get_my_trades(symbol=symbol, limit=10)
+        # Mevcut sembolü kontrol eder
+        symbol = self.symbol_combo.currentText()
 
+        if not symbol:
             self.trade_history_table.setRowCount(0)
-            for i, trade in enumerate(trades):
-                self.trade_history_table.insertRow(i)
-
-                # Unix zaman damgasını okunabilir tarihe dönüştür
-                timestamp = trade['time'] / 1000  # milisaniyeden saniyeye
-                date_str = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+            QMessageBox.warning(self, "Warning", "Please select a symbol first to view trade history.")
+            return None
+
+        self.table_headers = ["Date", "Symbol", "Side", "Quantity", "Price", "Status"]
+
+        # Son 10 işlemi yerel geçmiş deposundan alır (yeni işlemler önce eşitlenir)
+        return self.jobs.submit("trades", self.connector.get_trade_history, symbol=symbol, limit=10,
+                                executor=sync_pool,
+                                on_result=lambda trades: self.render_trade_history(trades or []),
+                                on_error=self.on_trade_history_error)
+
+    def on_trade_history_error(self, error):
+        print(f"İşlem geçmişi alma hatası: {error}")
+        QMessageBox.warning(self, "Error", f"Failed to retrieve trade history: {error}")
+
+    def render_trade_history(self, trades):
+        """İşlem geçmişi tablosunu verilen işlemlerle doldur"""
+        self.trade_history_table.setRowCount(0)
+        for i, trade in enumerate(trades):
+            self.trade_history_table.insertRow(i)
+
+            # Unix zaman damgasını okunabilir tarihe dönüştür
+            timestamp = trade['time'] / 1000  # milisaniyeden saniyeye
+            date_str = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
+            self.trade_history_table.setItem(i, 0, QTableWidgetItem(date_str))
+            self.trade_history_table.setItem(i, 1, QTableWidgetItem(trade['symbol']))
+            self.trade_history_table.setItem(i, 2, QTableWidgetItem(trade['isBuyer'] and "BUY" or "SELL"))
+            self.trade_history_table.setItem(i, 3, QTableWidgetItem(str(trade['qty'])))
+            self.trade_history_table.setItem(i, 4, QTableWidgetItem(str(trade['price'])))
+            self.trade_history_table.setItem(i, 5, QTableWidgetItem(trade['isBestMatch'] and "Best Match" or ""))
+
+    def is_connected(self):
+        return self.connector.connected
+
+    def refresh_job(self):
+        """Açık sekmeyi RefreshScheduler için yeniler"""
+        return self.refresh_tab(self.tabs.currentIndex())
+
+    def refresh_tab(self, index):
+        """Sekmenin verilerini arka planda yeniler; başlatılan işi (yoksa None) döndürür"""
+        # Akış açıkken bakiye ve açık emirler zaten günceldir
+        stream_live = self.user_stream is not None and self.user_stream.is_live
 
-                self.trade_history_table.setItem(i, 0, QTableWidgetItem(date_str))
-                self.trade_history_table.setItem(i, 1, QTableWidgetItem(trade['symbol']))
-                self.trade_history_table.setItem(i, 2, QTableWidgetItem(trade['isBuyer'] and "BUY" or "SELL"))
-                self.trade_history_table.setItem(i, 3, QTableWidgetItem(str(trade['qty'])))
-                self.trade_history_table.setItem(i, 4, QTableWidgetItem(str(trade['price'])))
-                self.trade_history_table.setItem(i, 5, QTableWidgetItem(trade['isBestMatch'] and "Best Match" or ""))
-
-        except Exception as e:
-            print(f"İşlem geçmişi alma hatası: {e}")
-            QMessageBox.warning(self, "Error", f"Failed to retrieve trade history: {e}")
-
-    def refresh_data(self):
-        """Tüm verileri yenile"""
-        if self.connector.connected:
-            current_tab = self.tabs.currentIndex()
-
-            # Bakiye sekmesi
-            if current_tab == 0:
-                self.update_balance()
-            # Açık emirler sekmesi
-            elif current_tab == 1:
-                self.update_orders()
-            # Emir geçmişi sekmesi
-            elif current_tab == 2:
-                self.update_order_history()
-            # İşlem sekmesi
-            elif current_tab == 3:
-                self.update_symbol_price()
-                self.update_trade_history()
+        # Bakiye sekmesi
+        if index == 0:
+            if not stream_live:
+                return self.update_balance()
+        # Açık emirler sekmesi
+        elif index == 1:
+            if not stream_live:
+                return self.update_orders()
+        # Emir geçmişi sekmesi
+        elif index == 2:
+            self.stale_tabs.discard(index)
+            return self.update_order_history()
+        # İşlem sekmesi
+        elif index == 3 and self.symbol_combo.currentText():
+            self.stale_tabs.discard(index)
+            self.update_symbol_price()
+            return self.update_trade_history()
+        return None
+
+    def on_tab_changed(self, index):
+        """Sekmeyi ilk açılışında yükler; terk edilen sekmenin bekleyen yüklemesi iptal edilip
+        sekmeye dönüldüğünde yeniden yapılır"""
+        for key in TAB_JOB_KEYS.get(self.current_tab, ()):
+            if self.jobs.cancel(key):
+                self.stale_tabs.add(self.current_tab)
+        self.current_tab = index
+        self.load_tab(index)
+
+    def on_symbol_changed(self, symbol):
+        """Eski sembol için bekleyen fiyat ve işlem istekleri artık gösterilmez"""
+        self.jobs.cancel("ticker")
+        self.jobs.cancel("trades")
+        self.symbols_changed.emit()
 
     def on_order_type_changed(self, order_type):
         """Emir tipi değiştiğinde UI'yi güncelle"""
@@ -604,6 +831,7 @@ class AccountWidget(QWidget):
                 return
 
         # Take Profit seçiliyse emir girer
+        take_profit_price = None
         take_profit_text = self.take_profit_price.text().strip()
         if take_profit_text:
             try:
@@ -613,6 +841,7 @@ class AccountWidget(QWidget):
                 return
 
         # Stop Loss seçiliyse emir girer
+        stop_loss_price = None
         stop_loss_text = self.stop_loss_price.text().strip()
         if stop_loss_text:
             try:
@@ -621,60 +850,92 @@ class AccountWidget(QWidget):
                 QMessageBox.warning(self, "Error", "Please enter a valid Stop Loss price.")
                 return
 
-        try:
-            # Test emri gönder (gerçekten çalıştırmaz)
+        # Akış açıkken bakiyeler günceldir; widget verisi GUI thread'inde okunur
+        live_balances = self.last_balances if self.user_stream and self.user_stream.is_live else None
+
+        # Emir tekrar gönderilmesin diye buton iş bitene kadar kapalı kalır; emir işleri iptal edilmez
+        self.place_order_btn.setEnabled(False)
+        job = self.jobs.submit(None, self.submit_order, params, take_profit_price, stop_loss_price, live_balances,
+                               on_result=self.on_order_submitted, on_error=self.on_order_error)
+        job.finished.connect(lambda: self.place_order_btn.setEnabled(True))
+
+    def submit_order(self, params, take_profit_price, stop_loss_price, live_balances):
+        """Emri yuvarlar, doğrular ve gönderir (arka plan thread'inde çalışır)"""
+        symbol = params["symbol"]
+
+        # Miktar ve fiyatları sembol filtrelerine göre yuvarla (ağ çağrısı yapmaz)
+        filters = self.connector.get_symbol_filters(symbol)
+        if filters:
+            params["quantity"] = filters.round_quantity(params["quantity"])
+            for key in ("price", "stopPrice"):
+                if key in params:
+                    params[key] = filters.round_price(params[key])
+            if take_profit_price is not None:
+                take_profit_price = filters.round_price(take_profit_price)
+            if stop_loss_price is not None:
+                stop_loss_price = filters.round_price(stop_loss_price)
+
+        # Önbellekteki filtre, fiyat ve bakiyelerle yerel doğrulama
+        errors = validate_with_connector(self.connector, params, live_balances)
+        if errors:
+            return {"errors": errors}
+
+        # Test emri gönder (gerçekten çalıştırmaz); ayar ile atlanabilir
+        if DEFAULT_TEST_ORDER_MODE == TEST_ORDER_PARALLEL:
             self.connector.client.create_test_order(**params)
 
-            # Gerçek emri gönder
-            response = self.connector.client.create_order(**params)
-
-            QMessageBox.information(
-                self,
-                "Success",
-                f"Order placed successfully.\n"
-                f"Order ID: {response['orderId']}\n"
-                f"Status: {response['status']}"
+        # Gerçek emri gönder
+        response = self.connector.client.create_order(**params)
+
+        # Gerçek emir sonrası TP/SL bacakları tek OCO isteğiyle girilir
+        order_list_id, messages = None, []
+        if take_profit_price is not None or stop_loss_price is not None:
+            order_list_id, messages = self.connector.place_exit_orders(
+                symbol, params["side"], params["quantity"],
+                take_profit_price=take_profit_price,
+                stop_loss_price=stop_loss_price,
+                stop_loss_type="STOP_LOSS"
             )
 
-            # Gerçek Emir Sonrası TP/SL emirlerini gir
-            try:
-                if take_profit_text:
-                    # Kar Gerçekleştirme Emri
-                    self.connector.client.create_order(
-                        symbol=symbol,
-                        side="SELL" if side == "BUY" else "BUY",
-                        type="LIMIT",
-                        timeInForce="GTC",
-                        quantity=quantity,
-                        price=take_profit_price
-                    )
-
-                if stop_loss_text:
-                    # Zarar Durdurma Emri
-                    self.connector.client.create_order(
-                        symbol=symbol,
-                        side="SELL" if side == "BUY" else "BUY",
-                        type="STOP_LOSS",
-                        quantity=quantity,
-                        stopPrice=stop_loss_price
-                    )
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Failed to set TP/SL: {e}")
-
-            # Formu temizle
-            self.quantity_input.clear()
-            self.price_input.clear()
-            self.stop_price_input.clear()
-
-            # Verileri güncelle
-            self.update_orders()
-            self.update_balance()
-            self.update_trade_history()
+        return {
+            "errors": [],
+            "response": response,
+            "order_list_id": order_list_id,
+            "exit_errors": [message for message in messages if "Error" in message]
+        }
 
-        except BinanceAPIException as e:
-            QMessageBox.critical(self, "API Error", f"Order failed: {e.message}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Order failed: {e}")
+    def on_order_submitted(self, result):
+        if result["errors"]:
+            QMessageBox.warning(self, "Error", "Order rejected by local validation:\n" + "\n".join(result["errors"]))
+            return
+
+        if result["exit_errors"]:
+            QMessageBox.warning(self, "Error", f"Failed to set TP/SL: {', '.join(result['exit_errors'])}")
+
+        # Sonuç, TP/SL istekleri gönderildikten sonra gösterilir
+        response = result["response"]
+        message = (f"Order placed successfully.\n"
+                   f"Order ID: {response['orderId']}\n"
+                   f"Status: {response['status']}")
+        if result["order_list_id"] is not None:
+            message += f"\nTP/SL Order List ID: {result['order_list_id']}"
+        QMessageBox.information(self, "Success", message)
+
+        # Formu temizle
+        self.quantity_input.clear()
+        self.price_input.clear()
+        self.stop_price_input.clear()
+
+        # Verileri güncelle
+        self.update_orders()
+        self.update_balance()
+        self.update_trade_history()
+
+    def on_order_error(self, error):
+        if isinstance(error, BinanceAPIException):
+            QMessageBox.critical(self, "API Error", f"Order failed: {error.message}")
+        else:
+            QMessageBox.critical(self, "Error", f"Order failed: {error}")
 
     def get_status_text(self, status):
         """Emir durumunu görüntüleme metnine dönüştür"""
@@ -0,0 +1,303 @@
+import threading
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from market_stream import StreamWorker, MAINNET_STREAM_URL, TESTNET_STREAM_URL, FRAME_INTERVAL_MS
+
+# listenKey 60 dakikada düşer, 30 dakikada bir canlı tutulur
+KEEPALIVE_INTERVAL_MS = 30 * 60 * 1000
+
+# Akış açıkken REST ile mutabakat aralığı
+RECONCILE_INTERVAL_MS = 10 * 60 * 1000
+
+# Açık kabul edilen emir durumları
+OPEN_ORDER_STATUSES = ("NEW", "PARTIALLY_FILLED", "PENDING_NEW")
+
+
+class AccountState:
+    """Bir hesabın bakiye ve açık emirlerinin bellekteki kopyası"""
+
+    def __init__(self):
+        self.balances = {}  # asset -> {"asset", "free", "locked"}
+        self.open_orders = {}  # orderId -> REST biçiminde emir
+        self._lock = threading.Lock()
+
+    def load_snapshot(self, balances, open_orders):
+        """REST ile alınmış tam durumu yükler"""
+        with self._lock:
+            self.balances = {balance["asset"]: dict(balance) for balance in balances or []}
+            self.open_orders = {order["orderId"]: order for order in open_orders or []}
+
+    def get_balances(self):
+        with self._lock:
+            return list(self.balances.values())
+
+    def get_open_orders(self):
+        with self._lock:
+            return list(self.open_orders.values())
+
+    def apply_event(self, event):
+        """Akış olayını uygular; değişen bakiyeleri ve emri döndürür"""
+        event_type = event.get("e")
+        if event_type == "outboundAccountPosition":
+            return self._apply_account_position(event), None
+        if event_type == "executionReport":
+            return [], self._apply_execution_report(event)
+        return [], None
+
+    def _apply_account_position(self, event):
+        changed = []
+        with self._lock:
+            for entry in event.get("B", []):
+                balance = {"asset": entry["a"], "free": entry["f"], "locked": entry["l"]}
+                if float(entry["f"]) > 0 or float(entry["l"]) > 0:
+                    self.balances[entry["a"]] = balance
+                else:
+                    self.balances.pop(entry["a"], None)
+                changed.append(balance)
+        return changed
+
+    def _apply_execution_report(self, event):
+        order = {
+            "symbol": event["s"],
+            "orderId": event["i"],
+            "clientOrderId": event.get("c"),
+            "side": event["S"],
+            "type": event["o"],
+            "timeInForce": event.get("f"),
+            "origQty": event["q"],
+            "price": event["p"],
+            "stopPrice": event.get("P", "0"),
+            "executedQty": event.get("z", "0"),
+            "status": event["X"],
+            "time": event.get("O", event.get("T")),
+            "updateTime": event.get("E")
+        }
+        with self._lock:
+            if order["status"] in OPEN_ORDER_STATUSES:
+                self.open_orders[order["orderId"]] = order
+            else:
+                self.open_orders.pop(order["orderId"], None)
+        return order
+
+
+class UserDataStream(QObject):
+    """Bir hesabın user-data akışını yöneten nesne (listenKey, canlı tutma, mutabakat)"""
+    balances_changed = pyqtSignal(list)  # sadece değişen bakiyeler
+    order_changed = pyqtSignal(dict)  # tek emir güncellemesi (kapanan emirler dahil)
+    snapshot_loaded = pyqtSignal(list, list)  # tüm bakiyeler, tüm açık emirler
+
+    def __init__(self, account_name, connector, url=None, parent=None):
+        super().__init__(parent)
+        self.account_name = account_name
+        self.connector = connector
+        self.url = url or (TESTNET_STREAM_URL if connector.testnet else MAINNET_STREAM_URL)
+        self.state = AccountState()
+        self.listen_key = None
+        self.worker = None
+
+        self._pending_balances = {}
+        self._pending_orders = {}
+        self._pending_snapshot = False
+        self._pending_listen_key = None
+        self._pending_lock = threading.Lock()
+        self._stopped = False
+        self._buffer = None  # görüntü alınırken gelen olaylar (None: doğrudan uygulanır)
+        self._snapshot_lock = threading.Lock()
+
+        self.frame_timer = QTimer(self)
+        self.frame_timer.timeout.connect(self.flush)
+
+        self.keepalive_timer = QTimer(self)
+        self.keepalive_timer.timeout.connect(lambda: self._in_background(self._keepalive))
+
+        self.reconcile_timer = QTimer(self)
+        self.reconcile_timer.timeout.connect(self.reconcile)
+
+    @property
+    def is_live(self):
+        return self.worker is not None and self.listen_key is not None
+
+    def start(self):
+        """listenKey alır, akışı açar ve ilk mutabakatı başlatır"""
+        if self.worker is not None:
+            return
+        with self._pending_lock:
+            self._stopped = False
+        self.frame_timer.start(FRAME_INTERVAL_MS)
+        self.keepalive_timer.start(KEEPALIVE_INTERVAL_MS)
+        self.reconcile_timer.start(RECONCILE_INTERVAL_MS)
+        self._in_background(self._open)
+
+    def stop(self):
+        """Akışı kapatır ve listenKey'i bırakır"""
+        self.frame_timer.stop()
+        self.keepalive_timer.stop()
+        self.reconcile_timer.stop()
+        with self._pending_lock:
+            self._stopped = True
+            pending_key, self._pending_listen_key = self._pending_listen_key, None
+
+        # Worker thread'i bitince kendini siler
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
+
+        listen_key, self.listen_key = self.listen_key, None
+        client = self.connector.client
+        for key in {listen_key, pending_key} - {None}:
+            self._in_background(lambda key=key: client.stream_close(listenKey=key))
+
+    def restart(self, connector):
+        """Akışı yeni connector ile yeniden açar; bağlı bileşenlerin sinyal bağlantıları korunur"""
+        self.stop()
+        if connector.testnet != self.connector.testnet:
+            self.url = TESTNET_STREAM_URL if connector.testnet else MAINNET_STREAM_URL
+        self.connector = connector
+        self.start()
+
+    def reconcile(self):
+        """REST ile tam durumu yeniden çeker (yedek yol)"""
+        self._in_background(self._load_snapshot)
+
+    def _in_background(self, func):
+        """REST çağrılarını arayüz thread'ini bloklamadan çalıştırır"""
+        def target():
+            try:
+                func()
+            except Exception as e:
+                print(f"User-data akışı hatası ({self.account_name}): {e}")
+        threading.Thread(target=target, daemon=True).start()
+
+    def _open(self):
+        # WebSocket thread'i arayüz thread'inde (flush içinde) başlatılır
+        connector = self.connector
+        listen_key = connector.client.stream_get_listen_key()
+        with self._pending_lock:
+            if not self._stopped and self.connector is connector:
+                self._pending_listen_key = listen_key
+                return
+        # Akış listenKey alınırken kapatıldı veya başka connector ile yeniden açıldı
+        connector.client.stream_close(listenKey=listen_key)
+
+    def _connect(self, listen_key):
+        """Yeni listenKey ile WebSocket bağlantısını (yeniden) kurar.
+
+        Bağlantı kurulana kadar gelen olaylar biriktirilir; REST görüntüsü soket açıldıktan
+        sonra alınır ve biriken olaylar üzerine uygulanır, böylece arada olay kaybolmaz.
+        """
+        if self.worker is not None:
+            self.worker.stop()
+        self.listen_key = listen_key
+        with self._pending_lock:
+            if self._buffer is None:
+                self._buffer = []
+        self.worker = StreamWorker(f"{self.url}/ws/{listen_key}", self.handle_message,
+                                   on_connected=lambda: self._in_background(self._load_snapshot))
+        self.worker.start()
+
+    def _keepalive(self):
+        if self.listen_key:
+            self.connector.client.stream_keepalive(listenKey=self.listen_key)
+
+    def _load_snapshot(self):
+        """REST görüntüsünü alır; bu sırada gelen olaylar biriktirilip görüntünün üzerine uygulanır"""
+        with self._snapshot_lock:
+            with self._pending_lock:
+                if self._buffer is None:
+                    self._buffer = []
+
+            balances = open_orders = None
+            try:
+                balances = self.connector.get_account_balance()
+                open_orders = self.connector.get_open_orders()
+            finally:
+                with self._pending_lock:
+                    buffered, self._buffer = self._buffer or [], None
+                    if balances is not None and open_orders is not None:
+                        self.state.load_snapshot(balances, open_orders)
+                        self._pending_snapshot = True
+                    for event in buffered:
+                        self._apply_event(event)
+
+    def handle_message(self, event):
+        """WebSocket thread'inden çağrılır"""
+        if event.get("e") == "listenKeyExpired":
+            # Yeni listenKey ile yeniden açılır
+            self._in_background(self._open)
+            return
+
+        with self._pending_lock:
+            if self._buffer is not None:
+                self._buffer.append(event)
+            else:
+                self._apply_event(event)
+
+    def _apply_event(self, event):
+        # _pending_lock tutulurken çağrılır
+        balances, order = self.state.apply_event(event)
+        for balance in balances:
+            self._pending_balances[balance["asset"]] = balance
+        if order is not None:
+            self._pending_orders[order["orderId"]] = order
+
+    def flush(self):
+        """Biriken olayları arayüze aktarır"""
+        with self._pending_lock:
+            listen_key = self._pending_listen_key
+            snapshot = self._pending_snapshot
+            self._pending_listen_key = None
+            balances = list(self._pending_balances.values())
+            orders = list(self._pending_orders.values())
+            self._pending_snapshot = False
+            self._pending_balances = {}
+            self._pending_orders = {}
+
+        if listen_key:
+            self._connect(listen_key)
+
+        if snapshot:
+            self.snapshot_loaded.emit(self.state.get_balances(), self.state.get_open_orders())
+            return
+
+        if balances:
+            self.balances_changed.emit(balances)
+        for order in orders:
+            self.order_changed.emit(order)
+
+
+class UserStreamManager:
+    """Hesap başına tek bir user-data akışı tutar"""
+
+    def __init__(self):
+        self.streams = {}
+        self.users = {}  # account -> akışı kullanan bileşen sayısı
+
+    def start(self, account_name, connector):
+        """Hesabın akışını döndürür, yoksa açar"""
+        stream = self.streams.get(account_name)
+        if stream is None:
+            stream = UserDataStream(account_name, connector)
+            self.streams[account_name] = stream
+            stream.start()
+        elif not stream.connector.connected and connector.connected:
+            # Hesap yeniden eklendi veya düzenlendi; akışın connector'ı kapatıldı (ör. havuzdan çıkarıldı)
+            stream.restart(connector)
+        self.users[account_name] = self.users.get(account_name, 0) + 1
+        return stream
+
+    def release(self, account_name):
+        """Bir kullanıcı akışı bırakır; son kullanıcı da bırakınca akış kapanır"""
+        count = self.users.get(account_name, 0) - 1
+        if count > 0:
+            self.users[account_name] = count
+        else:
+            self.stop(account_name)
+
+    def stop(self, account_name=None):
+        """Hesabın (veya tüm hesapların) akışını kapatır"""
+        names = list(self.streams) if account_name is None else [account_name]
+        for name in names:
+            self.users.pop(name, None)
+            stream = self.streams.pop(name, None)
+            if stream is not None:
+                stream.stop()
+                stream.deleteLater()
@@ -0,0 +1,192 @@
+import threading
+from collections import deque
+from exchange_info import exchange_info_cache
+from price_cache import price_cache
+
+# Değerlemenin dayandığı varlık (1 USDT = 1 USD kabul edilir)
+USD_ANCHOR = "USDT"
+
+
+class ValuationEngine:
+    """Varlıkları ticker grafiğindeki en kısa dönüşüm yoluyla USD'ye çeviren, hesap
+    değerlerini fiyat değiştikçe sadece etkilenen varlıklar için güncelleyen motor"""
+
+    def __init__(self, testnet):
+        self.testnet = testnet
+        self.pairs = {}  # symbol -> (base, quote)
+        self.prices = {}  # symbol -> son fiyat
+        self.edges = set()  # grafikte kenarı olan (kurulumda fiyatı bilinen) semboller
+        self.paths = {}  # asset -> [(symbol, invert), ...] USD'ye dönüşüm yolu
+        self.dependents = {}  # symbol -> yolunda bu sembol geçen varlıklar
+        self.asset_prices = {USD_ANCHOR: 1.0}  # asset -> USD fiyatı
+        self.holdings = {}  # account -> {asset: miktar}
+        self.values = {}  # account -> {asset: USD değeri veya None}
+        self.totals = {}  # account -> toplam USD değeri
+        self._lock = threading.RLock()
+
+    def refresh(self, connector=None):
+        """Borsa bilgisi ve fiyat önbelleğiyle grafiği kurar ya da fiyatları günceller.
+
+        Connector verilmezse ağ çağrısı yapılmaz, sadece önbellekler kullanılır. Önbellekte
+        fiyat yoksa grafik kurulmaz; sonradan fiyatı gelen semboller grafiği yeniden kurdurur.
+        """
+        client = connector.client if connector is not None else None
+        exchange_info_cache.ensure_loaded(client, self.testnet)
+        pairs = exchange_info_cache.get_pairs(self.testnet)
+        prices = price_cache.get_prices(client, self.testnet)
+        if not pairs or not prices:
+            return
+        with self._lock:
+            if pairs != self.pairs or any(symbol in pairs and symbol not in self.edges for symbol in prices):
+                self.rebuild(pairs, prices)
+            else:
+                self.apply_prices(prices)
+
+    def rebuild(self, pairs, prices):
+        """Ticker grafiğinde USDT'den BFS ile her varlığa en az adımlı yolu bulur"""
+        with self._lock:
+            self.pairs = dict(pairs)
+            self.prices = {symbol: price for symbol, price in prices.items() if symbol in pairs}
+            self.edges = set(self.prices)
+
+            # Sadece fiyatı bilinen semboller kenar olur
+            graph = {}
+            for symbol in sorted(self.prices):
+                base, quote = pairs[symbol]
+                graph.setdefault(quote, []).append((base, symbol, False))
+                graph.setdefault(base, []).append((quote, symbol, True))
+
+            self.paths = {USD_ANCHOR: []}
+            queue = deque([USD_ANCHOR])
+            while queue:
+                asset = queue.popleft()
+                for neighbour, symbol, invert in graph.get(asset, []):
+                    if neighbour not in self.paths:
+                        self.paths[neighbour] = [(symbol, invert)] + self.paths[asset]
+                        queue.append(neighbour)
+
+            self.dependents = {}
+            for asset, path in self.paths.items():
+                for symbol, invert in path:
+                    self.dependents.setdefault(symbol, set()).add(asset)
+
+            self.asset_prices = {asset: self._path_price(path) for asset, path in self.paths.items()}
+            for account in self.holdings:
+                self._revalue_account(account)
+
+    def _path_price(self, path):
+        """Yol boyunca fiyatları çarpar; yoldaki bir fiyat sıfırsa None"""
+        price = 1.0
+        for symbol, invert in path:
+            symbol_price = self.prices.get(symbol)
+            if not symbol_price:
+                return None
+            price = price / symbol_price if invert else price * symbol_price
+        return price
+
+    def apply_prices(self, updates):
+        """Fiyat güncellemelerini uygular; USD fiyatı değişen varlıkları döndürür"""
+        with self._lock:
+            affected = set()
+            for symbol, price in updates.items():
+                if symbol in self.pairs and self.prices.get(symbol) != price:
+                    self.prices[symbol] = price
+                    affected |= self.dependents.get(symbol, set())
+
+            changed = set()
+            for asset in affected:
+                price = self._path_price(self.paths[asset])
+                if price != self.asset_prices.get(asset):
+                    self.asset_prices[asset] = price
+                    changed.add(asset)
+
+            # Sadece fiyatı değişen varlıkların hesap değerleri yeniden hesaplanır
+            if changed:
+                for account, holdings in self.holdings.items():
+                    touched = changed.intersection(holdings)
+                    if touched:
+                        self._revalue_assets(account, touched)
+            return changed
+
+    def market_snapshot(self):
+        """Çift bilgisi ve varlık USD fiyatlarının tutarlı bir kopyası"""
+        with self._lock:
+            return dict(self.pairs), dict(self.asset_prices)
+
+    def path_symbols(self, asset):
+        """Varlığın USD değerini belirleyen semboller"""
+        return [symbol for symbol, invert in self.paths.get(asset, [])]
+
+    def set_holdings(self, account, balances):
+        """Hesabın bakiyelerini kaydeder ve toplam USD değerini döndürür"""
+        with self._lock:
+            self.holdings[account] = {balance["asset"]: float(balance["free"]) + float(balance["locked"])
+                                      for balance in balances}
+            self._revalue_account(account)
+            return self.totals[account]
+
+    def remove_account(self, account):
+        with self._lock:
+            self.holdings.pop(account, None)
+            self.values.pop(account, None)
+            self.totals.pop(account, None)
+
+    def value_accounts(self, balances_by_account):
+        """Tüm hesapları bakiye x fiyat matrisi üzerinden tek geçişte değerler.
+
+        {hesap: toplam USD} döndürür.
+        """
+        with self._lock:
+            for account, balances in balances_by_account.items():
+                self.holdings[account] = {balance["asset"]: float(balance["free"]) + float(balance["locked"])
+                                          for balance in balances}
+
+            accounts = list(balances_by_account)
+            assets = sorted({asset for account in accounts for asset in self.holdings[account]})
+            price_vector = [self.asset_prices.get(asset) for asset in assets]
+            matrix = [[self.holdings[account].get(asset, 0.0) for asset in assets] for account in accounts]
+
+            for account, row in zip(accounts, matrix):
+                values = {asset: amount * price if price is not None else None
+                          for asset, amount, price in zip(assets, row, price_vector) if amount}
+                self.values[account] = values
+                self.totals[account] = sum(value for value in values.values() if value)
+            return {account: self.totals[account] for account in accounts}
+
+    def _revalue_account(self, account):
+        holdings = self.holdings[account]
+        values = {}
+        for asset, amount in holdings.items():
+            price = self.asset_prices.get(asset)
+            values[asset] = amount * price if price is not None else None
+        self.values[account] = values
+        self.totals[account] = sum(value for value in values.values() if value)
+
+    def _revalue_assets(self, account, assets):
+        """Hesabın sadece verilen varlıklarını yeniden değerler, toplamı farkla günceller"""
+        holdings = self.holdings[account]
+        values = self.values[account]
+        total = self.totals[account]
+        for asset in assets:
+            price = self.asset_prices.get(asset)
+            new_value = holdings[asset] * price if price is not None else None
+            total += (new_value or 0.0) - (values.get(asset) or 0.0)
+            values[asset] = new_value
+        self.totals[account] = total
+
+    def get_values(self, account):
+        """Hesabın {varlık: USD değeri veya None} eşlemesi ve toplamı"""
+        with self._lock:
+            return dict(self.values.get(account, {})), self.totals.get(account, 0.0)
+
+
+# Testnet ve mainnet için ayrı motorlar
+valuation_engines = {
+    True: ValuationEngine(True),
+    False: ValuationEngine(False)
+}
+
+
+def get_valuation_engine(testnet):
+    """Ağa ait değerleme motorunu döndürür"""
+    return valuation_engines[bool(testnet)]
@@ -0,0 +1,119 @@
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, pyqtSignal
+
+# Arayüzden gönderilen arka plan işleri için ortak thread sayısı
+WORKER_THREADS = 8
+
+# Geçmiş eşitlemesi gibi çok sayıda ağır istek atan işler için ayrı thread sayısı
+SYNC_THREADS = 2
+
+job_pool = ThreadPoolExecutor(max_workers=WORKER_THREADS, thread_name_prefix="ui-job")
+
+# Limitleyicide uzun bekleyebilen işler ortak havuzdaki thread'leri tüketmesin diye burada çalışır
+sync_pool = ThreadPoolExecutor(max_workers=SYNC_THREADS, thread_name_prefix="sync-job")
+
+
+class Job(QObject):
+    """Arka planda çalışan tek bir çağrının sonucu (future).
+
+    Sinyaller GUI thread'inde yayılır. İptal edilen işin çağrısı yarıda kesilemez ama
+    sonucu yayılmaz; finished her durumda bir kez yayılır.
+    """
+    succeeded = pyqtSignal(object)  # dönüş değeri
+    failed = pyqtSignal(object)  # yakalanan exception
+    finished = pyqtSignal()
+    _completed = pyqtSignal(object, object)  # worker thread -> GUI thread
+
+    def __init__(self, key, fn, args, kwargs, parent=None):
+        super().__init__(parent)
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.cancelled = False
+        self.done = False
+        self.result = None
+        self.error = None
+        self._completed.connect(self._on_completed)
+
+    def cancel(self):
+        """Henüz tamamlanmadıysa işi iptal eder; iptal edildiyse True"""
+        if self.done:
+            return False
+        self.cancelled = True
+        return True
+
+    def run(self):
+        """Havuz thread'inde çalışır"""
+        result, error = None, None
+        if not self.cancelled:
+            try:
+                result = self.fn(*self.args, **self.kwargs)
+            except Exception as e:
+                error = e
+        try:
+            self._completed.emit(result, error)
+        except RuntimeError:
+            # Sahibi olan widget iş bitmeden silindi
+            pass
+
+    def _on_completed(self, result, error):
+        self.done = True
+        if not self.cancelled:
+            self.result = result
+            self.error = error
+            if error is None:
+                self.succeeded.emit(result)
+            else:
+                self.failed.emit(error)
+        self.finished.emit()
+
+
+class JobRunner(QObject):
+    """İşleri ortak thread havuzunda çalıştırır.
+
+    Aynı anahtarla gönderilen yeni iş bekleyen öncekini iptal eder (ör. sembol veya sekme
+    hızla değiştiğinde eski isteğin sonucu tabloya yazılmaz). Anahtarsız işler iptal edilmez.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.current = {}  # key -> son gönderilen Job
+        self.pending = set()
+
+    def submit(self, key, fn, *args, on_result=None, on_error=None, executor=None, **kwargs):
+        """fn(*args, **kwargs) çağrısını arka planda (varsayılan ortak havuzda) başlatır ve Job döndürür"""
+        if key is not None:
+            self.cancel(key)
+
+        job = Job(key, fn, args, kwargs, self)
+        if on_result is not None:
+            job.succeeded.connect(on_result)
+        if on_error is not None:
+            job.failed.connect(on_error)
+        job.finished.connect(lambda: self._on_finished(job))
+
+        if key is not None:
+            self.current[key] = job
+        self.pending.add(job)
+        (executor or job_pool).submit(job.run)
+        return job
+
+    def cancel(self, key):
+        """Anahtarın bekleyen işini iptal eder; iptal edilen iş varsa True"""
+        job = self.current.pop(key, None)
+        return job is not None and job.cancel()
+
+    def cancel_all(self):
+        for job in self.pending:
+            job.cancel()
+        self.current = {}
+
+    def is_running(self, key):
+        return key in self.current
+
+    def _on_finished(self, job):
+        self.pending.discard(job)
+        if self.current.get(job.key) is job:
+            del self.current[job.key]
+        job.deleteLater()